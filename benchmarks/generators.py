@@ -0,0 +1,181 @@
+"""Synthetic lockfiles of any size, for benchmarking.
+
+Each generator takes a list of `(name, version)` dists, as returned by `dists()`, and returns the
+lockfile contents. Use `bumped()` for a modified copy of the dists to diff against.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import random
+from io import BytesIO
+from typing import Callable, Sequence
+from zipfile import ZIP_DEFLATED, ZipFile
+
+Dists = Sequence["tuple[str, str]"]
+
+PEX_VERSION = "2.1.113"
+
+
+def dists(count: int, seed: int = 0) -> list[tuple[str, str]]:
+    rnd = random.Random(seed)
+    return [
+        (f"dist_{i:06d}", f"{rnd.randint(0, 9)}.{rnd.randint(0, 30)}.{rnd.randint(0, 99)}")
+        for i in range(count)
+    ]
+
+
+def bumped(dists: Dists, ratio: float = 0.1, seed: int = 1) -> list[tuple[str, str]]:
+    """Return a copy of `dists` with about `ratio` of them upgraded, downgraded, removed or added
+    each."""
+    rnd = random.Random(seed)
+    result = []
+    for name, version in dists:
+        roll = rnd.random()
+        major, minor, micro = (int(part) for part in version.split("."))
+        if roll < ratio:
+            result.append((name, f"{major}.{minor + 1}.{micro}"))
+        elif roll < 2 * ratio:
+            result.append((name, f"{max(major - 1, 0)}.{minor}.{micro}"))
+        elif roll < 3 * ratio:
+            continue
+        else:
+            result.append((name, version))
+        if rnd.random() < ratio:
+            result.append((f"{name}_extra", "1.0.0"))
+    return result
+
+
+def _sha256(text: str) -> str:
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+def pex_lockfile(dists: Dists) -> str:
+    return json.dumps(
+        {
+            "allow_builds": True,
+            "allow_prereleases": False,
+            "allow_wheels": True,
+            "build_isolation": True,
+            "constraints": [],
+            "locked_resolves": [
+                {
+                    "locked_requirements": [
+                        {
+                            "artifacts": [
+                                {
+                                    "algorithm": "sha256",
+                                    "hash": _sha256(f"{name}-{version}"),
+                                    "url": (
+                                        "https://files.pythonhosted.org/packages/"
+                                        f"{name}-{version}-py3-none-any.whl"
+                                    ),
+                                }
+                            ],
+                            "project_name": name,
+                            "requires_dists": [],
+                            "requires_python": None,
+                            "version": version,
+                        }
+                        for name, version in dists
+                    ],
+                    "platform_tag": ["cp39", "cp39", "manylinux_2_17_x86_64"],
+                }
+            ],
+            "path_mappings": {},
+            "pex_version": PEX_VERSION,
+            "pip_version": "20.3.4-patched",
+            "prefer_older_binary": False,
+            "requirements": [name for name, _ in dists],
+            "requires_python": [],
+            "resolver_version": "pip-2020-resolver",
+            "style": "universal",
+            "target_systems": [],
+            "transitive": True,
+            "use_pep517": None,
+        },
+        indent=2,
+    )
+
+
+def coursier_lockfile(dists: Dists) -> str:
+    return "\n".join(
+        f"""[[entries]]
+directDependencies = []
+dependencies = []
+file_name = "org.example_{name}_{version}.jar"
+
+[entries.coord]
+group = "org.example"
+artifact = "{name}"
+version = "{version}"
+packaging = "jar"
+[entries.file_digest]
+fingerprint = "{_sha256(f"{name}-{version}")}"
+serialized_bytes_length = 45024
+"""
+        for name, version in dists
+    )
+
+
+def _pants_header(prefix: str, dists: Dists) -> str:
+    metadata = json.dumps(
+        {
+            "version": 3,
+            "valid_for_interpreter_constraints": ["CPython<3.10,>=3.8"],
+            "generated_with_requirements": [name for name, _ in dists],
+        },
+        indent=2,
+    )
+    lines = [
+        "This lockfile was autogenerated by Pants. To regenerate, run:",
+        "",
+        "   ./pants generate-lockfiles",
+        "",
+        "--- BEGIN PANTS LOCKFILE METADATA: DO NOT EDIT OR REMOVE ---",
+        *metadata.splitlines(),
+        "--- END PANTS LOCKFILE METADATA ---",
+    ]
+    return "".join(f"{prefix} {line}".rstrip() + "\n" for line in lines) + "\n"
+
+
+def pants_pex_lockfile(dists: Dists) -> str:
+    return _pants_header("//", dists) + pex_lockfile(dists)
+
+
+def pants_coursier_lockfile(dists: Dists) -> str:
+    return _pants_header("#", dists) + coursier_lockfile(dists)
+
+
+def pex_info(dists: Dists) -> str:
+    return json.dumps(
+        {
+            "build_properties": {"pex_version": PEX_VERSION},
+            "distributions": {
+                f"{name}-{version}-py3-none-any.whl": _sha256(f"{name}-{version}")
+                for name, version in dists
+            },
+        }
+    )
+
+
+def pex_app(dists: Dists) -> bytes:
+    buf = BytesIO()
+    buf.write(b"#!/usr/bin/env python3\n")
+    with ZipFile(buf, "w", compression=ZIP_DEFLATED) as zf:
+        zf.writestr("__main__.py", "")
+        for name, version in dists:
+            zf.writestr(f".deps/{name}-{version}-py3-none-any.whl/{name}/__init__.py", "")
+        zf.writestr("PEX-INFO", pex_info(dists))
+    return buf.getvalue()
+
+
+# Lockfile generators, keyed by schema name.
+GENERATORS: dict[str, Callable[[Dists], str | bytes]] = {
+    "pex": pex_lockfile,
+    "pants-pex": pants_pex_lockfile,
+    "coursier": coursier_lockfile,
+    "pants-coursier": pants_coursier_lockfile,
+    "pex-info": pex_info,
+    "pex-app": pex_app,
+}
@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+import pytest
+
+from benchmarks.generators import GENERATORS, bumped, dists
+from lockfile_diff.base import Schema
+from lockfile_diff.types import LockfileInfo
+from lockfile_diff.util.io.named import open_bytes
+
+
+@pytest.mark.parametrize("schema", sorted(GENERATORS))
+def test_generator(schema: str) -> None:
+    expected = dists(20)
+    contents = GENERATORS[schema](expected)
+    data = contents.encode() if isinstance(contents, str) else contents
+    for name in (schema, "auto-detect"):
+        info = Schema(name).parse(open_bytes(data, f"test.{schema}")).get_info()
+        assert info.dists == LockfileInfo.create(expected).dists
+
+
+def test_bumped() -> None:
+    old = dists(1000)
+    new = bumped(old)
+    diff = LockfileInfo.create(new).diff(LockfileInfo.create(old))
+    for category in (diff.added, diff.removed, diff.upgraded, diff.downgraded):
+        assert 50 < len(category) < 150
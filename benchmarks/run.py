@@ -0,0 +1,235 @@
+"""Time each stage of parsing and diffing synthetic lockfiles, and compare with a baseline.
+
+Run with `python -m benchmarks.run`, with `src` on the `PYTHONPATH`. Use `--update-baseline` to
+record the results as the new baseline, on the machine the comparisons are going to be made on.
+"""
+from __future__ import annotations
+
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from io import StringIO
+from typing import IO, Any, Callable, Iterator
+
+import click
+
+from benchmarks.generators import GENERATORS, bumped, dists
+from lockfile_diff.base import Format, Schema
+from lockfile_diff.formats.blocks import CommentBlock
+from lockfile_diff.schemas.autodetect import AutoDetectSchema
+from lockfile_diff.schemas.coursier import scan_entry
+from lockfile_diff.schemas.pex import load_requirement
+from lockfile_diff.types import DiffFilter, LockfileDiff, LockfileInfo, parse_version
+from lockfile_diff.util.io.named import open_bytes
+from lockfile_diff.util.io.sniff import read_head
+from lockfile_diff.util.io.zipmember import map_source, read_member
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+DEFAULT_SIZES = (10, 1000, 10000)
+DEFAULT_THRESHOLD = 1.5
+# Timings below this many seconds are too noisy to compare.
+MIN_SECONDS = 0.001
+
+OUTPUT_FORMATS = ("text", "json", "yaml", "jsonl")
+
+
+def _read_pex_info(source: IO) -> bytes:
+    with map_source(source) as buffer:
+        return read_member(buffer, "PEX-INFO")
+
+
+# The syntax level parse of each schema, without extracting any data from it.
+FORMAT_PARSERS: dict[str, Callable[[IO], Any]] = {
+    "pex": Format("json").parse,
+    "pex-info": Format("json").parse,
+    "coursier": Format("toml").parse,
+    "pants-pex": CommentBlock(prefix="//").parse,
+    "pants-coursier": CommentBlock(prefix="#").parse,
+    "pex-app": _read_pex_info,
+}
+
+
+@dataclass(frozen=True)
+class Result:
+    seconds: float
+    peak_bytes: int
+
+
+def measure(func: Callable[[Any], Any], setup: Callable[[], Any], repeat: int) -> Result:
+    """Time the best of `repeat` calls of `func` with the value returned by `setup`, and trace the
+    peak memory allocated during one more call."""
+    best = float("inf")
+    for _ in range(repeat):
+        arg = setup()
+        gc.collect()
+        start = time.perf_counter()
+        func(arg)
+        best = min(best, time.perf_counter() - start)
+
+    arg = setup()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func(arg)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return Result(seconds=best, peak_bytes=peak)
+
+
+def clear_caches() -> None:
+    """Clear the caches shared between lockfiles, to measure parsing them from scratch."""
+    parse_version.cache_clear()
+    load_requirement.cache_clear()
+    scan_entry.cache_clear()
+
+
+def encode(contents: str | bytes) -> bytes:
+    return contents.encode() if isinstance(contents, str) else contents
+
+
+def run_schema(schema: str, size: int, repeat: int) -> Iterator[tuple[str, Result]]:
+    data = encode(GENERATORS[schema](dists(size)))
+
+    def source() -> IO:
+        clear_caches()
+        return open_bytes(data, f"benchmark.{schema}")
+
+    yield "detect", measure(
+        lambda source: next(AutoDetectSchema.candidates(read_head(source))), source, repeat
+    )
+    yield "format", measure(FORMAT_PARSERS[schema], source, repeat)
+    yield "schema", measure(Schema(schema).parse, source, repeat)
+
+    def parsed() -> Any:
+        return Schema(schema).parse(source())
+
+    yield "info", measure(lambda parsed: parsed.get_info(), parsed, repeat)
+
+    # Parse a new revision of the lockfile, having parsed the old revision.
+    bumped_data = encode(GENERATORS[schema](bumped(dists(size))))
+
+    def bumped_source() -> IO:
+        Schema(schema).parse(source())
+        return open_bytes(bumped_data, f"benchmark.{schema}")
+
+    yield "incremental", measure(Schema(schema).parse, bumped_source, repeat)
+
+
+def run_diff(size: int, repeat: int) -> Iterator[tuple[str, Result]]:
+    old, new = dists(size), bumped(dists(size))
+
+    def cold() -> list[tuple[str, str]]:
+        parse_version.cache_clear()
+        return new
+
+    yield "create", measure(LockfileInfo.create, cold, repeat)
+
+    infos = (LockfileInfo.create(old), LockfileInfo.create(new))
+    yield "diff", measure(lambda infos: LockfileDiff.create(*infos), lambda: infos, repeat)
+
+    # Only the changes of a few watched dists, as in reports over a fleet of lockfiles.
+    watched = DiffFilter(unchanged=False, include=tuple(name for name, _ in old[::100]))
+    yield "diff-watched", measure(
+        lambda infos: LockfileDiff.create(infos[0], infos[1], diff_filter=watched),
+        lambda: infos,
+        repeat,
+    )
+
+    diff = LockfileDiff.create(*infos)
+    for output_format in OUTPUT_FORMATS:
+        yield f"encode-{output_format}", measure(
+            lambda dest: Format(output_format).encode(diff, dest), StringIO, repeat
+        )
+
+
+def compare(
+    results: dict[str, Result], baseline: dict[str, Result], threshold: float
+) -> Iterator[str]:
+    """Yield a report line for each result, flagging regressions compared to the baseline."""
+    for key, result in results.items():
+        line = f"{key:40} {result.seconds * 1000:10.2f} ms {result.peak_bytes / 1024:12.1f} KiB"
+        base = baseline.get(key)
+        if base is None:
+            yield f"{line}   (no baseline)"
+            continue
+        time_ratio = result.seconds / base.seconds if base.seconds else 1.0
+        memory_ratio = result.peak_bytes / base.peak_bytes if base.peak_bytes else 1.0
+        line = f"{line}   x{time_ratio:5.2f} time   x{memory_ratio:5.2f} memory"
+        regressed = (time_ratio > threshold and result.seconds > MIN_SECONDS) or (
+            memory_ratio > threshold
+        )
+        yield f"{line}   REGRESSION" if regressed else line
+
+
+def load_baseline(path: str) -> dict[str, Result]:
+    if not os.path.exists(path):
+        return {}
+    with open(path) as fd:
+        return {key: Result(**value) for key, value in json.load(fd).items()}
+
+
+@click.command
+@click.option(
+    "--size",
+    "sizes",
+    type=click.IntRange(min=1),
+    multiple=True,
+    help=f"Number of dists per lockfile. May be given multiple times. Default: {DEFAULT_SIZES}",
+)
+@click.option(
+    "--schema",
+    "schema_names",
+    type=click.Choice(tuple(GENERATORS)),
+    multiple=True,
+    help="Lockfile schemas to benchmark. May be given multiple times. Default: all.",
+)
+@click.option("--repeat", type=click.IntRange(min=1), default=3, show_default=True)
+@click.option("--baseline", default=DEFAULT_BASELINE, show_default=True)
+@click.option(
+    "--update-baseline", is_flag=True, default=False, help="Record the results as the baseline."
+)
+@click.option(
+    "--threshold",
+    type=float,
+    default=DEFAULT_THRESHOLD,
+    show_default=True,
+    help="Ratio to the baseline above which a result is a regression.",
+)
+def main(sizes, schema_names, repeat, baseline, update_baseline, threshold):
+    results: dict[str, Result] = {}
+    for size in sizes or DEFAULT_SIZES:
+        for schema in schema_names or GENERATORS:
+            for stage, result in run_schema(schema, size, repeat):
+                results[f"{schema}/{size}/{stage}"] = result
+        for stage, result in run_diff(size, repeat):
+            results[f"diff/{size}/{stage}"] = result
+
+    base = load_baseline(baseline)
+    report = list(compare(results, base, threshold))
+    click.echo("\n".join(report))
+
+    if update_baseline:
+        base.update(results)
+        with open(baseline, "w") as fd:
+            json.dump(
+                {
+                    key: dict(seconds=round(value.seconds, 6), peak_bytes=value.peak_bytes)
+                    for key, value in sorted(base.items())
+                },
+                fd,
+                indent=2,
+            )
+            fd.write("\n")
+        return
+
+    if any(line.endswith("REGRESSION") for line in report):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,24 +1,48 @@
 #!/usr/bin/env python
 from __future__ import annotations
 
+import json
 import sys
-from io import StringIO
-from subprocess import CalledProcessError, run
+from dataclasses import asdict
+from glob import glob
 from textwrap import dedent
-from typing import IO
+from typing import IO, Any, Callable, cast
 
 import click
 
-from lockfile_diff import formats, schemas  # noqa
 from lockfile_diff.base import Format
 from lockfile_diff.errors import FAILED_TO_OPEN_FILE
+from lockfile_diff.git import GitError, GitObjects
 from lockfile_diff.parser import Parser
 from lockfile_diff.registries import Registries
+from lockfile_diff.timings import Timing, add_callback, as_table
+from lockfile_diff.types import BUMP_LEGACY, BUMPS, DiffFilter
+from lockfile_diff.util.io.echo import EchoWriter
+from lockfile_diff.util.io.named import Blob
 
 
 @click.command
 @click.option("--old-lockfile", "--old", metavar="LOCKFILE", type=click.File())
-@click.option("--new-lockfile", "--new", metavar="LOCKFILE", type=click.File())
+@click.option(
+    "--new-lockfile",
+    "--new",
+    "new_lockfiles",
+    metavar="LOCKFILE",
+    type=click.File(),
+    multiple=True,
+    help="May be given multiple times together with --compare, to diff several lockfiles at once.",
+)
+@click.option(
+    "--glob",
+    "globs",
+    metavar="PATTERN",
+    multiple=True,
+    help=dedent(
+        """Diff all lockfiles matching PATTERN against --compare. May be given multiple times, and
+        combined with --new-lockfile. `**` matches any files and zero or more directories.
+        """
+    ),
+)
 @click.option(
     "--lockfile-schema",
     type=click.Choice(tuple(Registries.get_default().schemas.keys())),
@@ -35,16 +59,112 @@ from lockfile_diff.registries import Registries
         """
     ),
 )
+@click.option(
+    "--history",
+    metavar="RANGE",
+    help=dedent(
+        """Git revision range, e.g. `main~10..main`. Diff the lockfile at each commit in RANGE that
+        changed it with its previous revision, printing each diff as soon as it is ready.
+        """
+    ),
+)
 @click.option(
     "--output-format",
     type=click.Choice(tuple(Registries.get_default().output_formats.keys())),
     default="text",
     help="Print resulting diff using OUTPUT_FORMAT.",
 )
+@click.option(
+    "--by-resolve",
+    is_flag=True,
+    default=False,
+    help="Diff each resolve of multi-resolve lockfiles separately, grouping the result by resolve.",
+)
 @click.option("--unchanged/--no-unchanged", default=False)
 @click.option("--changed/--no-changed", default=True)
 @click.option("--added/--no-added", default=True)
 @click.option("--removed/--no-removed", default=True)
+@click.option(
+    "--drifted/--no-drifted",
+    default=True,
+    help=dedent(
+        """List dists of the same version with different artifact hashes, for lockfiles that record
+        them. Such dists are otherwise unchanged.
+        """
+    ),
+)
+@click.option(
+    "--include",
+    "includes",
+    metavar="GLOB",
+    multiple=True,
+    help="Only diff dists with names matching GLOB. May be given multiple times.",
+)
+@click.option(
+    "--exclude",
+    "excludes",
+    metavar="GLOB",
+    multiple=True,
+    help="Do not diff dists with names matching GLOB. May be given multiple times.",
+)
+@click.option(
+    "--min-bump",
+    type=click.Choice(BUMPS[:0:-1]),
+    help=dedent(
+        """Only list upgrades and downgrades changing at least the BUMP part of the version, e.g.
+        `minor` for minor and major version bumps. Changes of legacy versions are left out.
+        """
+    ),
+)
+@click.option(
+    "--impact/--no-impact",
+    default=False,
+    help=dedent(
+        """List the top level requirements that pull in each changed dist, and the changed dists
+        that each changed top level requirement pulls in, for lockfiles that record the
+        dependencies between dists.
+        """
+    ),
+)
+@click.option(
+    "--jobs",
+    "-j",
+    type=click.IntRange(min=1),
+    help="Number of processes to use when diffing several lockfiles. Defaults to the CPU count.",
+)
+@click.option(
+    "--cache-dir",
+    metavar="DIR",
+    type=click.Path(file_okay=False),
+    envvar="LOCKFILE_DIFF_CACHE_DIR",
+    help=dedent(
+        """Cache the parsed lockfiles in DIR, keyed by lockfile content, so unchanged lockfiles are
+        not parsed again on subsequent runs.
+        """
+    ),
+)
+@click.option(
+    "--timings",
+    type=click.Choice(("table", "json")),
+    is_flag=False,
+    flag_value="table",
+    help=dedent(
+        """Print the time spent in each stage of reading, parsing, diffing and printing the
+        lockfiles to stderr, as a table or as JSON. Stages run in --jobs worker processes are not
+        included.
+        """
+    ),
+)
+@click.option(
+    "--serve",
+    metavar="SOCKET",
+    type=click.Path(dir_okay=False),
+    help=dedent(
+        """Serve diffs on the Unix domain SOCKET until interrupted, keeping parsed lockfiles in
+        memory between requests. Use `python -m lockfile_diff.client` to request diffs.
+        """
+    ),
+)
 @click.option(
     "--no-fail",
     is_flag=True,
@@ -54,68 +174,165 @@ from lockfile_diff.registries import Registries
 def main(
     lockfile_schema,
     output_format,
+    by_resolve,
     old_lockfile,
-    new_lockfile,
+    new_lockfiles,
+    globs,
     compare,
+    history,
     unchanged,
     changed,
     added,
     removed,
+    drifted,
+    includes,
+    excludes,
+    min_bump,
+    impact,
+    jobs,
+    cache_dir,
+    timings,
+    serve,
     no_fail,
 ):
-    if old_lockfile is None and compare:
-        assert new_lockfile is not None, "Must provide either --old or --new lockfile"
-        old_lockfile = get_git_file(new_lockfile.name, compare, quiet=no_fail)
-    if new_lockfile is None:
-        assert old_lockfile is not None, "Must provide either --old or --new lockfile"
-        new_lockfile = get_git_file(old_lockfile.name, compare, quiet=no_fail)
-    if not no_fail and (old_lockfile is None or new_lockfile is None):
-        sys.exit(FAILED_TO_OPEN_FILE)
+    if timings:
+        collected = []
+        add_callback(collected.append)
+        click.get_current_context().call_on_close(lambda: echo_timings(collected, timings))
+
+    if serve:
+        from lockfile_diff.cache import MemoryCache
+        from lockfile_diff.daemon import serve as serve_diffs
 
-    kwargs = {}
+        serve_diffs(serve, MemoryCache(cache_dir))
+        return 0
+
+    kwargs = dict(
+        diff_filter=DiffFilter(
+            unchanged=unchanged,
+            changed=changed,
+            added=added,
+            removed=removed,
+            drifted=drifted,
+            impact=impact,
+            include=includes,
+            exclude=excludes,
+            min_bump=BUMPS.index(min_bump) if min_bump else BUMP_LEGACY,
+        )
+    )
     if lockfile_schema == "auto-detect" and no_fail:
         kwargs["quiet"] = True
+    if cache_dir:
+        from lockfile_diff.cache import LockfileCache
 
-    diff = Parser.diff(old_lockfile, new_lockfile, lockfile_schema, **kwargs)
+        kwargs["cache"] = LockfileCache(cache_dir)
 
-    if not unchanged:
-        diff.unchanged.clear()
-    if not changed:
-        diff.upgraded.clear()
-        diff.downgraded.clear()
-    if not added:
-        diff.added.clear()
-    if not removed:
-        diff.removed.clear()
+    if history:
+        if compare or globs or len(new_lockfiles) + (old_lockfile is not None) != 1:
+            raise click.UsageError("--history must be used with a single lockfile only.")
+        from lockfile_diff.history import diff_history
 
-    click.echo(Format(output_format).encode(diff))
+        path = (new_lockfiles[0] if new_lockfiles else old_lockfile).name
+        with GitObjects() as git, EchoWriter() as dest:
+            try:
+                revisions = git.revisions(history, path)
+            except GitError as e:
+                click.echo(f"ERROR: {e}", err=True)
+                sys.exit(FAILED_TO_OPEN_FILE)
+            for chunk in Format(output_format).encode_stream(
+                diff_history(git, revisions, path, lockfile_schema, by_resolve=by_resolve, **kwargs)
+            ):
+                dest.write(chunk)
+                dest.flush()
+        if dest.line_pending:
+            click.echo()
+        return 0
+
+    if globs or len(new_lockfiles) > 1:
+        if old_lockfile is not None or not compare:
+            raise click.UsageError(
+                "Multiple --new lockfiles and --glob may only be used together with --compare."
+            )
+        from lockfile_diff.batch import diff_all
+
+        paths = [new_lockfile.name for new_lockfile in new_lockfiles]
+        for pattern in globs:
+            paths.extend(sorted(set(glob(pattern, recursive=True)) - set(paths)))
+        with GitObjects() as git:
+            batch_jobs = [
+                (path, get_git_blob(git, path, compare, quiet=no_fail), path) for path in paths
+            ]
+        if not no_fail and any(old is None for _, old, _ in batch_jobs):
+            sys.exit(FAILED_TO_OPEN_FILE)
+        diffs, exit_code = diff_all(
+            batch_jobs, lockfile_schema, max_workers=jobs, by_resolve=by_resolve, **kwargs
+        )
+        echo_encoded(output_format, diffs)
+        if exit_code and not no_fail:
+            sys.exit(exit_code)
+        return 0
+
+    new_lockfile = new_lockfiles[0] if new_lockfiles else None
+    old_source, new_source = old_lockfile, new_lockfile
+    if old_lockfile is None and compare:
+        assert new_lockfile is not None, "Must provide either --old or --new lockfile"
+        old_source = git_source(new_lockfile.name, compare, no_fail)
+    if new_lockfile is None:
+        assert old_lockfile is not None, "Must provide either --old or --new lockfile"
+        new_source = git_source(old_lockfile.name, compare, no_fail)
+    if not no_fail and (old_source is None or new_source is None):
+        sys.exit(FAILED_TO_OPEN_FILE)
+
+    if by_resolve:
+        diff = Parser.diff_resolves(old_source, new_source, lockfile_schema, **kwargs)
+    else:
+        diff = Parser.diff(old_source, new_source, lockfile_schema, **kwargs)
+    echo_encoded(output_format, diff)
     return 0
 
 
-class NamedStringIO(StringIO):
-    def __init__(self, *args, name: str, **kwargs):
-        super().__init__(*args, **kwargs)
-        self.__name = name
+def echo_encoded(output_format: str, data: Any) -> None:
+    """Encode `data` straight to stdout, as it is encoded."""
+    with EchoWriter() as dest:
+        Format(output_format).encode(data, cast(IO, dest))
+    if dest.line_pending:
+        click.echo()
 
-    @property
-    def name(self) -> str:
-        return self.__name
 
+def echo_timings(timings: list[Timing], output_format: str) -> None:
+    if output_format == "json":
+        click.echo(json.dumps([asdict(timing) for timing in timings]), err=True)
+    else:
+        click.echo(as_table(timings), err=True)
 
-def get_git_file(filename: str, commit: str, quiet: bool) -> IO | None:
+
+def get_git_blob(git: GitObjects, filename: str, commit: str, quiet: bool) -> Blob | None:
     try:
-        file_contents = run(
-            ["git", "show", f"{commit}:{filename}"], check=True, capture_output=True, text=True
-        ).stdout
-        return NamedStringIO(
-            file_contents,
-            name=f"[git: {commit}] {filename}",
-        )
-    except CalledProcessError as e:
+        return git.blob(commit, filename)
+    except GitError as e:
         if not quiet:
             click.echo(f"ERROR: {e}", err=True)
         return None
 
 
+def get_git_file(filename: str, commit: str, quiet: bool) -> IO | None:
+    with GitObjects() as git:
+        blob = get_git_blob(git, filename, commit, quiet)
+    return blob.open() if blob is not None else None
+
+
+def git_source(filename: str, commit: str, no_fail: bool) -> Callable[[], IO | None]:
+    """Return a source reading `filename` at `commit` from git once it is opened, so that it may be
+    read while the other side of the diff is being parsed."""
+
+    def open_source() -> IO | None:
+        source = get_git_file(filename, commit, quiet=no_fail)
+        if source is None and not no_fail:
+            sys.exit(FAILED_TO_OPEN_FILE)
+        return source
+
+    return open_source
+
+
 if __name__ == "__main__":
     main()
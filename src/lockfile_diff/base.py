@@ -1,12 +1,21 @@
 from __future__ import annotations
 
+import time
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
-from typing import IO, Any, ClassVar, Mapping, overload
+from typing import IO, Any, ClassVar, Iterable, Iterator, Mapping, overload
 
 from lockfile_diff.registries import AutoRegister, Registries, RegistryBase
+from lockfile_diff.timings import Timing, report, timed
 from lockfile_diff.types import ParsedData
 
+# Confidence levels returned by `InputSchema.probe()`.
+PROBE_NO_MATCH = 0
+PROBE_UNKNOWN = 1
+PROBE_WEAK = 10
+PROBE_LIKELY = 50
+PROBE_CERTAIN = 90
+
 
 class InputBase(ABC, RegistryBase):
     @abstractmethod
@@ -27,6 +36,14 @@ class OutputBase(ABC, RegistryBase):
     def encode(self, data: Any, dest: IO | None = None) -> None | str:
         raise NotImplementedError()
 
+    def encode_stream(self, items: Iterable[tuple[str, Any]]) -> Iterator[str]:
+        """Encode a report of `(key, data)` items incrementally, as they become available.
+
+        The concatenation of the yielded chunks is the encoded report.
+        """
+        for key, data in items:
+            yield self.encode({key: data})
+
 
 class InputFormat(InputBase, metaclass=AutoRegister(lambda: Registries.get_default().input_formats)):  # type: ignore[misc]
     kind = "input_formats"
@@ -42,6 +59,15 @@ class InputSchema(InputBase, metaclass=AutoRegister(lambda: Registries.get_defau
     kind = "schemas"
     schema: ClassVar[str]
 
+    @classmethod
+    def probe(cls, head: bytes) -> int:
+        """Rate how likely it is that a source starting with `head` is of this schema.
+
+        Used by `auto-detect` to pick which schema to parse a source with, without having to
+        attempt a full parse with each of them. The `head` holds the first few KB of the source.
+        """
+        return PROBE_UNKNOWN
+
 
 @dataclass
 class InputOutputHelper:
@@ -49,6 +75,9 @@ class InputOutputHelper:
     args: tuple[Any, ...] = ()
     kwargs: Mapping[str, Any] = field(default_factory=dict)
 
+    # Name of the stage for timings, see `lockfile_diff.timings`.
+    stage: ClassVar[str]
+
     @property
     def input(self) -> InputBase:
         raise NotImplementedError()
@@ -62,7 +91,8 @@ class InputOutputHelper:
             return self.parse(fd)
 
     def parse(self, source: IO) -> ParsedData:
-        return self.input.parse(source)
+        with timed(f"{self.stage}:{self.name}", source):
+            return self.input.parse(source)
 
     @overload
     def encode(self, data: Any, dest: IO) -> None:
@@ -73,10 +103,53 @@ class InputOutputHelper:
         ...
 
     def encode(self, data: Any, dest: IO | None = None) -> None | str:
-        return self.output.encode(data, dest)  # type: ignore[arg-type]
+        with timed(f"encode:{self.name}"):
+            return self.output.encode(data, dest)  # type: ignore[arg-type]
+
+    def encode_stream(self, items: Iterable[tuple[str, Any]]) -> Iterator[str]:
+        """Encode a report of `(key, data)` items incrementally, see `OutputBase.encode_stream`.
+
+        The time spent encoding is reported as a single `encode:<name>` stage once the stream ends.
+        It leaves out the time spent taking each item from `items`, as the items may be diffs that
+        are computed as they are needed.
+        """
+        timing = Timing(f"encode:{self.name}", entries=0)
+        producing = 0.0
+
+        def produce() -> Iterator[tuple[str, Any]]:
+            nonlocal producing
+            remaining = iter(items)
+            while True:
+                start = time.perf_counter()
+                item = next(remaining, None)
+                producing += time.perf_counter() - start
+                if item is None:
+                    return
+                timing.entries = (timing.entries or 0) + 1
+                yield item
+
+        chunks = self.output.encode_stream(produce())
+        try:
+            while True:
+                start = time.perf_counter()
+                try:
+                    chunk = next(chunks, None)
+                except BaseException:
+                    timing.failed = True
+                    raise
+                finally:
+                    timing.seconds += time.perf_counter() - start
+                if chunk is None:
+                    break
+                yield chunk
+        finally:
+            timing.seconds -= producing
+            report(timing)
 
 
 class Format(InputOutputHelper):
+    stage = "format"
+
     @property
     def input(self) -> InputBase:
         return InputFormat.get(self.name, *self.args, **self.kwargs)
@@ -87,6 +160,8 @@ class Format(InputOutputHelper):
 
 
 class Schema(InputOutputHelper):
+    stage = "schema"
+
     @property
     def input(self) -> InputBase:
         return InputSchema.get(self.name, *self.args, **self.kwargs)
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
+from typing import IO, Any, Callable, Iterable, Mapping, Sequence, Tuple, Union
+
+import click
+
+from lockfile_diff.errors import FAILED_TO_OPEN_FILE, FAILED_TO_PARSE_FILE
+from lockfile_diff.parser import Parser
+from lockfile_diff.util.io.named import Blob
+
+# A lockfile source, either read from disk by path, held in memory or missing.
+BatchSource = Union[str, Blob, None]
+BatchJob = Tuple[str, BatchSource, BatchSource]
+
+
+def diff_all(
+    jobs: Sequence[BatchJob],
+    schema: str,
+    max_workers: int | None = None,
+    by_resolve: bool = False,
+    **kwargs: Any,
+) -> tuple[Mapping[str, Any], int]:
+    """Diff the old and new source of each `(key, old, new)` job, in parallel across a pool of
+    processes.
+
+    Returns the resulting diffs keyed by job key, in job order, and the exit code of the first job
+    that failed, or 0. With `by_resolve`, each diff is further keyed by resolve name. Jobs that fail
+    are left out of the diffs, see `_diff`.
+    """
+    diff = Parser.diff_resolves if by_resolve else Parser.diff
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    max_workers = min(max_workers, len(jobs))
+    if max_workers <= 1:
+        return _collect(_diff(diff, job, schema, kwargs) for job in jobs)
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return _collect(
+            executor.map(
+                _diff,
+                [diff] * len(jobs),
+                jobs,
+                [schema] * len(jobs),
+                [kwargs] * len(jobs),
+                chunksize=1,
+            )
+        )
+
+
+def _collect(results: Iterable[tuple[str, Any, int]]) -> tuple[Mapping[str, Any], int]:
+    diffs = {}
+    exit_code = 0
+    for key, result, code in results:
+        if result is not None:
+            diffs[key] = result
+        elif not exit_code:
+            exit_code = code
+    return diffs, exit_code
+
+
+def _diff(
+    diff: Callable[..., Any], job: BatchJob, schema: str, kwargs: Mapping[str, Any]
+) -> tuple[str, Any, int]:
+    """Diff the sources of `job`, returning its key, the diff and the exit code of the job.
+
+    A lockfile that can not be read or parsed only fails its own job, leaving the diff `None`, with
+    the error reported on stderr.
+    """
+    key, old, new = job
+    try:
+        with ExitStack() as stack:
+            result = diff(_open(stack, old), _open(stack, new), schema, **kwargs)
+    except SystemExit as e:
+        # The auto-detect schema exits when no schema can parse a lockfile, having reported why
+        # unless quiet.
+        return key, None, e.code if isinstance(e.code, int) else FAILED_TO_PARSE_FILE
+    except OSError as e:
+        click.echo(f"ERROR: {key}: {e}", err=True)
+        return key, None, FAILED_TO_OPEN_FILE
+    except ValueError as e:
+        click.echo(f"ERROR: {key}: {e}", err=True)
+        return key, None, FAILED_TO_PARSE_FILE
+    return key, result, 0
+
+
+def _open(stack: ExitStack, source: BatchSource) -> IO | None:
+    if source is None:
+        return None
+    if isinstance(source, Blob):
+        return stack.enter_context(source.open())
+    return stack.enter_context(open(source))
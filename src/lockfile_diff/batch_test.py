@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from lockfile_diff.batch import BatchJob, diff_all
+from lockfile_diff.errors import FAILED_TO_PARSE_FILE
+from lockfile_diff.util.io.named import Blob
+
+LOCKFILE = """\
+[[entries]]
+file_name = "{artifact}.jar"
+
+[entries.coord]
+group = "org.example"
+artifact = "{artifact}"
+version = "{version}"
+"""
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_diff_all(tmp_path: Path, max_workers: int) -> None:
+    jobs: list[BatchJob] = []
+    for artifact in ("a", "b", "c"):
+        path = tmp_path / f"{artifact}.lock"
+        path.write_text(LOCKFILE.format(artifact=artifact, version="2.0"))
+        old = Blob(
+            name=f"old {artifact}", data=LOCKFILE.format(artifact=artifact, version="1.0").encode()
+        )
+        jobs.append((str(path), old, str(path)))
+    jobs.append(("missing", None, None))
+
+    diffs, exit_code = diff_all(jobs, "coursier", max_workers=max_workers)
+    assert exit_code == 0
+    assert list(diffs) == [str(tmp_path / f"{artifact}.lock") for artifact in "abc"] + ["missing"]
+    assert {str(version) for diff in diffs.values() for _, version in diff.upgraded.values()} == {
+        "2.0"
+    }
+    assert not any(diffs["missing"].__dict__.values())
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_diff_all_unparseable(
+    tmp_path: Path, max_workers: int, capfd: pytest.CaptureFixture[str]
+) -> None:
+    jobs: list[BatchJob] = []
+    for artifact in ("a", "b"):
+        path = tmp_path / f"{artifact}.lock"
+        path.write_text(LOCKFILE.format(artifact=artifact, version="2.0"))
+        jobs.append((str(path), None, str(path)))
+    broken = tmp_path / "broken.lock"
+    broken.write_text("not a lockfile")
+    jobs.insert(1, (str(broken), None, str(broken)))
+
+    diffs, exit_code = diff_all(jobs, "auto-detect", max_workers=max_workers)
+    assert exit_code == FAILED_TO_PARSE_FILE
+    assert list(diffs) == [str(tmp_path / "a.lock"), str(tmp_path / "b.lock")]
+    assert "`auto-detect` failed to parse" in capfd.readouterr().err
+
+    diffs, exit_code = diff_all(jobs, "auto-detect", max_workers=max_workers, quiet=True)
+    assert exit_code == 0
+    assert list(diffs) == [str(tmp_path / "a.lock"), str(tmp_path / "b.lock")]
+    assert capfd.readouterr().err == ""
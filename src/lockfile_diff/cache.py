@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+import hashlib
+import marshal
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import IO, Dict, List, Mapping, Tuple
+
+from lockfile_diff.types import DEFAULT_RESOLVE, Dists, LockfileInfo, ParsedData
+from lockfile_diff.util.io.rewind import capture
+
+# Bump when changing the layout of cache entries.
+CACHE_FORMAT = 3
+DEFAULT_MAX_SIZE = 64 * 1024 * 1024
+DEFAULT_MAX_ENTRIES = 256
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+@lru_cache(maxsize=None)
+def tool_version() -> str:
+    # Looked up on first use, as reading the package metadata is slow.
+    from importlib import metadata
+
+    try:
+        return metadata.version("lockfile-diff")
+    except metadata.PackageNotFoundError:
+        return "dev"
+
+
+@dataclass(frozen=True)
+class CachedData(ParsedData):
+    info: LockfileInfo
+    resolves: Mapping[str, LockfileInfo] | None = None
+
+    def get_info(self) -> LockfileInfo:
+        return self.info
+
+    def get_resolves(self) -> Mapping[str, LockfileInfo]:
+        if self.resolves is None:
+            return super().get_resolves()
+        return self.resolves
+
+
+class LockfileCache:
+    """On disk cache of the parsed info of lockfiles, keyed by lockfile content and schema.
+
+    Entries are stored as `marshal` dumps of dist names, version strings, dependencies and artifact
+    hashes, one file per entry.
+    Once the total size of the cache exceeds `max_size` bytes, the least recently used entries are
+    evicted.
+    """
+
+    def __init__(self, path: str, max_size: int = DEFAULT_MAX_SIZE) -> None:
+        self.path = path
+        self.max_size = max_size
+
+    def key(self, source: IO, schema: str) -> str | None:
+        """Hash the contents of `source`, without consuming it.
+
+        Returns `None` for sources that can not be rewound, as they can not be parsed once hashed.
+        """
+        if not source.seekable():
+            return None
+        digest = hashlib.sha256(f"{CACHE_FORMAT}:{tool_version()}:{schema}:".encode())
+        with capture(source):
+            # Hash the raw bytes, as binary sources such as pex apps are not valid text.
+            binary = getattr(source, "buffer", source)
+            while chunk := binary.read(HASH_CHUNK_SIZE):
+                digest.update(chunk.encode() if isinstance(chunk, str) else chunk)
+        return digest.hexdigest()
+
+    def load(self, key: str) -> CachedData | None:
+        path = os.path.join(self.path, key)
+        try:
+            with open(path, "rb") as f:
+                info, resolves = marshal.load(f)
+            # Record the use of this entry for eviction.
+            os.utime(path)
+        except (OSError, EOFError, ValueError, TypeError):
+            return None
+        return CachedData(
+            raw=dict(cache_key=key),
+            info=_load(info),
+            resolves=(
+                None
+                if resolves is None
+                else {name: _load(resolve) for name, resolve in resolves.items()}
+            ),
+        )
+
+    def store(self, key: str, data: ParsedData) -> None:
+        """Store the info of `data` for `key`.
+
+        Failing to write to the cache is not an error, the entry is simply not cached.
+        """
+        info = _dump(data.get_info())
+        resolves: dict[str, _Dump] | None = {
+            name: _dump(resolve) for name, resolve in data.get_resolves().items()
+        }
+        if resolves == {DEFAULT_RESOLVE: info}:
+            resolves = None
+
+        path = os.path.join(self.path, key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(self.path, exist_ok=True)
+            with open(tmp_path, "wb") as f:
+                marshal.dump((info, resolves), f)
+            os.replace(tmp_path, path)
+            self.evict()
+        except OSError:
+            return
+
+    def evict(self) -> None:
+        """Remove the least recently used entries until the cache fits in `max_size` bytes."""
+        entries = []
+        total_size = 0
+        with os.scandir(self.path) as it:
+            for entry in it:
+                if not entry.is_file():
+                    continue
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+                total_size += stat.st_size
+        entries.sort()
+        for _, size, path in entries:
+            if total_size <= self.max_size:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                # Evicted by a concurrent run.
+                pass
+            total_size -= size
+
+
+_Dump = Tuple[List[Tuple[str, str]], Dict[str, Tuple[str, ...]], Dict[str, Tuple[str, ...]]]
+
+
+class MemoryCache(LockfileCache):
+    """In memory cache of the parsed info of the most recently used lockfiles, for long running
+    processes serving many diffs.
+
+    Keyed the same way as the on disk cache, which is used for entries missing in memory when a
+    `path` is given. Safe to use from multiple threads.
+    """
+
+    def __init__(
+        self,
+        path: str | None = None,
+        max_size: int = DEFAULT_MAX_SIZE,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+    ) -> None:
+        super().__init__(path or "", max_size)
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, CachedData] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def load(self, key: str) -> CachedData | None:
+        with self._lock:
+            data = self._entries.get(key)
+            if data is not None:
+                self._entries.move_to_end(key)
+                return data
+        data = super().load(key) if self.path else None
+        if data is not None:
+            self._add(key, data)
+        return data
+
+    def store(self, key: str, data: ParsedData) -> None:
+        cached = CachedData(
+            raw=dict(cache_key=key), info=data.get_info(), resolves=data.get_resolves()
+        )
+        self._add(key, cached)
+        if self.path:
+            super().store(key, cached)
+
+    def _add(self, key: str, data: CachedData) -> None:
+        with self._lock:
+            self._entries[key] = data
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+def _dump(info: LockfileInfo) -> _Dump:
+    dists = Dists.of(info.dists)
+    return (
+        list(zip(dists.names, dists.versions)),
+        {name: tuple(names) for name, names in info.dependencies.items()},
+        dict(info.hashes),
+    )
+
+
+def _load(dump: _Dump) -> LockfileInfo:
+    dists, dependencies, hashes = dump
+    return LockfileInfo.create(dists, dependencies, hashes)
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import os
+from io import StringIO
+from pathlib import Path
+
+from lockfile_diff.cache import LockfileCache
+from lockfile_diff.types import DEFAULT_RESOLVE, LockfileInfo, ParsedData
+from lockfile_diff.util.io.named import open_bytes
+
+
+class MockData(ParsedData):
+    def get_info(self) -> LockfileInfo:
+        return LockfileInfo.create(
+            self.raw["dists"], self.raw.get("dependencies"), self.raw.get("hashes")
+        )
+
+
+class MockResolvesData(MockData):
+    def get_resolves(self) -> dict[str, LockfileInfo]:
+        return {dist[0]: LockfileInfo.create([dist]) for dist in self.raw["dists"]}
+
+
+def test_key(tmp_path: Path) -> None:
+    cache = LockfileCache(str(tmp_path))
+    source = open_bytes(b"lockfile", "lockfile.lock")
+    key = cache.key(source, "mock")
+    assert key is not None
+    assert source.read() == "lockfile"
+    assert cache.key(StringIO("lockfile"), "mock") == key
+    assert cache.key(StringIO("lockfile"), "other") != key
+    assert cache.key(StringIO("lockfile2"), "mock") != key
+
+
+def test_store_and_load(tmp_path: Path) -> None:
+    cache = LockfileCache(str(tmp_path / "cache"))
+    assert cache.load("key") is None
+
+    cache.store("key", MockData(dict(dists=[("a", "1.0"), ("b", "2.0")])))
+    data = cache.load("key")
+    assert data is not None
+    assert data.get_info() == LockfileInfo.create([("a", "1.0"), ("b", "2.0")])
+    assert data.get_resolves() == {DEFAULT_RESOLVE: data.get_info()}
+
+    cache.store(
+        "deps",
+        MockData(
+            dict(
+                dists=[("a", "1.0"), ("b", "2.0")],
+                dependencies={"a": ["b"]},
+                hashes={"b": ("sha256:abc",)},
+            )
+        ),
+    )
+    data = cache.load("deps")
+    assert data is not None
+    assert data.get_info().dependencies == {"a": ("b",)}
+    assert data.get_info().hashes == {"b": ("sha256:abc",)}
+
+    cache.store("resolves", MockResolvesData(dict(dists=[("a", "1.0"), ("b", "2.0")])))
+    data = cache.load("resolves")
+    assert data is not None
+    assert data.get_resolves() == {
+        "a": LockfileInfo.create([("a", "1.0")]),
+        "b": LockfileInfo.create([("b", "2.0")]),
+    }
+
+
+def test_load_corrupt(tmp_path: Path) -> None:
+    (tmp_path / "key").write_bytes(b"garbage")
+    assert LockfileCache(str(tmp_path)).load("key") is None
+
+
+def test_evict(tmp_path: Path) -> None:
+    cache = LockfileCache(str(tmp_path))
+    data = MockData(dict(dists=[("a", "1.0")]))
+    cache.store("first", data)
+    cache.store("second", data)
+    entry_size = (tmp_path / "first").stat().st_size
+    os.utime(tmp_path / "first", (0, 0))
+    os.utime(tmp_path / "second", (1, 1))
+
+    # Using an entry makes it the most recently used one.
+    assert cache.load("first") is not None
+    cache.max_size = 2 * entry_size
+    cache.store("third", data)
+    assert sorted(os.listdir(tmp_path)) == ["first", "third"]
@@ -0,0 +1,82 @@
+"""Thin client for requesting diffs from a `lockfile-diff --serve SOCKET` server.
+
+Only uses the standard library, so it starts in a fraction of the time of the full command line
+interface, while the server keeps the schemas, versions and parsed lockfiles warm.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import socket
+import sys
+from typing import Any, Mapping, Sequence
+
+
+def request_diff(path: str, request: Mapping[str, Any]) -> dict[str, Any]:
+    """Send `request` to the server listening on the Unix domain socket at `path`, and return its
+    response."""
+    with socket.socket(socket.AF_UNIX) as sock:
+        sock.connect(path)
+        with sock.makefile("rwb") as stream:
+            stream.write(json.dumps(request).encode() + b"\n")
+            stream.flush()
+            line = stream.readline()
+    if not line:
+        raise ConnectionError(f"no response from {path}")
+    response: dict[str, Any] = json.loads(line)
+    return response
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="lockfile-diff-client",
+        description="Request a lockfile diff from a running `lockfile-diff --serve` server.",
+    )
+    parser.add_argument(
+        "--socket",
+        default=os.environ.get("LOCKFILE_DIFF_SOCKET"),
+        required="LOCKFILE_DIFF_SOCKET" not in os.environ,
+        help="Unix domain socket of the server. Defaults to $LOCKFILE_DIFF_SOCKET.",
+    )
+    parser.add_argument("--old-lockfile", "--old", metavar="LOCKFILE")
+    parser.add_argument("--new-lockfile", "--new", metavar="LOCKFILE")
+    parser.add_argument("--compare", metavar="COMMIT")
+    parser.add_argument("--lockfile-schema", default="auto-detect")
+    parser.add_argument("--output-format", default="text")
+    parser.add_argument("--by-resolve", action="store_true")
+    parser.add_argument("--include", metavar="GLOB", action="append", default=[])
+    parser.add_argument("--exclude", metavar="GLOB", action="append", default=[])
+    parser.add_argument("--min-bump", choices=("major", "minor", "micro", "pre", "post", "local"))
+    for name, default in (
+        ("unchanged", False),
+        ("changed", True),
+        ("added", True),
+        ("removed", True),
+        ("drifted", True),
+        ("impact", False),
+    ):
+        parser.add_argument(f"--{name}", dest=name, action="store_true", default=default)
+        parser.add_argument(f"--no-{name}", dest=name, action="store_false")
+    args = parser.parse_args(argv)
+    if args.old_lockfile is None and args.new_lockfile is None:
+        parser.error("Must provide either --old-lockfile or --new-lockfile")
+
+    request = {key: value for key, value in vars(args).items() if key != "socket"}
+    request.update(cwd=os.getcwd(), color=sys.stdout.isatty())
+    try:
+        response = request_diff(args.socket, request)
+    except OSError as e:
+        print(f"ERROR: failed to connect to {args.socket}: {e}", file=sys.stderr)
+        return 1
+    output = response["output"]
+    if output:
+        sys.stdout.write(output if output.endswith("\n") else f"{output}\n")
+    if response["error"]:
+        print(f"ERROR: {response['error']}", file=sys.stderr)
+    exit_code: int = response["exit_code"]
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
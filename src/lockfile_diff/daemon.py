@@ -0,0 +1,211 @@
+from __future__ import annotations
+
+import json
+import os
+import socket
+import socketserver
+import threading
+from collections import OrderedDict
+from contextlib import ExitStack
+from dataclasses import dataclass
+from typing import IO, Any, Callable, Sequence
+
+import click
+
+from lockfile_diff.base import Format
+from lockfile_diff.cache import LockfileCache
+from lockfile_diff.errors import FAILED_TO_OPEN_FILE, FAILED_TO_PARSE_FILE
+from lockfile_diff.git import GitError, GitObjects
+from lockfile_diff.parser import Parser, Source
+from lockfile_diff.registries import Registries
+from lockfile_diff.types import BUMP_LEGACY, BUMPS, DiffFilter
+
+# Exit code for requests the server does not understand.
+INVALID_REQUEST = 3
+# Number of work trees to keep a `git cat-file` process running for.
+MAX_GIT_PROCESSES = 16
+
+
+@dataclass(frozen=True)
+class DiffRequest:
+    """A diff to run, with the same meaning as the command line options of the same names.
+
+    Relative paths are relative to `cwd`, which is also the git work tree to read revisions from.
+    """
+
+    cwd: str
+    old_lockfile: str | None = None
+    new_lockfile: str | None = None
+    compare: str | None = None
+    lockfile_schema: str = "auto-detect"
+    output_format: str = "text"
+    by_resolve: bool = False
+    unchanged: bool = False
+    changed: bool = True
+    added: bool = True
+    removed: bool = True
+    drifted: bool = True
+    include: Sequence[str] = ()
+    exclude: Sequence[str] = ()
+    # Name of the least significant bump level to list, see `BUMPS`.
+    min_bump: str | None = None
+    impact: bool = False
+    # Keep the ANSI styles of the text output.
+    color: bool = False
+
+    def __post_init__(self) -> None:
+        registries = Registries.get_default()
+        for name, value, choices in (
+            ("lockfile_schema", self.lockfile_schema, tuple(registries.schemas)),
+            ("output_format", self.output_format, tuple(registries.output_formats)),
+            ("min_bump", self.min_bump, BUMPS),
+        ):
+            if value is not None and value not in choices:
+                raise ValueError(f"unknown {name} {value!r}, expected one of {choices}")
+
+
+class DiffServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Serve diffs over a Unix domain socket, from a process that stays warm between requests.
+
+    Each request is a JSON encoded `DiffRequest` on a single line, answered with a JSON object on a
+    single line holding the encoded diff as `output`, the `exit_code` of the equivalent command
+    line and an `error` message, if any. The schemas, output formats and parsed versions stay
+    loaded, parsed lockfiles are kept in the `cache`, and a `git cat-file` process is kept running
+    for each of the `max_git_processes` most recently used work trees.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        path: str,
+        cache: LockfileCache | None = None,
+        max_git_processes: int = MAX_GIT_PROCESSES,
+    ) -> None:
+        super().__init__(path, DiffRequestHandler)
+        self.path = path
+        self.cache = cache
+        self.max_git_processes = max_git_processes
+        self._git: OrderedDict[str, GitObjects] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def server_close(self) -> None:
+        super().server_close()
+        with self._lock:
+            for git in self._git.values():
+                git.close()
+            self._git.clear()
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+    def git(self, cwd: str) -> GitObjects:
+        with self._lock:
+            git = self._git.get(cwd)
+            if git is None:
+                git = self._git[cwd] = GitObjects(cwd=cwd)
+            self._git.move_to_end(cwd)
+            evicted = [
+                self._git.popitem(last=False)[1]
+                for _ in range(len(self._git) - self.max_git_processes)
+            ]
+        for stale in evicted:
+            # Waits for any read in progress.
+            stale.close()
+        return git
+
+    def respond(self, line: bytes) -> dict[str, Any]:
+        try:
+            request = DiffRequest(**json.loads(line))
+        except (ValueError, TypeError) as e:
+            return dict(output="", exit_code=INVALID_REQUEST, error=f"invalid request: {e}")
+        try:
+            return dict(output=self.diff(request), exit_code=0, error=None)
+        except (GitError, OSError) as e:
+            return dict(output="", exit_code=FAILED_TO_OPEN_FILE, error=str(e))
+        except ValueError as e:
+            return dict(output="", exit_code=FAILED_TO_PARSE_FILE, error=str(e))
+
+    def diff(self, request: DiffRequest) -> str:
+        if request.old_lockfile is None and request.new_lockfile is None:
+            raise ValueError("Must provide either old_lockfile or new_lockfile")
+        with ExitStack() as stack:
+
+            def local(path: str) -> IO:
+                return stack.enter_context(open(os.path.join(request.cwd, path)))
+
+            def revision(rev: str, path: str) -> Callable[[], IO]:
+                # Look up the git objects as the source is opened, as they may have been closed
+                # in the meantime to bound the number of git processes, see `git`.
+                return lambda: self.git(request.cwd).open(rev, path)
+
+            old_source: Source = None
+            new_source: Source = None
+            if request.old_lockfile is not None:
+                old_source = local(request.old_lockfile)
+            elif request.compare is not None:
+                assert request.new_lockfile is not None
+                old_source = revision(request.compare, request.new_lockfile)
+            if request.new_lockfile is not None:
+                new_source = local(request.new_lockfile)
+            elif request.compare is not None:
+                assert request.old_lockfile is not None
+                new_source = revision(request.compare, request.old_lockfile)
+
+            kwargs: dict[str, Any] = dict(
+                diff_filter=DiffFilter(
+                    unchanged=request.unchanged,
+                    changed=request.changed,
+                    added=request.added,
+                    removed=request.removed,
+                    drifted=request.drifted,
+                    impact=request.impact,
+                    include=tuple(request.include),
+                    exclude=tuple(request.exclude),
+                    min_bump=BUMPS.index(request.min_bump) if request.min_bump else BUMP_LEGACY,
+                )
+            )
+            if request.lockfile_schema == "auto-detect":
+                # Return why no schema could parse a lockfile to the client.
+                kwargs["raise_errors"] = True
+            if self.cache is not None:
+                kwargs["cache"] = self.cache
+            if request.by_resolve:
+                diff: Any = Parser.diff_resolves(
+                    old_source, new_source, request.lockfile_schema, **kwargs
+                )
+            else:
+                diff = Parser.diff(old_source, new_source, request.lockfile_schema, **kwargs)
+        output = Format(request.output_format).encode(diff)
+        return output if request.color else click.unstyle(output)
+
+
+class DiffRequestHandler(socketserver.StreamRequestHandler):
+    server: DiffServer
+
+    def handle(self) -> None:
+        for line in self.rfile:
+            response = self.server.respond(line)
+            self.wfile.write(json.dumps(response).encode() + b"\n")
+            self.wfile.flush()
+
+
+def serve(path: str, cache: LockfileCache | None = None) -> None:
+    """Serve diffs on the Unix domain socket at `path` until interrupted.
+
+    A socket left behind by a server that is no longer running is replaced.
+    """
+    if os.path.exists(path):
+        with socket.socket(socket.AF_UNIX) as probe:
+            try:
+                probe.connect(path)
+            except ConnectionRefusedError:
+                os.remove(path)
+            else:
+                raise click.ClickException(f"A server is already listening on {path}.")
+    with DiffServer(path, cache) as server:
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
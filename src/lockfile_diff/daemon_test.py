@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import tempfile
+import threading
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+
+from lockfile_diff.cache import MemoryCache
+from lockfile_diff.client import main, request_diff
+from lockfile_diff.daemon import INVALID_REQUEST, DiffServer
+from lockfile_diff.errors import FAILED_TO_OPEN_FILE, FAILED_TO_PARSE_FILE
+from lockfile_diff.git import GitError
+
+LOCKFILE = """\
+[[entries]]
+[entries.coord]
+artifact = "lib"
+version = "{version}"
+"""
+
+
+@pytest.fixture
+def server() -> Iterator[DiffServer]:
+    # Unix socket paths are limited to about a hundred characters, which `tmp_path` may exceed.
+    with tempfile.TemporaryDirectory() as tmp:
+        server = DiffServer(os.path.join(tmp, "lockfile-diff.sock"), MemoryCache())
+        thread = threading.Thread(target=server.serve_forever)
+        thread.start()
+        try:
+            yield server
+        finally:
+            server.shutdown()
+            thread.join()
+            server.server_close()
+        assert not os.path.exists(server.path)
+
+
+def test_request_diff(server: DiffServer, tmp_path: Path) -> None:
+    (tmp_path / "old.lock").write_text(LOCKFILE.format(version="1.0"))
+    (tmp_path / "new.lock").write_text(LOCKFILE.format(version="1.1"))
+    request = dict(
+        cwd=str(tmp_path), old_lockfile="old.lock", new_lockfile="new.lock", output_format="json"
+    )
+    response = request_diff(server.path, request)
+    assert response["exit_code"] == 0
+    assert json.loads(response["output"])["upgraded"] == {"lib": ["1.0", "1.1"]}
+
+    assert isinstance(server.cache, MemoryCache)
+    assert len(server.cache._entries) == 2
+    before = server.cache._entries.copy()
+    assert request_diff(server.path, request) == response
+    assert server.cache._entries == before
+
+
+def test_request_diff_errors(
+    server: DiffServer, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    path = server.path
+    response = request_diff(path, dict(cwd=str(tmp_path), new_lockfile="missing.lock"))
+    assert response["exit_code"] == FAILED_TO_OPEN_FILE
+    assert "missing.lock" in response["error"]
+
+    (tmp_path / "broken.lock").write_text("not a lockfile")
+    response = request_diff(path, dict(cwd=str(tmp_path), new_lockfile="broken.lock"))
+    assert response["exit_code"] == FAILED_TO_PARSE_FILE
+    assert "`auto-detect` failed to parse" in response["error"]
+    assert "`pex`: signature does not match" in response["error"]
+    assert capsys.readouterr().err == ""
+
+    response = request_diff(path, dict(cwd=str(tmp_path), lockfile="new.lock"))
+    assert response["exit_code"] == INVALID_REQUEST
+
+    response = request_diff(
+        path, dict(cwd=str(tmp_path), new_lockfile="missing.lock", min_bump="huge")
+    )
+    assert response["exit_code"] == INVALID_REQUEST
+    assert "min_bump" in response["error"]
+
+    for option in ("lockfile_schema", "output_format"):
+        response = request_diff(
+            path, dict(cwd=str(tmp_path), new_lockfile="missing.lock", **{option: "unknown"})
+        )
+        assert response["exit_code"] == INVALID_REQUEST
+        assert option in response["error"]
+
+
+def test_client(
+    server: DiffServer,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    (tmp_path / "new.lock").write_text(LOCKFILE.format(version="1.1"))
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("LOCKFILE_DIFF_SOCKET", server.path)
+    assert main(["--new", "new.lock", "--old", "new.lock", "--unchanged"]) == 0
+    assert "lib" in capsys.readouterr().out
+
+
+def test_git_processes_are_bounded(tmp_path: Path) -> None:
+    subprocess.run(["git", "init"], cwd=tmp_path, check=True, capture_output=True)
+    work_trees = [tmp_path / name for name in "abc"]
+    for work_tree in work_trees:
+        work_tree.mkdir()
+    with tempfile.TemporaryDirectory() as tmp:
+        server = DiffServer(os.path.join(tmp, "lockfile-diff.sock"), max_git_processes=2)
+        try:
+            gits = []
+            for work_tree in work_trees:
+                git = server.git(str(work_tree))
+                with pytest.raises(GitError):
+                    git.read("HEAD", "missing.lock")
+                gits.append(git)
+            # The least recently used git process was stopped, and is not started again.
+            assert [git._process is not None for git in gits] == [False, True, True]
+            with pytest.raises(GitError, match="closed"):
+                gits[0].read("HEAD", "missing.lock")
+            assert gits[0]._process is None
+            assert server.git(str(work_trees[2])) is gits[2]
+        finally:
+            server.server_close()
+        assert [git._process is not None for git in gits] == [False, False, False]
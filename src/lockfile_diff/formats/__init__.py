@@ -1,4 +0,0 @@
-from lockfile_diff.formats import json  # noqa
-from lockfile_diff.formats import text  # noqa
-from lockfile_diff.formats import toml  # noqa
-from lockfile_diff.formats import yaml  # noqa
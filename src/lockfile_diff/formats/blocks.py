@@ -1,20 +1,24 @@
 from __future__ import annotations
 
+import os.path
 import re
 from dataclasses import dataclass
+from functools import lru_cache
 from io import StringIO
-from itertools import count
-from typing import IO, Any, Sequence
+from typing import IO, Any, ClassVar, Sequence, cast
 
 from lockfile_diff.base import InputBase
 from lockfile_diff.types import ParsedData
-from lockfile_diff.util.io.rewind import capture
+from lockfile_diff.util.io.chain import ChainedReader
 
 
+@dataclass(frozen=True)
 class ParsedCommentBlock(ParsedData):
+    remainder: IO
+
     @classmethod
-    def create(cls, comment_block: str) -> ParsedCommentBlock:
-        return cls(raw=dict(comment_block=comment_block))
+    def create(cls, comment_block: str, remainder: IO) -> ParsedCommentBlock:
+        return cls(raw=dict(comment_block=comment_block), remainder=remainder)
 
     @property
     def source(self) -> IO:
@@ -25,32 +29,40 @@ class ParsedCommentBlock(ParsedData):
 class CommentBlock(InputBase):
     prefix: str
 
-    def parse(self, source: IO) -> ParsedData:
-        longest_common_prefix: str | None = None
-        lines: list[str] = []
-        with capture(source) as c:
-            while line := source.readline():
-                if not line.strip():
-                    c.commit()
-                    continue
-                if not line.startswith(self.prefix):
-                    break
-                lines.append(line)
-                c.commit()
-                if longest_common_prefix is None:
-                    longest_common_prefix = line
-                    continue
-                for left, right, idx in zip(longest_common_prefix, line, count()):
-                    if right in (left, "\n"):
-                        continue
-                    longest_common_prefix = longest_common_prefix[:idx]
-                    break
+    READ_SIZE: ClassVar[int] = 64 * 1024
+
+    def parse(self, source: IO) -> ParsedCommentBlock:
+        """Parse the comment block at the start of `source`.
+
+        The block is read in chunks and scanned for its end in a single pass. The rest of
+        `source`, following the comment block, is available as the `remainder` of the returned
+        data.
+        """
+        # Comment lines, optionally interleaved with blank lines.
+        block = re.compile(rf"(?:[^\S\n]*\n|{re.escape(self.prefix)}[^\n]*(?:\n|\Z))*")
+        buf = ""
+        end = 0
+        while True:
+            chunk = source.read(self.READ_SIZE)
+            buf += chunk
+            end = block.match(buf, end).end()  # type: ignore[union-attr]
+            if not chunk or buf.find("\n", end) != -1:
+                break
+            # The last line is incomplete, rescan it once we have read more.
+            end = buf.rfind("\n", 0, end) + 1
+
+        lines = [line for line in buf[:end].splitlines(keepends=True) if line.strip()]
+        # Lines with nothing but the prefix do not count towards the common prefix.
+        content = [line for line in lines if len(line.rstrip()) > len(self.prefix)]
+        longest_common_prefix = os.path.commonprefix(content or lines)
         if not longest_common_prefix:
             raise ValueError("not a comment block")
 
         # Compile prefix regexp prefix substitution pattern, trailing spaces is optional.
-        prefix = re.compile("^" + re.escape(longest_common_prefix).replace(" ", " ?"))
-        return ParsedCommentBlock.create("".join(prefix.sub("", line) for line in lines))
+        prefix = re.compile("^" + re.escape(longest_common_prefix).replace(" ", " ?"), re.MULTILINE)
+        return ParsedCommentBlock.create(
+            prefix.sub("", "".join(lines)), remainder=cast(IO, ChainedReader(buf[end:], source))
+        )
 
     def encode(self, dest: IO, data: Any) -> None:
         raise NotImplementedError()
@@ -58,12 +70,17 @@ class CommentBlock(InputBase):
 
 class ParsedSections(ParsedData):
     @classmethod
-    def create(cls, sections: Sequence[str]) -> ParsedSections:
-        return cls(raw=dict(sections=sections))
+    def create(cls, buffer: str, spans: Sequence[tuple[int, int]]) -> ParsedSections:
+        return cls(raw=dict(buffer=buffer, spans=spans))
+
+    @property
+    def sections(self) -> Sequence[str]:
+        buffer = self.raw["buffer"]
+        return tuple(buffer[start:end] for start, end in self.raw["spans"])
 
     @property
     def source(self) -> IO:
-        return StringIO("\n".join(self.raw["sections"]))
+        return StringIO("\n".join(self.sections))
 
 
 @dataclass(frozen=True)
@@ -71,21 +88,52 @@ class Sections(InputBase):
     delimiter: str
     keep: slice | int
 
-    def parse(self, source: IO) -> ParsedData:
-        sections = []
-        lines: list[str] = []
-        while line := source.readline():
-            if re.search(self.delimiter, line):
-                sections.append("".join(lines))
-                lines.clear()
-            else:
-                lines.append(line)
-
-        if lines:
-            sections.append("".join(lines))
-
-        s = self.keep if isinstance(self.keep, slice) else slice(self.keep, self.keep + 1)
-        return ParsedSections.create(tuple(sections[s]))
+    @property
+    def pattern(self) -> re.Pattern:
+        return _compile_delimiter(self.delimiter)
+
+    def parse(self, source: IO) -> ParsedSections:
+        """Split `source` into sections on lines matching the `delimiter` pattern.
+
+        The sections are kept as `(start, end)` offsets into the source text, and scanning stops as
+        soon as all sections to `keep` have been found.
+        """
+        buffer = source.read()
+        keep = self.keep if isinstance(self.keep, slice) else slice(self.keep, self.keep + 1)
+        needed = keep.stop if _is_forward(keep) else None
+
+        spans: list[tuple[int, int]] = []
+        start = 0
+        for m in self.pattern.finditer(buffer):
+            line_start = buffer.rfind("\n", 0, m.start()) + 1
+            if line_start < start:
+                # Delimiter matched again on the same line.
+                continue
+            spans.append((start, line_start))
+            start = buffer.find("\n", m.start()) + 1 or len(buffer)
+            if needed is not None and len(spans) >= needed:
+                break
+        else:
+            if start < len(buffer):
+                spans.append((start, len(buffer)))
+
+        return ParsedSections.create(buffer, tuple(spans[keep]))
 
     def encode(self, dest: IO, data: Any) -> None:
         raise NotImplementedError()
+
+
+@lru_cache(maxsize=None)
+def _compile_delimiter(delimiter: str) -> re.Pattern:
+    """Compile the `delimiter` pattern of `Sections` once, rather than for each instance."""
+    return re.compile(delimiter, re.MULTILINE)
+
+
+def _is_forward(s: slice) -> bool:
+    """Whether `s` selects items from a known number of leading items only."""
+    return (
+        s.stop is not None
+        and s.stop >= 0
+        and (s.start is None or s.start >= 0)
+        and (s.step is None or s.step > 0)
+    )
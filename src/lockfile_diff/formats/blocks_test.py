@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+from io import StringIO
+
+import pytest
+
+from lockfile_diff.formats.blocks import CommentBlock, Sections
+
+HEADER = """\
+// This lockfile was autogenerated by Pants. To regenerate, run:
+//
+//    ./pants generate-lockfiles --resolve=test-pex
+//
+// --- BEGIN PANTS LOCKFILE METADATA: DO NOT EDIT OR REMOVE ---
+// {
+//   "version": 3
+// }
+// --- END PANTS LOCKFILE METADATA ---
+
+"""
+
+
+@pytest.mark.parametrize("read_size", [3, 64 * 1024])
+def test_comment_block(read_size: int, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(CommentBlock, "READ_SIZE", read_size)
+    block = CommentBlock(prefix="//").parse(StringIO(HEADER + '{\n  "pex_version": "2"\n}\n'))
+    assert block.raw["comment_block"] == (
+        "This lockfile was autogenerated by Pants. To regenerate, run:\n"
+        "\n"
+        "   ./pants generate-lockfiles --resolve=test-pex\n"
+        "\n"
+        "--- BEGIN PANTS LOCKFILE METADATA: DO NOT EDIT OR REMOVE ---\n"
+        "{\n"
+        '  "version": 3\n'
+        "}\n"
+        "--- END PANTS LOCKFILE METADATA ---\n"
+    )
+    assert block.remainder.read() == '{\n  "pex_version": "2"\n}\n'
+
+
+def test_comment_block_only() -> None:
+    block = CommentBlock(prefix="#").parse(StringIO("# some\n# comment"))
+    assert block.raw["comment_block"] == "some\ncomment"
+    assert block.remainder.read() == ""
+
+
+def test_not_a_comment_block() -> None:
+    with pytest.raises(ValueError, match="not a comment block"):
+        CommentBlock(prefix="#").parse(StringIO("[[entries]]\n"))
+
+
+@pytest.mark.parametrize(
+    "keep, expected",
+    [
+        (0, ("intro\n",)),
+        (1, ("first\nsection\n",)),
+        (2, ("second\n",)),
+        (3, ("tail\n",)),
+        (slice(1, None), ("first\nsection\n", "second\n", "tail\n")),
+        (slice(-2, None), ("second\n", "tail\n")),
+        (4, ()),
+    ],
+)
+def test_sections(keep: slice | int, expected: tuple[str, ...]) -> None:
+    source = StringIO("intro\n--- a\nfirst\nsection\n--- b\nsecond\n--- c --- d\ntail\n")
+    sections = Sections(delimiter="^--- ", keep=keep).parse(source)
+    assert sections.sections == expected
+    assert sections.source.read() == "\n".join(expected)
+
+
+def test_sections_pattern_compiled_once() -> None:
+    assert (
+        Sections(delimiter="^--- ", keep=0).pattern is Sections(delimiter="^--- ", keep=1).pattern
+    )
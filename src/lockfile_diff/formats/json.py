@@ -1,13 +1,13 @@
 from __future__ import annotations
 
 import json
-from dataclasses import asdict, is_dataclass
-from typing import IO, Any, overload
+from dataclasses import is_dataclass
+from typing import IO, Any, Iterable, Iterator, Mapping, overload
 
 from packaging.version import LegacyVersion, Version
 
 from lockfile_diff.base import InputFormat, OutputFormat
-from lockfile_diff.types import ParsedData
+from lockfile_diff.types import ParsedData, encoded_fields
 
 
 class JSONDecoder(InputFormat):
@@ -31,14 +31,25 @@ class JSONEncoder(OutputFormat):
     def encode(self, data: Any, dest: IO | None = None) -> None | str:
         if dest is None:
             return json.dumps(data, cls=_JSONEncoder)
+        # Writes each chunk to `dest` as it is encoded.
         json.dump(data, dest, cls=_JSONEncoder)
         return None
 
+    def encode_stream(self, items: Iterable[tuple[str, Any]]) -> Iterator[str]:
+        separator = "{"
+        for key, data in items:
+            yield f"{separator}{json.dumps(key)}: {self.encode(data)}"
+            separator = ", "
+        yield "{}" if separator == "{" else "}"
+
 
 class _JSONEncoder(json.JSONEncoder):
     def default(self, o):
         if isinstance(o, (LegacyVersion, Version)):
             return str(o)
         if is_dataclass(o):
-            return asdict(o)
+            # Shallow, the field values are encoded as they are reached.
+            return encoded_fields(o)
+        if isinstance(o, Mapping):
+            return dict(o)
         return super().default(o)
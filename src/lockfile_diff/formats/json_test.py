@@ -2,6 +2,7 @@ import json
 from io import StringIO
 
 from lockfile_diff.base import Format
+from lockfile_diff.types import LockfileDiff, LockfileInfo
 
 
 def test_parse_json() -> None:
@@ -9,3 +10,24 @@ def test_parse_json() -> None:
     contents = StringIO(json.dumps(data))
     res = Format("json").parse(contents)
     assert res.raw == data
+
+
+def test_encode_stream_json() -> None:
+    report = dict(a=dict(x=1), b=[2])
+    assert json.loads("".join(Format("json").encode_stream(report.items()))) == report
+    assert json.loads("".join(Format("json").encode_stream([]))) == {}
+
+
+def test_encode_diff_omits_empty_optional_fields() -> None:
+    diff = LockfileDiff.create(
+        LockfileInfo.create([("six", "1.0")]), LockfileInfo.create([("six", "1.1")])
+    )
+    assert json.loads(Format("json").encode(diff)) == dict(
+        added={},
+        removed={},
+        unchanged={},
+        upgraded={"six": ["1.0", "1.1"]},
+        downgraded={},
+        bumps={"six": "minor"},
+        summary={"minor": 1},
+    )
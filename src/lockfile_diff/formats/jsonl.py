@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import json
+from io import StringIO
+from typing import IO, Any, Iterator, Mapping, overload
+
+from lockfile_diff.base import OutputFormat
+from lockfile_diff.types import LockfileDiff
+
+
+class JSONLinesEncoder(OutputFormat):
+    """One JSON record per line for each dist in a diff.
+
+    Each record holds the `key` path of the diff in the report, the dist `name`, the kind of
+    `change` and the `old` and `new` versions, `null` for added and removed dists respectively.
+    Records of upgraded and downgraded dists have the level of the version `bump`, and records of
+    changed dists with known top level requirements list them as `required_by`. Records of changed
+    top level requirements list the changed dists depending on them as `pulled_in`.
+    """
+
+    format = "jsonl"
+
+    @overload
+    def encode(self, data: Any, dest: IO) -> None:
+        ...
+
+    @overload
+    def encode(self, data: Any) -> str:
+        ...
+
+    def encode(self, data: Any, dest: IO | None = None) -> None | str:
+        if dest is None:
+            output = StringIO()
+            self.encode(data, output)
+            return output.getvalue()
+        for record in self.records(data):
+            dest.write(json.dumps(record))
+            dest.write("\n")
+        return None
+
+    @classmethod
+    def records(cls, data: Any, *keys: str) -> Iterator[dict[str, Any]]:
+        if isinstance(data, LockfileDiff):
+            yield from cls.diff_records(data, list(keys))
+        elif isinstance(data, Mapping):
+            for key, value in data.items():
+                yield from cls.records(value, *keys, key)
+        else:
+            raise ValueError(f"Unexpected data to encode: {data!r}")
+
+    @classmethod
+    def diff_records(cls, diff: LockfileDiff, key: list[str]) -> Iterator[dict[str, Any]]:
+        for record in cls.change_records(diff, key):
+            if record["name"] in diff.bumps:
+                record["bump"] = diff.bumps[record["name"]]
+            if record["name"] in diff.required_by:
+                record["required_by"] = list(diff.required_by[record["name"]])
+            if record["name"] in diff.pulled_in:
+                record["pulled_in"] = list(diff.pulled_in[record["name"]])
+            yield record
+
+    @staticmethod
+    def change_records(diff: LockfileDiff, key: list[str]) -> Iterator[dict[str, Any]]:
+        for name, version in diff.added.items():
+            yield dict(key=key, name=name, change="added", old=None, new=str(version))
+        for name, version in diff.removed.items():
+            yield dict(key=key, name=name, change="removed", old=str(version), new=None)
+        for name, version in diff.unchanged.items():
+            yield dict(key=key, name=name, change="unchanged", old=str(version), new=str(version))
+        for name, version in diff.drifted.items():
+            yield dict(key=key, name=name, change="drifted", old=str(version), new=str(version))
+        for change, changed in (("upgraded", diff.upgraded), ("downgraded", diff.downgraded)):
+            for name, (prev, curr) in changed.items():
+                yield dict(key=key, name=name, change=change, old=str(prev), new=str(curr))
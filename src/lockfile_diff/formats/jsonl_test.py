@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import json
+
+from lockfile_diff.base import Format
+from lockfile_diff.types import LockfileDiff, LockfileInfo
+
+
+def test_encode_jsonl() -> None:
+    diff = LockfileDiff.create(
+        LockfileInfo.create([("a", "1.0"), ("b", "1.0"), ("c", "2.0")]),
+        LockfileInfo.create([("a", "2.0"), ("c", "1.0"), ("d", "1.0")]),
+    )
+    output = Format("jsonl").encode({"app.lock": diff})
+    assert [json.loads(line) for line in output.splitlines()] == [
+        dict(key=["app.lock"], name="d", change="added", old=None, new="1.0"),
+        dict(key=["app.lock"], name="b", change="removed", old="1.0", new=None),
+        dict(key=["app.lock"], name="a", change="upgraded", old="1.0", new="2.0", bump="major"),
+        dict(key=["app.lock"], name="c", change="downgraded", old="2.0", new="1.0", bump="major"),
+    ]
+    assert Format("jsonl").encode(diff).splitlines()[0] == (
+        '{"key": [], "name": "d", "change": "added", "old": null, "new": "1.0"}'
+    )
+
+
+def test_encode_jsonl_required_by() -> None:
+    diff = LockfileDiff.create(
+        LockfileInfo.create([("app", "1.0"), ("six", "1.0")], dependencies={"app": ["six"]}),
+        LockfileInfo.create([("app", "1.0"), ("six", "2.0")], dependencies={"app": ["six"]}),
+    )
+    assert [json.loads(line) for line in Format("jsonl").encode(diff).splitlines()] == [
+        dict(key=[], name="app", change="unchanged", old="1.0", new="1.0"),
+        dict(
+            key=[],
+            name="six",
+            change="upgraded",
+            old="1.0",
+            new="2.0",
+            bump="major",
+            required_by=["app"],
+        ),
+    ]
+
+
+def test_encode_jsonl_pulled_in() -> None:
+    diff = LockfileDiff.create(
+        LockfileInfo.create([("app", "1.0"), ("six", "1.0")], dependencies={"app": ["six"]}),
+        LockfileInfo.create([("app", "1.1"), ("six", "2.0")], dependencies={"app": ["six"]}),
+    )
+    assert json.loads(Format("jsonl").encode(diff).splitlines()[0]) == dict(
+        key=[],
+        name="app",
+        change="upgraded",
+        old="1.0",
+        new="1.1",
+        bump="minor",
+        required_by=["app"],
+        pulled_in=["six"],
+    )
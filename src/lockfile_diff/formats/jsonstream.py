@@ -0,0 +1,225 @@
+from __future__ import annotations
+
+import codecs
+import re
+from json import JSONDecodeError, JSONDecoder
+from json.decoder import scanstring  # type: ignore[attr-defined]
+from typing import IO, AbstractSet, Any, Iterator
+
+CHUNK_SIZE = 64 * 1024
+
+WHITESPACE = re.compile(r"[ \t\n\r]*")
+NUMBER_CHARS = re.compile(r"[-+.eE0-9]*")
+NUMBER = re.compile(r"(-?(?:0|[1-9][0-9]*))(\.[0-9]+)?([eE][-+]?[0-9]+)?")
+LITERALS = {"t": ("true", True), "f": ("false", False), "n": ("null", None)}
+
+scan_value = JSONDecoder().scan_once  # type: ignore[attr-defined]
+
+# Parser states.
+_VALUE = 0
+_VALUE_OR_END = 1
+_KEY = 2
+_KEY_OR_END = 3
+_COLON = 4
+_COMMA_OR_END = 5
+_DONE = 6
+
+
+def iterparse(
+    source: IO, chunk_size: int = CHUNK_SIZE, values: AbstractSet[str] = frozenset()
+) -> Iterator[tuple[str, str, Any]]:
+    """Incrementally parse the JSON document in `source`, yielding `(prefix, event, value)`
+    tuples.
+
+    The document is read in chunks of `chunk_size`, so memory use is bounded by the chunk size and
+    the length of the longest string in the document, regardless of the size of the document.
+
+    The `prefix` is the dotted path to the current value, with `item` for array items. The
+    `event` is one of `start_map`, `map_key`, `end_map`, `start_array`, `end_array`, `string`,
+    `number`, `boolean` or `null`, following the conventions of `ijson`.
+
+    Values with a prefix in `values` are decoded whole, using the C accelerated scanner of the
+    `json` module, and yielded as a single `value` event rather than as a series of events. This
+    is considerably faster for small objects that are going to be used as a whole anyway.
+    """
+    chunks = _read_chunks(source, chunk_size)
+    buf = ""
+    pos = 0
+    eof = False
+
+    # Stack of open containers: (is_map, prefix, item prefix)
+    stack: list[tuple[bool, str, str]] = []
+    prefix = ""
+    state = _VALUE
+
+    while True:
+        pos = WHITESPACE.match(buf, pos).end()  # type: ignore[union-attr]
+        if pos == len(buf):
+            if not eof:
+                buf, pos, eof = _fill(chunks, buf, pos)
+                continue
+            if state == _DONE:
+                return
+            raise JSONDecodeError("unexpected end of input", buf, pos)
+
+        char = buf[pos]
+
+        if state == _COMMA_OR_END:
+            is_map, container_prefix, item_prefix = stack[-1]
+            if char == ",":
+                pos += 1
+                if is_map:
+                    state = _KEY
+                else:
+                    prefix = item_prefix
+                    state = _VALUE
+                continue
+            if char != ("}" if is_map else "]"):
+                raise JSONDecodeError("expected ',' or end of container", buf, pos)
+            pos += 1
+            stack.pop()
+            yield container_prefix, "end_map" if is_map else "end_array", None
+            state = _COMMA_OR_END if stack else _DONE
+            continue
+
+        if state in (_KEY, _KEY_OR_END):
+            if char == "}" and state == _KEY_OR_END:
+                pos += 1
+                _, container_prefix, _ = stack.pop()
+                yield container_prefix, "end_map", None
+                state = _COMMA_OR_END if stack else _DONE
+                continue
+            if char != '"':
+                raise JSONDecodeError("expected property name", buf, pos)
+            try:
+                key, end = scanstring(buf, pos + 1)
+            except JSONDecodeError:
+                if eof:
+                    raise
+                buf, pos, eof = _fill(chunks, buf, pos)
+                continue
+            pos = end
+            container_prefix = stack[-1][1]
+            yield container_prefix, "map_key", key
+            prefix = f"{container_prefix}.{key}" if container_prefix else key
+            state = _COLON
+            continue
+
+        if state == _COLON:
+            if char != ":":
+                raise JSONDecodeError("expected ':'", buf, pos)
+            pos += 1
+            state = _VALUE
+            continue
+
+        if state == _DONE:
+            raise JSONDecodeError("extra data", buf, pos)
+
+        # state in (_VALUE, _VALUE_OR_END)
+        if char == "]" and state == _VALUE_OR_END:
+            pos += 1
+            _, container_prefix, _ = stack.pop()
+            yield container_prefix, "end_array", None
+            state = _COMMA_OR_END if stack else _DONE
+            continue
+
+        if prefix in values:
+            error: JSONDecodeError | None = None
+            try:
+                value, end = scan_value(buf, pos)
+            except StopIteration as e:
+                # The scanner raises `StopIteration` for missing values, also when nested.
+                error = JSONDecodeError("expected value", buf, e.value)
+            except JSONDecodeError as e:
+                error = e
+            if error is not None:
+                # Errors at the end of the buffer may be due to the value continuing in the next
+                # chunk.
+                truncated = error.pos >= len(buf) - 5 or error.msg.startswith("Unterminated")
+                if eof or not truncated:
+                    raise error
+                buf, pos, eof = _fill(chunks, buf, pos)
+                continue
+            if not eof and NUMBER_CHARS.match(buf, end).end() == len(buf):  # type: ignore[union-attr]
+                # A number may continue in the next chunk.
+                buf, pos, eof = _fill(chunks, buf, pos)
+                continue
+            pos = end
+            yield prefix, "value", value
+            state = _COMMA_OR_END if stack else _DONE
+            continue
+
+        if char == "{":
+            pos += 1
+            stack.append((True, prefix, prefix))
+            yield prefix, "start_map", None
+            state = _KEY_OR_END
+            continue
+
+        if char == "[":
+            pos += 1
+            item_prefix = f"{prefix}.item" if prefix else "item"
+            stack.append((False, prefix, item_prefix))
+            yield prefix, "start_array", None
+            prefix = item_prefix
+            state = _VALUE_OR_END
+            continue
+
+        if char == '"':
+            try:
+                value, end = scanstring(buf, pos + 1)
+            except JSONDecodeError:
+                if eof:
+                    raise
+                buf, pos, eof = _fill(chunks, buf, pos)
+                continue
+            pos = end
+            yield prefix, "string", value
+        elif char in LITERALS:
+            literal, value = LITERALS[char]
+            if not buf.startswith(literal, pos):
+                if len(buf) - pos < len(literal) and not eof:
+                    buf, pos, eof = _fill(chunks, buf, pos)
+                    continue
+                raise JSONDecodeError("invalid literal", buf, pos)
+            pos += len(literal)
+            yield prefix, "null" if value is None else "boolean", value
+        else:
+            end = NUMBER_CHARS.match(buf, pos).end()  # type: ignore[union-attr]
+            if end == len(buf) and not eof:
+                # The number may continue in the next chunk.
+                buf, pos, eof = _fill(chunks, buf, pos)
+                continue
+            m = NUMBER.match(buf, pos, end)
+            if not m or m.end() != end:
+                raise JSONDecodeError("expected value", buf, pos)
+            integer, frac, exp = m.groups()
+            pos = m.end()
+            number: int | float = float(m.group()) if frac or exp else int(integer)
+            yield prefix, "number", number
+
+        state = _COMMA_OR_END if stack else _DONE
+
+
+def _read_chunks(source: IO, chunk_size: int) -> Iterator[str]:
+    decoder = None
+    while chunk := source.read(chunk_size):
+        if isinstance(chunk, str):
+            yield chunk
+            continue
+        if decoder is None:
+            decoder = codecs.getincrementaldecoder("utf-8")()
+        # Skip empty strings, as they would be mistaken for end of input.
+        if text := decoder.decode(chunk):
+            yield text
+    if decoder is not None and (text := decoder.decode(b"", final=True)):
+        yield text
+
+
+def _fill(chunks: Iterator[str], buf: str, pos: int) -> tuple[str, int, bool]:
+    """Drop the consumed part of `buf` and append the next chunk to it.
+
+    Returns the new buffer, position and end of input flag.
+    """
+    chunk = next(chunks, "")
+    return buf[pos:] + chunk, 0, not chunk
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import json
+from io import BytesIO, StringIO
+from typing import Any
+
+import pytest
+
+from lockfile_diff.formats.jsonstream import iterparse
+
+DOCUMENT = {
+    "pex_version": "2.1.113",
+    "empty": {},
+    "nested": {"list": [1, -2.5, 3e2, True, False, None, [], {"å": '"ü"\\n'}]},
+    "text": "with a \\u2603 snowman",
+}
+
+
+def build(events) -> Any:
+    stack: list[Any] = [[]]
+    keys: list[str] = []
+    for _, event, value in events:
+        if event in ("start_map", "start_array"):
+            stack.append({} if event == "start_map" else [])
+            continue
+        if event == "map_key":
+            keys.append(value)
+            continue
+        if event in ("end_map", "end_array"):
+            value = stack.pop()
+        container = stack[-1]
+        if isinstance(container, dict):
+            container[keys.pop()] = value
+        else:
+            container.append(value)
+    return stack[0][0]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 1024])
+def test_iterparse_text(chunk_size: int) -> None:
+    source = StringIO(json.dumps(DOCUMENT, indent=2))
+    assert build(iterparse(source, chunk_size)) == DOCUMENT
+
+
+@pytest.mark.parametrize("chunk_size", [1, 1024])
+def test_iterparse_bytes(chunk_size: int) -> None:
+    source = BytesIO(json.dumps(DOCUMENT, ensure_ascii=False).encode())
+    assert build(iterparse(source, chunk_size)) == DOCUMENT
+
+
+def test_iterparse_prefixes() -> None:
+    source = StringIO('{"a": [{"b": 1}], "c": "d"}')
+    assert list(iterparse(source)) == [
+        ("", "start_map", None),
+        ("", "map_key", "a"),
+        ("a", "start_array", None),
+        ("a.item", "start_map", None),
+        ("a.item", "map_key", "b"),
+        ("a.item.b", "number", 1),
+        ("a.item", "end_map", None),
+        ("a", "end_array", None),
+        ("", "map_key", "c"),
+        ("c", "string", "d"),
+        ("", "end_map", None),
+    ]
+
+
+@pytest.mark.parametrize("document", ['{"a": 1', '{"a" 1}', "[1 2]", "[tru]", "{} {}", ""])
+def test_iterparse_invalid(document: str) -> None:
+    with pytest.raises(ValueError):
+        list(iterparse(StringIO(document), 2))
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 1024])
+def test_iterparse_values(chunk_size: int) -> None:
+    source = StringIO(json.dumps(DOCUMENT))
+    events = list(iterparse(source, chunk_size, values={"nested.list.item", "text"}))
+    assert [value for prefix, event, value in events if event == "value"] == [
+        *DOCUMENT["nested"]["list"],  # type: ignore[index]
+        DOCUMENT["text"],
+    ]
+    assert build(events) == DOCUMENT
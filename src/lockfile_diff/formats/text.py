@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import IO, Any, Iterator, Mapping, overload
+from typing import IO, Any, Iterable, Iterator, Mapping, Sequence, overload
 
 from click import style
 
@@ -11,11 +11,15 @@ from lockfile_diff.types import LockfileDiff, ParsedVersion
 class Text(OutputFormat):
     format = "text"
 
-    BUMPS = (
-        ("major", "==", "red"),
-        ("minor", "--", "bright_red"),
-        ("micro", "  ", "bright_yellow"),
-    )
+    # Label and color of each bump level.
+    BUMPS = {
+        "major": ("==", "red"),
+        "minor": ("--", "bright_red"),
+        "micro": ("  ", "bright_yellow"),
+        "pre": ("pre", "yellow"),
+        "post": ("post", "yellow"),
+        "local": ("+", "yellow"),
+    }
 
     @overload
     def encode(self, data: Any, dest: IO) -> None:
@@ -27,22 +31,46 @@ class Text(OutputFormat):
 
     def encode(self, data: Any, dest: IO | None = None) -> None | str:
         if isinstance(data, LockfileDiff):
-            output = "\n".join(self.print_diff(data))
+            lines = self.print_diff(data)
+        elif isinstance(data, Mapping):
+            lines = self.print_report(data)
         else:
             raise ValueError(f"Unexpected data to encode: {data!r}")
         if dest is None:
-            return output
-        else:
-            dest.write(output)
+            return "\n".join(lines)
+        separator = ""
+        for line in lines:
+            dest.write(f"{separator}{line}")
+            separator = "\n"
         return None
 
+    def encode_stream(self, items: Iterable[tuple[str, Any]]) -> Iterator[str]:
+        for key, data in items:
+            yield "\n".join(self.print_report({key: data})) + "\n"
+
+    @classmethod
+    def print_report(cls, report: Mapping[str, Any], *parents: str) -> Iterator[str]:
+        """Print a report of diffs keyed by lockfile or resolve name, possibly nested."""
+        for name, data in report.items():
+            if isinstance(data, LockfileDiff):
+                yield style("\n" + " / ".join((*parents, name)), bold=True)
+                yield from cls.print_diff(data)
+            else:
+                yield from cls.print_report(data, *parents, name)
+
     @classmethod
     def print_diff(cls, diff: LockfileDiff) -> Iterator[str]:
         yield from cls.print_reqs("Unchanged dependencies", diff.unchanged, fg="blue")
-        yield from cls.print_changed("Upgraded dependencies", diff.upgraded)
-        yield from cls.print_changed("Downgraded dependencies", diff.downgraded)
+        yield from cls.print_changed("Upgraded dependencies", diff.upgraded, diff.bumps)
+        yield from cls.print_changed(
+            "Downgraded dependencies", diff.downgraded, diff.bumps, downgrade=True
+        )
         yield from cls.print_reqs("Added dependencies", diff.added, fg="bright_green")
         yield from cls.print_reqs("Removed dependencies", diff.removed, fg="magenta")
+        yield from cls.print_reqs("Changed artifacts", diff.drifted, fg="bright_magenta")
+        yield from cls.print_impact("Required by", diff.required_by, "<-")
+        yield from cls.print_impact("Pulled in", diff.pulled_in, "->")
+        yield from cls.print_summary(diff.summary)
         yield ""
 
     @classmethod
@@ -52,7 +80,11 @@ class Text(OutputFormat):
 
     @classmethod
     def print_changed(
-        cls, title: str, reqs: Mapping[str, tuple[ParsedVersion, ParsedVersion]]
+        cls,
+        title: str,
+        reqs: Mapping[str, tuple[ParsedVersion, ParsedVersion]],
+        bumps: Mapping[str, str],
+        downgrade: bool = False,
     ) -> Iterator[str]:
         if not reqs:
             return
@@ -62,7 +94,7 @@ class Text(OutputFormat):
             name_s = style(f"{name:30}", fg="yellow")
             prev_s = style(f"{str(prev):10}", fg="cyan")
             curr_s = style(f"{curr}", fg="green")
-            bump_s = cls.get_bump_s(prev, curr)
+            bump_s = cls.get_bump_s(bumps.get(name, "legacy"), downgrade)
             yield f"  {name_s} {prev_s} {bump_s} {curr_s}"
 
     @classmethod
@@ -75,18 +107,35 @@ class Text(OutputFormat):
             yield style(f"  {name:30} {version}", **kwargs)
 
     @classmethod
-    def get_bump_s(cls, prev: ParsedVersion, curr: ParsedVersion) -> str:
+    def print_impact(
+        cls, heading: str, impact: Mapping[str, Sequence[str]], arrow: str
+    ) -> Iterator[str]:
+        if not impact:
+            return
+
+        yield cls.title(heading)
+        for name, names in impact.items():
+            name_s = style(f"{name:30}", fg="yellow")
+            yield f"  {name_s} {arrow} {', '.join(names)}"
+
+    @classmethod
+    def print_summary(cls, summary: Mapping[str, int]) -> Iterator[str]:
+        if not summary:
+            return
+
+        counts = ", ".join(f"{count} {bump}" for bump, count in summary.items())
+        yield style(f"\n  Version bumps: {counts}", bold=True)
+
+    @classmethod
+    def get_bump_s(cls, bump: str, downgrade: bool = False) -> str:
         attrs: dict[str, Any] = {}
-        for key, label, fg in cls.BUMPS:
-            if getattr(prev, key) == getattr(curr, key):
-                continue
-            attrs["fg"] = fg
-            if prev > curr:
+        if bump in cls.BUMPS:
+            label, attrs["fg"] = cls.BUMPS[bump]
+            if downgrade:
                 label = f"<{label}"
                 attrs["blink"] = True
             else:
                 label += ">"
-            break
         else:
             label = "???"
             attrs["fg"] = "magenta"
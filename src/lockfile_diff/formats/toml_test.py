@@ -1,4 +1,4 @@
-from io import StringIO
+from io import BytesIO, StringIO
 
 import toml
 
@@ -10,3 +10,8 @@ def test_parse_toml() -> None:
     contents = StringIO(toml.dumps(data))
     res = Format("toml").parse(contents)
     assert res.raw == data
+
+
+def test_parse_toml_bytes() -> None:
+    res = Format("toml").parse(BytesIO('foo = "bär"\n'.encode()))
+    assert res.raw == dict(foo="bär")
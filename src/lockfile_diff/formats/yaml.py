@@ -1,13 +1,17 @@
 from __future__ import annotations
 
-from dataclasses import asdict, is_dataclass
-from typing import IO, Any, overload
+from dataclasses import is_dataclass
+from io import StringIO
+from typing import IO, Any, Iterable, Iterator, Mapping, overload
 
 import yaml
 from packaging.version import LegacyVersion, Version
 
 from lockfile_diff.base import InputFormat, OutputFormat
-from lockfile_diff.types import ParsedData
+from lockfile_diff.types import ParsedData, encoded_fields
+
+MAP_TAG = "tag:yaml.org,2002:map"
+SEQ_TAG = "tag:yaml.org,2002:seq"
 
 
 class YAMLDecoder(InputFormat):
@@ -29,9 +33,68 @@ class YAMLEncoder(OutputFormat):
         ...
 
     def encode(self, data: Any, dest: IO | None = None) -> None | str:
+        """Emit `data` to `dest` event by event, rather than building a node tree of it first.
+
+        The output is the same as for `yaml.safe_dump(data, dest)`, with dataclasses dumped as
+        mappings of their fields.
+        """
+        if dest is None:
+            output = StringIO()
+            self.encode(data, output)
+            return output.getvalue()
+
+        dumper = yaml.SafeDumper(dest, default_flow_style=False)
+        try:
+            dumper.open()
+            dumper.emit(yaml.DocumentStartEvent(explicit=False))
+            self.emit(dumper, data)
+            dumper.emit(yaml.DocumentEndEvent(explicit=False))
+            dumper.close()
+        finally:
+            dumper.dispose()
+        return None
+
+    def encode_stream(self, items: Iterable[tuple[str, Any]]) -> Iterator[str]:
+        # Top level mappings with distinct keys concatenate into a single mapping.
+        empty = True
+        for chunk in super().encode_stream(items):
+            empty = False
+            yield chunk
+        if empty:
+            yield self.encode({})
+
+    @classmethod
+    def emit(cls, dumper: yaml.SafeDumper, data: Any) -> None:
         if is_dataclass(data):
-            data = asdict(data)
-        return yaml.safe_dump(data, dest)
+            data = encoded_fields(data)
+        if isinstance(data, Mapping):
+            dumper.emit(yaml.MappingStartEvent(None, MAP_TAG, True, flow_style=False))
+            try:
+                items = sorted(data.items())
+            except TypeError:
+                items = list(data.items())
+            for key, value in items:
+                cls.emit(dumper, key)
+                cls.emit(dumper, value)
+            dumper.emit(yaml.MappingEndEvent())
+        elif isinstance(data, (list, tuple)):
+            dumper.emit(yaml.SequenceStartEvent(None, SEQ_TAG, True, flow_style=False))
+            for item in data:
+                cls.emit(dumper, item)
+            dumper.emit(yaml.SequenceEndEvent())
+        else:
+            if isinstance(data, (LegacyVersion, Version)):
+                data = str(data)
+            node = dumper.represent_data(data)
+            dumper.represented_objects.clear()
+            if not isinstance(node, yaml.ScalarNode):
+                raise yaml.representer.RepresenterError(f"cannot stream {data!r}")
+            # Same as `yaml.Serializer.serialize_node()` does for scalars.
+            implicit = (
+                node.tag == dumper.resolve(yaml.ScalarNode, node.value, (True, False)),
+                node.tag == dumper.resolve(yaml.ScalarNode, node.value, (False, True)),
+            )
+            dumper.emit(yaml.ScalarEvent(None, node.tag, implicit, node.value, style=node.style))
 
 
 def yaml_represent_version(dumper, data):
@@ -3,6 +3,7 @@ from io import StringIO
 import yaml
 
 from lockfile_diff.base import Format
+from lockfile_diff.types import LockfileInfo
 
 
 def test_parse_yaml() -> None:
@@ -10,3 +11,18 @@ def test_parse_yaml() -> None:
     contents = StringIO(yaml.safe_dump(data))
     res = Format("yaml").parse(contents)
     assert res.raw == data
+
+
+def test_encode_stream_yaml() -> None:
+    report = dict(a=dict(x=1), b=[2])
+    assert yaml.safe_load("".join(Format("yaml").encode_stream(report.items()))) == report
+    assert yaml.safe_load("".join(Format("yaml").encode_stream([]))) == {}
+
+
+def test_encode_info_omits_empty_optional_fields() -> None:
+    info = LockfileInfo.create([("six", "1.0")])
+    assert yaml.safe_load(Format("yaml").encode(info)) == dict(dists={"six": "1.0"})
+    info = LockfileInfo.create([("six", "1.0"), ("wheel", "1.0")], dependencies={"six": ("wheel",)})
+    assert yaml.safe_load(Format("yaml").encode(info)) == dict(
+        dists={"six": "1.0", "wheel": "1.0"}, dependencies={"six": ["wheel"]}
+    )
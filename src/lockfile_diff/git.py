@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import subprocess
+from subprocess import PIPE, Popen
+from threading import Lock
+from typing import IO
+
+from lockfile_diff.timings import timed
+from lockfile_diff.util.io.named import Blob
+
+
+class GitError(Exception):
+    pass
+
+
+class GitObjects:
+    """Read blobs from git, using a single long-lived `git cat-file --batch` process for all
+    lookups.
+
+    Use as a context manager to ensure the git process is terminated when done. Once closed, no
+    more blobs can be read.
+    """
+
+    def __init__(self, cwd: str | None = None) -> None:
+        self.cwd = cwd
+        self._process: Popen | None = None
+        self._closed = False
+        self._lock = Lock()
+
+    def __enter__(self) -> GitObjects:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            if self._process is None:
+                return
+            assert self._process.stdin is not None
+            self._process.stdin.close()
+            self._process.wait()
+            self._process = None
+
+    def _get_process(self) -> Popen:
+        if self._closed:
+            raise GitError("git objects are closed")
+        if self._process is None:
+            self._process = Popen(
+                ["git", "cat-file", "--batch"], cwd=self.cwd, stdin=PIPE, stdout=PIPE, stderr=PIPE
+            )
+        return self._process
+
+    def read(self, rev: str, path: str) -> bytes:
+        """Return the contents of `path` at `rev`, see gitrevisions(7) for acceptable values."""
+        if "\n" in rev or "\n" in path:
+            raise GitError(f"invalid object name {rev}:{path}")
+        with timed("git", name=f"{rev}:{path}") as timing:
+            data = self._read(rev, path)
+            timing.bytes = len(data)
+        return data
+
+    def _read(self, rev: str, path: str) -> bytes:
+        with self._lock:
+            process = self._get_process()
+            assert process.stdin is not None and process.stdout is not None
+            try:
+                process.stdin.write(f"{rev}:{path}\n".encode())
+                process.stdin.flush()
+            except BrokenPipeError:
+                pass
+            header = process.stdout.readline().decode()
+            if not header:
+                assert process.stderr is not None
+                error = process.stderr.read().decode().strip()
+                self._process = None
+                raise GitError(error or "git cat-file exited unexpectedly")
+            obj, _, info = header.rstrip("\n").partition(" ")
+            if info in ("missing", "ambiguous"):
+                raise GitError(f"{obj} {info}")
+            obj_type, _, size = info.partition(" ")
+            data: bytes = process.stdout.read(int(size))
+            process.stdout.read(1)  # Trailing newline.
+        if obj_type != "blob":
+            raise GitError(f"{rev}:{path} is a {obj_type}, not a file")
+        return data
+
+    def blob(self, rev: str, path: str) -> Blob:
+        return Blob(name=f"[git: {rev}] {path}", data=self.read(rev, path))
+
+    def open(self, rev: str, path: str) -> IO:
+        return self.blob(rev, path).open()
+
+    def revisions(self, rev_range: str, path: str) -> list[str]:
+        """Return the commits in `rev_range` that changed `path`, oldest first.
+
+        See gitrevisions(7) for how to specify ranges, e.g. `main~10..main`.
+        """
+        if rev_range.startswith("-"):
+            raise GitError(f"invalid revision range {rev_range}")
+        result = subprocess.run(
+            ["git", "rev-list", "--reverse", rev_range, "--", path],
+            cwd=self.cwd,
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode != 0:
+            raise GitError(result.stderr.strip() or f"git rev-list failed for {rev_range}")
+        return result.stdout.split()
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from lockfile_diff.git import GitError, GitObjects
+
+
+@pytest.fixture
+def repo(tmp_path: Path) -> Path:
+    def git(*args: str) -> None:
+        subprocess.run(
+            ["git", "-c", "user.name=test", "-c", "user.email=test@example.com", *args],
+            cwd=tmp_path,
+            check=True,
+            capture_output=True,
+        )
+
+    git("init")
+    (tmp_path / "a.lock").write_text("first\n")
+    (tmp_path / "b.lock").write_text("other\n")
+    git("add", ".")
+    git("commit", "-m", "first")
+    (tmp_path / "a.lock").write_text("second\n")
+    git("commit", "-am", "second")
+    return tmp_path
+
+
+def test_git_objects_read(repo: Path) -> None:
+    with GitObjects(cwd=str(repo)) as git:
+        assert git.read("HEAD", "a.lock") == b"second\n"
+        assert git.read("HEAD~1", "a.lock") == b"first\n"
+        assert git.read("HEAD", "b.lock") == b"other\n"
+
+
+def test_git_objects_open(repo: Path) -> None:
+    with GitObjects(cwd=str(repo)) as git:
+        source = git.open("HEAD~1", "a.lock")
+    assert source.name == "[git: HEAD~1] a.lock"
+    assert source.read() == "first\n"
+
+
+def test_git_objects_missing(repo: Path) -> None:
+    with GitObjects(cwd=str(repo)) as git:
+        with pytest.raises(GitError, match="missing"):
+            git.read("HEAD", "no-such.lock")
+        with pytest.raises(GitError, match="is a tree"):
+            git.read("HEAD", "")
+        assert git.read("HEAD", "b.lock") == b"other\n"
+
+
+def test_git_objects_closed(repo: Path) -> None:
+    with GitObjects(cwd=str(repo)) as git:
+        assert git.read("HEAD", "b.lock") == b"other\n"
+    with pytest.raises(GitError, match="closed"):
+        git.read("HEAD", "b.lock")
+    assert git._process is None
+
+
+def test_git_objects_revisions(repo: Path) -> None:
+    with GitObjects(cwd=str(repo)) as git:
+        revisions = git.revisions("HEAD", "a.lock")
+        assert len(revisions) == 2
+        assert git.read(revisions[0], "a.lock") == b"first\n"
+        assert git.revisions("HEAD", "b.lock") == revisions[:1]
+        assert git.revisions("HEAD~1..HEAD", "a.lock") == revisions[1:]
+        with pytest.raises(GitError):
+            git.revisions("no-such-rev", "a.lock")
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import AbstractSet, Collection, Iterable, Iterator, Mapping, Sequence
+
+
+@dataclass(frozen=True)
+class DependencyGraph:
+    """Index of the dependencies between the dists of a lockfile.
+
+    Holds the adjacency list of each dist to the dists it depends on, along with the reverse edges,
+    to the dists depending on it. The top level requirements, or roots, are the dists that no other
+    dist depends on.
+    """
+
+    dependencies: Mapping[str, Sequence[str]]
+    dependents: Mapping[str, Sequence[str]]
+
+    @classmethod
+    def create(
+        cls, dists: Collection[str], dependencies: Mapping[str, Sequence[str]]
+    ) -> DependencyGraph:
+        """Index the `dependencies` of `dists`, ignoring any dependencies on unknown dists."""
+        dependents: dict[str, list[str]] = {}
+        for name, requires in dependencies.items():
+            for dependency in requires:
+                if dependency in dists and dependency != name:
+                    dependents.setdefault(dependency, []).append(name)
+        return cls(
+            dependencies=dependencies,
+            dependents={name: tuple(sorted(names)) for name, names in dependents.items()},
+        )
+
+    def required_by(self, names: Iterable[str]) -> dict[str, tuple[str, ...]]:
+        """Return the roots that depend on each of `names`, directly or transitively.
+
+        A root is required by itself only. Walks the reverse edges from all `names` at once, so each
+        dist and edge is visited once regardless of the number of names. Dists in a dependency
+        cycle with no other dependents are all roots.
+        """
+        names = tuple(names)
+        roots: dict[str, AbstractSet[str]] = {}
+        for component in self._components(names):
+            members = set(component)
+            parents = {
+                parent
+                for name in component
+                for parent in self.dependents.get(name, ())
+                if parent not in members
+            }
+            # Components are yielded after all components depending on them.
+            found: AbstractSet[str] = (
+                frozenset().union(*(roots[parent] for parent in parents)) if parents else members
+            )
+            for name in component:
+                roots[name] = found
+        return {name: tuple(sorted(roots[name])) for name in names}
+
+    def _components(self, names: Sequence[str]) -> Iterator[list[str]]:
+        """Yield the strongly connected components of the reverse edges reachable from `names`.
+
+        Uses an iterative version of Tarjan's algorithm, which yields each component after all
+        components reachable from it.
+        """
+        index: dict[str, int] = {}
+        lowlink: dict[str, int] = {}
+        on_stack: set[str] = set()
+        stack: list[str] = []
+        for start in names:
+            if start in index:
+                continue
+            work = [(start, iter(self.dependents.get(start, ())))]
+            index[start] = lowlink[start] = len(index)
+            stack.append(start)
+            on_stack.add(start)
+            while work:
+                node, parents = work[-1]
+                for parent in parents:
+                    if parent not in index:
+                        index[parent] = lowlink[parent] = len(index)
+                        stack.append(parent)
+                        on_stack.add(parent)
+                        work.append((parent, iter(self.dependents.get(parent, ()))))
+                        break
+                    if parent in on_stack:
+                        lowlink[node] = min(lowlink[node], index[parent])
+                else:
+                    work.pop()
+                    if work:
+                        caller = work[-1][0]
+                        lowlink[caller] = min(lowlink[caller], lowlink[node])
+                    if lowlink[node] == index[node]:
+                        component = []
+                        while True:
+                            member = stack.pop()
+                            on_stack.discard(member)
+                            component.append(member)
+                            if member == node:
+                                break
+                        yield component
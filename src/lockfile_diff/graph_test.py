@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+from lockfile_diff.graph import DependencyGraph
+
+
+def test_dependency_graph() -> None:
+    graph = DependencyGraph.create(
+        ["app", "cli", "requests", "urllib3", "idna", "click"],
+        {
+            "app": ["requests", "click", "missing"],
+            "cli": ["click", "cli"],
+            "requests": ["urllib3", "idna"],
+        },
+    )
+    assert graph.dependents == {
+        "click": ("app", "cli"),
+        "idna": ("requests",),
+        "requests": ("app",),
+        "urllib3": ("requests",),
+    }
+    assert graph.required_by(["urllib3", "click", "app"]) == {
+        "urllib3": ("app",),
+        "click": ("app", "cli"),
+        "app": ("app",),
+    }
+
+
+def test_dependency_graph_cycles() -> None:
+    graph = DependencyGraph.create(
+        ["a", "b", "c", "d", "e"],
+        {"a": ["b"], "b": ["c"], "c": ["b", "d"], "d": ["e"], "e": ["d"]},
+    )
+    assert graph.required_by(["e", "c"]) == {"e": ("a",), "c": ("a",)}
+
+    # A cycle that no other dist depends on is its own top level requirement.
+    graph = DependencyGraph.create(["a", "b", "c"], {"a": ["b"], "b": ["a", "c"]})
+    assert graph.required_by(["c", "a"]) == {"c": ("a", "b"), "a": ("a", "b")}
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+from typing import Any, Iterator, Sequence
+
+from lockfile_diff.git import GitError, GitObjects
+from lockfile_diff.parser import Parser
+from lockfile_diff.types import DiffFilter, LockfileDiff
+
+# Number of characters to abbreviate commit shas to in history keys.
+SHORT_SHA = 10
+
+
+def diff_history(
+    git: GitObjects,
+    revisions: Sequence[str],
+    path: str,
+    schema: str,
+    by_resolve: bool = False,
+    diff_filter: DiffFilter | None = None,
+    **kwargs: Any,
+) -> Iterator[tuple[str, Any]]:
+    """Diff `path` at each of `revisions` with its previous revision, oldest first.
+
+    The first revision is diffed with its parent commit. Yields `(key, diff)` for each step, keyed
+    by the `old..new` abbreviated commit shas, as soon as it is available. Each revision is read
+    and parsed only once, serving as the new side of one step and the old side of the next.
+    """
+    if not revisions:
+        return
+    prev_key = f"{revisions[0][:SHORT_SHA]}^"
+    prev = _parse(git, f"{revisions[0]}^", path, schema, by_resolve, **kwargs)
+    for rev in revisions:
+        curr = _parse(git, rev, path, schema, by_resolve, **kwargs)
+        if by_resolve:
+            diff: Any = LockfileDiff.create_resolves(prev, curr, diff_filter)
+        else:
+            diff = LockfileDiff.create(prev, curr, diff_filter)
+        key = rev[:SHORT_SHA]
+        yield f"{prev_key}..{key}", diff
+        prev_key, prev = key, curr
+
+
+def _parse(
+    git: GitObjects, rev: str, path: str, schema: str, by_resolve: bool, **kwargs: Any
+) -> Any:
+    try:
+        source = git.open(rev, path)
+    except GitError:
+        # The file does not exist at this revision, it was added or deleted.
+        source = None
+    data = Parser.parse(source, schema, **kwargs)
+    return Parser.get_resolves(data) if by_resolve else Parser.get_info(data)
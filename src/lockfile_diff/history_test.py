@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import json
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from lockfile_diff.git import GitObjects
+from lockfile_diff.history import diff_history
+from lockfile_diff.types import LockfileDiff, parse_version
+
+
+def pex_lockfile(**dists: str) -> str:
+    return json.dumps(
+        dict(
+            pex_version="2.1.111",
+            locked_resolves=[
+                dict(
+                    locked_requirements=[
+                        dict(project_name=name, version=version) for name, version in dists.items()
+                    ]
+                )
+            ],
+        )
+    )
+
+
+@pytest.fixture
+def repo(tmp_path: Path) -> Path:
+    def git(*args: str) -> None:
+        subprocess.run(
+            ["git", "-c", "user.name=test", "-c", "user.email=test@example.com", *args],
+            cwd=tmp_path,
+            check=True,
+            capture_output=True,
+        )
+
+    git("init")
+    (tmp_path / "other.txt").write_text("initial\n")
+    git("add", ".")
+    git("commit", "-m", "initial")
+    for message, contents in (
+        ("add", pex_lockfile(cowsay="4.0")),
+        ("upgrade", pex_lockfile(cowsay="5.0", ansicolors="1.1.8")),
+        ("downgrade", pex_lockfile(cowsay="4.0", ansicolors="1.1.8")),
+    ):
+        (tmp_path / "app.lock").write_text(contents)
+        (tmp_path / "other.txt").write_text(message)
+        git("add", ".")
+        git("commit", "-m", message)
+    (tmp_path / "other.txt").write_text("unrelated\n")
+    git("commit", "-am", "unrelated")
+    return tmp_path
+
+
+def test_diff_history(repo: Path) -> None:
+    with GitObjects(cwd=str(repo)) as git:
+        revisions = git.revisions("HEAD", "app.lock")
+        history = list(diff_history(git, revisions, "app.lock", "pex"))
+
+    assert [key for key, _ in history] == [
+        f"{revisions[0][:10]}^..{revisions[0][:10]}",
+        f"{revisions[0][:10]}..{revisions[1][:10]}",
+        f"{revisions[1][:10]}..{revisions[2][:10]}",
+    ]
+    v = parse_version
+    assert [diff for _, diff in history] == [
+        LockfileDiff(
+            added={"cowsay": v("4.0")}, removed={}, unchanged={}, upgraded={}, downgraded={}
+        ),
+        LockfileDiff(
+            added={"ansicolors": v("1.1.8")},
+            removed={},
+            unchanged={},
+            upgraded={"cowsay": (v("4.0"), v("5.0"))},
+            downgraded={},
+            bumps={"cowsay": "major"},
+            summary={"major": 1},
+        ),
+        LockfileDiff(
+            added={},
+            removed={},
+            unchanged={"ansicolors": v("1.1.8")},
+            upgraded={},
+            downgraded={"cowsay": (v("5.0"), v("4.0"))},
+            bumps={"cowsay": "major"},
+            summary={"major": 1},
+        ),
+    ]
+
+
+def test_diff_history_by_resolve(repo: Path) -> None:
+    with GitObjects(cwd=str(repo)) as git:
+        revisions = git.revisions("HEAD~1..HEAD", "app.lock")
+        assert revisions == []
+        revisions = git.revisions("HEAD~2..HEAD", "app.lock")
+        history = list(diff_history(git, revisions, "app.lock", "pex", by_resolve=True))
+
+    assert len(history) == 1
+    _, diff = history[0]
+    assert list(diff) == ["0"]
+    assert diff["0"].downgraded == {"cowsay": (parse_version("5.0"), parse_version("4.0"))}
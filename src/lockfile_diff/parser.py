@@ -1,29 +1,122 @@
 from __future__ import annotations
 
-from typing import IO
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import IO, TYPE_CHECKING, Any, Callable, Mapping, Optional, TypeVar, Union
 
 from lockfile_diff.base import Schema
-from lockfile_diff.types import LockfileDiff, LockfileInfo, ParsedData
+from lockfile_diff.timings import timed
+from lockfile_diff.types import DiffFilter, LockfileDiff, LockfileInfo, ParsedData
+
+if TYPE_CHECKING:
+    from lockfile_diff.cache import LockfileCache
+
+T = TypeVar("T")
+
+# A lockfile source, or a callable opening it when it is about to be parsed, e.g. to read it from
+# git concurrently with parsing the other side of a diff.
+Source = Union[IO, Callable[[], Optional[IO]], None]
 
 
 class EmptyData(ParsedData):
     def get_info(self) -> LockfileInfo:
         return LockfileInfo({})
 
+    def get_resolves(self) -> Mapping[str, LockfileInfo]:
+        return {}
+
 
 class Parser:
     @staticmethod
-    def parse(source: IO | None, schema: str, **kwargs) -> ParsedData:
+    def parse(
+        source: IO | None, schema: str, cache: LockfileCache | None = None, **kwargs
+    ) -> ParsedData:
+        """Parse `source` using `schema`.
+
+        With a `cache`, the schema is skipped entirely for sources that have been parsed before.
+        """
         if source is None:
             return EmptyData({})
-        else:
-            return Schema(schema, kwargs=kwargs).parse(source)
+        with timed("parse", source):
+            if cache is None or (key := cache.key(source, schema)) is None:
+                return Schema(schema, kwargs=kwargs).parse(source)
+            data: ParsedData | None = cache.load(key)
+            if data is None:
+                data = Schema(schema, kwargs=kwargs).parse(source)
+                cache.store(key, data)
+            return data
+
+    @staticmethod
+    def get_info(data: ParsedData) -> LockfileInfo:
+        with timed("info") as timing:
+            info = data.get_info()
+            timing.entries = len(info.dists)
+        return info
+
+    @staticmethod
+    def get_resolves(data: ParsedData) -> Mapping[str, LockfileInfo]:
+        with timed("resolves") as timing:
+            resolves = data.get_resolves()
+            timing.entries = sum(len(info.dists) for info in resolves.values())
+        return resolves
 
     @classmethod
     def diff(
-        cls, old_source: IO | None, new_source: IO | None, schema: str, **kwargs
+        cls,
+        old_source: Source,
+        new_source: Source,
+        schema: str,
+        diff_filter: DiffFilter | None = None,
+        **kwargs,
     ) -> LockfileDiff:
         return LockfileDiff.create(
-            cls.parse(old_source, schema, **kwargs).get_info(),
-            cls.parse(new_source, schema, **kwargs).get_info(),
+            *cls._parse_both(old_source, new_source, schema, cls.get_info, kwargs), diff_filter
         )
+
+    @classmethod
+    def diff_resolves(
+        cls,
+        old_source: Source,
+        new_source: Source,
+        schema: str,
+        diff_filter: DiffFilter | None = None,
+        **kwargs,
+    ) -> Mapping[str, LockfileDiff]:
+        return LockfileDiff.create_resolves(
+            *cls._parse_both(old_source, new_source, schema, cls.get_resolves, kwargs),
+            diff_filter,
+        )
+
+    @classmethod
+    def _parse_both(
+        cls,
+        old_source: Source,
+        new_source: Source,
+        schema: str,
+        extract: Callable[[ParsedData], T],
+        kwargs: Mapping[str, Any],
+    ) -> tuple[T, T]:
+        """Open, parse and `extract` the data of both sources.
+
+        Sources given as callables are opened in separate threads, so that waiting on them overlaps
+        with parsing a source that is already open. Parsing holds the GIL, so the sources are still
+        parsed one after the other, which lets the second reuse the entries memoized by the first.
+        """
+
+        def process(source: IO | Future[IO | None] | None) -> T:
+            if isinstance(source, Future):
+                source = source.result()
+            return extract(cls.parse(source, schema, **kwargs))
+
+        if not (callable(old_source) or callable(new_source)):
+            return process(old_source), process(new_source)
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            old, new = (
+                executor.submit(source) if callable(source) else source
+                for source in (old_source, new_source)
+            )
+            if isinstance(old, Future):
+                # Parse the new side while the old side is being opened.
+                new_data = process(new)
+                return process(old), new_data
+            old_data = process(old)
+            return old_data, process(new)
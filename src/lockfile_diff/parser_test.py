@@ -1,20 +1,31 @@
 from __future__ import annotations
 
 from io import StringIO
+from pathlib import Path
+from threading import Event
 from typing import IO, Iterator
 
 import pytest
-from class_registry import ClassRegistry
 
 from lockfile_diff.base import InputSchema
+from lockfile_diff.cache import LockfileCache
 from lockfile_diff.parser import Parser
-from lockfile_diff.registries import Registries
-from lockfile_diff.types import ParsedData
+from lockfile_diff.registries import LazyClassRegistry, Registries
+from lockfile_diff.types import LockfileInfo, ParsedData
+
+
+class MockData(ParsedData):
+    def get_info(self) -> LockfileInfo:
+        return LockfileInfo.create(line.split("==") for line in self.raw["lockfile"].splitlines())
 
 
 @pytest.fixture
 def registries() -> Iterator[Registries]:
-    old = Registries.set_default(Registries(ClassRegistry("format"), ClassRegistry("schema")))
+    old = Registries.set_default(
+        Registries(
+            LazyClassRegistry("format"), LazyClassRegistry("format"), LazyClassRegistry("schema")
+        )
+    )
     yield old
     Registries.set_default(old)
 
@@ -30,3 +41,42 @@ def test_parser_parse(registries: Registries) -> None:
     source = StringIO()
     res = Parser.parse(source, "mock")
     assert res.raw == dict(source=source)
+
+
+def test_parser_parse_cached(registries: Registries, tmp_path: Path) -> None:
+    parsed = []
+
+    @registries.schemas.register
+    class MockSchema(InputSchema):
+        schema = "mock"
+
+        def parse(self, source: IO) -> ParsedData:
+            parsed.append(source)
+            return MockData(dict(lockfile=source.read()))
+
+    cache = LockfileCache(str(tmp_path))
+    for _ in range(2):
+        res = Parser.parse(StringIO("a==1.0\n"), "mock", cache=cache)
+        assert res.get_info() == LockfileInfo.create([("a", "1.0")])
+    assert len(parsed) == 1
+
+
+def test_parser_diff_opens_sources_concurrently(registries: Registries) -> None:
+    new_parsed = Event()
+
+    class MockSchema(InputSchema):
+        schema = "mock"
+
+        def parse(self, source: IO) -> ParsedData:
+            lockfile = source.read()
+            if lockfile == "a==2.0\n":
+                new_parsed.set()
+            return MockData(dict(lockfile=lockfile))
+
+    def old_source() -> IO:
+        # Opening the old side waits for the new side to have been parsed.
+        assert new_parsed.wait(timeout=10)
+        return StringIO("a==1.0\n")
+
+    diff = Parser.diff(old_source, StringIO("a==2.0\n"), "mock")
+    assert list(diff.upgraded) == ["a"]
@@ -1,22 +1,118 @@
 from __future__ import annotations
 
 from abc import ABCMeta
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from importlib import import_module
 from inspect import isabstract
-from typing import Callable, ClassVar, TypeVar, cast
-
-from class_registry import ClassRegistry, MutableRegistry
+from typing import Any, Callable, ClassVar, Iterator, Mapping, TypeVar, cast
 
 T = TypeVar("T", bound="RegistryBase")
 
 _default_registries: Registries
 
+# Modules defining the built-in schemas and formats, by name. They are imported when first used,
+# so only the ones actually needed are loaded. Declaration order is the order used for listing
+# them, and for trying schemas with the same probe confidence in `auto-detect`.
+SCHEMA_MODULES = {
+    "auto-detect": "lockfile_diff.schemas.autodetect",
+    "coursier": "lockfile_diff.schemas.coursier",
+    "pants-pex": "lockfile_diff.schemas.pants",
+    "pants-coursier": "lockfile_diff.schemas.pants",
+    "pex": "lockfile_diff.schemas.pex",
+    "pex-info": "lockfile_diff.schemas.pex_info",
+    "pex-app": "lockfile_diff.schemas.pex_info",
+}
+INPUT_FORMAT_MODULES = {
+    "json": "lockfile_diff.formats.json",
+    "toml": "lockfile_diff.formats.toml",
+    "yaml": "lockfile_diff.formats.yaml",
+}
+OUTPUT_FORMAT_MODULES = {
+    "json": "lockfile_diff.formats.json",
+    "jsonl": "lockfile_diff.formats.jsonl",
+    "text": "lockfile_diff.formats.text",
+    "yaml": "lockfile_diff.formats.yaml",
+}
+
+
+class RegistryKeyError(KeyError):
+    pass
+
+
+class LazyClassRegistry(Mapping[str, Any]):
+    """Registry of classes by the value of their `attr_name` attribute.
+
+    Classes may be declared up front by name and the module defining them, in which case the
+    module is only imported once the class is looked up. Listing the registered names does not
+    import any modules.
+
+    Adapted from `class_registry.ClassRegistry`, which imports `pkg_resources` and so adds
+    considerably to the startup time of the CLI.
+    """
+
+    def __init__(self, attr_name: str, modules: Mapping[str, str] | None = None) -> None:
+        self.attr_name = attr_name
+        self.modules = dict(modules or {})
+        self._registry: dict[str, type] = {}
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(attr_name={self.attr_name!r})"
+
+    def __getitem__(self, key: str) -> type:
+        return self.get_class(key)
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self.modules
+        yield from (key for key in self._registry if key not in self.modules)
+
+    def __len__(self) -> int:
+        return len(self.modules.keys() | self._registry.keys())
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.modules or key in self._registry
+
+    def get_class(self, key: str) -> type:
+        if key not in self._registry and key in self.modules:
+            import_module(self.modules[key])
+        try:
+            return self._registry[key]
+        except KeyError:
+            raise RegistryKeyError(key) from None
+
+    def get(self, key: str, *args, **kwargs):
+        """Create a new instance of the class registered for `key`."""
+        return self.get_class(key)(*args, **kwargs)
+
+    def register(self, cls: type) -> type:
+        """Register `cls`, by the value of its `attr_name` attribute.
+
+        May be used as a class decorator.
+        """
+        key = getattr(cls, self.attr_name, None)
+        if not key:
+            raise ValueError(f"Attempting to register {cls.__name__} without a {self.attr_name}.")
+        self._registry[key] = cls
+        return cls
+
+    def unregister(self, key: str) -> type:
+        self.modules.pop(key, None)
+        try:
+            return self._registry.pop(key)
+        except KeyError:
+            raise RegistryKeyError(key) from None
+
 
 @dataclass(frozen=True)
 class Registries:
-    input_formats: ClassRegistry = ClassRegistry("format")
-    output_formats: ClassRegistry = ClassRegistry("format")
-    schemas: ClassRegistry = ClassRegistry("schema")
+    input_formats: LazyClassRegistry = field(
+        default_factory=lambda: LazyClassRegistry("format", INPUT_FORMAT_MODULES)
+    )
+    output_formats: LazyClassRegistry = field(
+        default_factory=lambda: LazyClassRegistry("format", OUTPUT_FORMAT_MODULES)
+    )
+    schemas: LazyClassRegistry = field(
+        default_factory=lambda: LazyClassRegistry("schema", SCHEMA_MODULES)
+    )
 
     @staticmethod
     def get_default() -> Registries:
@@ -41,7 +137,7 @@ class RegistryBase:
 _default_registries = Registries()
 
 
-def AutoRegister(registry_cb: Callable[[], MutableRegistry], base_type: type = ABCMeta) -> type:
+def AutoRegister(registry_cb: Callable[[], LazyClassRegistry], base_type: type = ABCMeta) -> type:
     """Creates a metaclass that automatically registers all non-abstract
     subclasses in the specified registry.
 
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
+import pytest
+
+from lockfile_diff.registries import LazyClassRegistry, RegistryKeyError
+
+
+@pytest.fixture
+def lazy_module(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> str:
+    (tmp_path / "lazy_registry_mod.py").write_text(
+        textwrap.dedent(
+            """\
+            from lockfile_diff.registries_test import REGISTRY
+
+            @REGISTRY.register
+            class Lazy:
+                name = "lazy"
+            """
+        )
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.delitem(sys.modules, "lazy_registry_mod", raising=False)
+    return "lazy_registry_mod"
+
+
+REGISTRY = LazyClassRegistry("name")
+
+
+def test_lazy_class_registry(lazy_module: str) -> None:
+    REGISTRY.modules["lazy"] = lazy_module
+    try:
+        assert "lazy" in REGISTRY
+        assert list(REGISTRY) == ["lazy"]
+        assert lazy_module not in sys.modules
+
+        assert REGISTRY["lazy"].__name__ == "Lazy"
+        assert lazy_module in sys.modules
+        assert REGISTRY.get("lazy").name == "lazy"
+    finally:
+        REGISTRY.unregister("lazy")
+
+    assert "lazy" not in REGISTRY
+    with pytest.raises(RegistryKeyError):
+        REGISTRY.get_class("lazy")
+
+
+def test_register_requires_attr() -> None:
+    class Nameless:
+        pass
+
+    with pytest.raises(ValueError, match="without a name"):
+        REGISTRY.register(Nameless)
+
+
+def test_cli_startup_imports() -> None:
+    modules = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import sys, lockfile_diff.__main__; print(*sorted(sys.modules), sep='\\n')",
+        ],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout.split()
+    for module in ("yaml", "toml", "pkg_resources", "lockfile_diff.schemas.pex"):
+        assert module not in modules
@@ -1 +0,0 @@
-from lockfile_diff.schemas import autodetect, coursier, pants, pex, pex_info  # noqa
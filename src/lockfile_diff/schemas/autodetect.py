@@ -2,42 +2,64 @@ from __future__ import annotations
 
 import sys
 from dataclasses import dataclass
-from typing import IO, ClassVar, cast
+from typing import IO, ClassVar, Iterator
 
 import click
 
-from lockfile_diff.base import InputSchema
+from lockfile_diff.base import PROBE_NO_MATCH, InputSchema, Schema
 from lockfile_diff.errors import FAILED_TO_PARSE_FILE
 from lockfile_diff.registries import Registries
+from lockfile_diff.timings import timed
 from lockfile_diff.types import ParsedData
 from lockfile_diff.util.io.rewind import capture
+from lockfile_diff.util.io.sniff import read_head
 
 
 @dataclass(frozen=True)
 class AutoDetectSchema(InputSchema):
     schema: ClassVar[str] = "auto-detect"
     quiet: bool = False
+    # Raise a `ValueError` explaining why each schema failed to parse the lockfile, rather than
+    # reporting it on stderr and exiting.
+    raise_errors: bool = False
+
+    @staticmethod
+    def candidates(head: bytes) -> Iterator[tuple[type[InputSchema], int]]:
+        """Yield all schemas with their probe confidence for `head`, most likely schema first."""
+        probes: list[tuple[type[InputSchema], int]] = [
+            (schema_cls, schema_cls.probe(head))
+            for schema_cls in Registries.get_default().schemas.values()
+        ]
+        # Sort is stable, so schemas with equal confidence are tried in registration order.
+        yield from sorted(probes, key=lambda probe: probe[1], reverse=True)
 
     def parse(self, source: IO) -> ParsedData:
         errors = []
-        for schema_cls in Registries.get_default().schemas.values():
+        with timed("detect", source):
+            candidates = list(self.candidates(read_head(source)))
+        for schema_cls, confidence in candidates:
             if schema_cls is AutoDetectSchema:
                 continue
+            if confidence <= PROBE_NO_MATCH:
+                errors.append(f"  - `{schema_cls.schema}`: signature does not match")
+                continue
             try:
                 with capture(source):
-                    return cast(InputSchema, schema_cls()).parse(source)
+                    return Schema(schema_cls.schema).parse(source)
             except Exception as e:
                 errors.append(f"  - `{schema_cls.schema}`: {e}")
 
         if self.quiet:
             sys.exit(0)
 
-        click.echo(
+        message = "\n".join(
             (
-                f"ERROR: `auto-detect` failed to parse {getattr(source, 'name', str(source))!r} with "
-                "any of the following schemas:"
-            ),
-            err=True,
+                f"`auto-detect` failed to parse {getattr(source, 'name', str(source))!r} with any "
+                "of the following schemas:",
+                *errors,
+            )
         )
-        click.echo("\n".join(errors), err=True)
+        if self.raise_errors:
+            raise ValueError(message)
+        click.echo(f"ERROR: {message}", err=True)
         sys.exit(FAILED_TO_PARSE_FILE)
@@ -1,13 +1,31 @@
 from __future__ import annotations
 
+import re
 from collections import namedtuple
 from dataclasses import dataclass
-from typing import IO, Sequence
+from io import StringIO
+from typing import IO, Iterable, Sequence
 
-from lockfile_diff.base import Format, InputSchema
-from lockfile_diff.types import LockfileInfo, ParsedData
+from lockfile_diff.base import PROBE_LIKELY, PROBE_NO_MATCH, PROBE_WEAK, Format, InputSchema
+from lockfile_diff.types import ENTRY_CACHE_SIZE, LockfileInfo, ParsedData
+from lockfile_diff.util.memo import digest_cache
 
-Entry = namedtuple("Entry", ("artifact", "version"))
+# The `dependencies` are the artifacts of the direct dependencies of the entry, and the `digest` is
+# the fingerprint of its file.
+Entry = namedtuple("Entry", ("artifact", "version", "dependencies", "digest"), defaults=((), None))
+
+ENTRY_HEADER = "[[entries]]\n"
+TABLE_HEADER = re.compile(
+    r"(?:\[\[\s*(?P<array>[\w.\- ]+?)\s*\]\]|\[\s*(?P<table>[\w.\- ]+?)\s*\])\s*(?:#.*)?"
+)
+DIRECT_DEPENDENCIES = re.compile(r"^directDependencies\s*=\s*\[([^\]]*)\]", re.MULTILINE)
+BASIC_STRING = re.compile(r'"([^"\\]*)"')
+# The keys read from each table of an entry.
+SCANNED_KEYS = {
+    "entries.coord": ("artifact", "version"),
+    "entries.file_digest": ("fingerprint",),
+}
+KEY_VALUE = re.compile(r"([\w\-]+)\s*=\s*(?:(?:\"([^\"\\]*)\"|'([^']*)')\s*(?:#.*)?|(.*))")
 
 
 @dataclass(frozen=True)
@@ -24,17 +42,143 @@ class CoursierLockfileData(ParsedData):
                 Entry(
                     artifact=entry["coord"]["artifact"],
                     version=entry["coord"]["version"],
+                    dependencies=_artifacts(entry.get("directDependencies", ())),
+                    digest=entry.get("file_digest", {}).get("fingerprint"),
                 )
                 for entry in parsed_data.raw["entries"]
             ),
         )
 
+    @classmethod
+    def load(cls, source: IO) -> CoursierLockfileData:
+        """Read only the artifact, version, dependencies and digest of each entry from the lockfile
+        in `source`.
+
+        Splits the lockfile into entries on the `[[entries]]` headers and scans each of them for
+        its `[entries.coord]` and `[entries.file_digest]` tables, rather than parsing the whole TOML
+        document, leaving the `raw` data empty. Entries are memoized by a digest of their text, see
+        `scan_entry`. Lockfiles using any TOML syntax the scan does not handle are parsed in full
+        instead.
+        """
+        text = source.read()
+        if isinstance(text, bytes):
+            text = text.decode("utf-8")
+        entries = _scan_entries(text)
+        if entries is None:
+            return cls.create(Format("toml").parse(StringIO(text)))
+        return cls({}, entries=entries)
+
     def get_info(self) -> LockfileInfo:
-        return LockfileInfo.create((entry.artifact, entry.version) for entry in self.entries)
+        return LockfileInfo.create(
+            ((entry.artifact, entry.version) for entry in self.entries),
+            dependencies={
+                entry.artifact: entry.dependencies for entry in self.entries if entry.dependencies
+            },
+            hashes={entry.artifact: (entry.digest,) for entry in self.entries if entry.digest},
+        )
 
 
 class CoursierLockfileSchema(InputSchema):
     schema = "coursier"
 
+    @classmethod
+    def probe(cls, head: bytes) -> int:
+        if b"[[entries]]" in head:
+            return PROBE_LIKELY
+        if head.lstrip().startswith((b"{", b"//", b"#!")):
+            return PROBE_NO_MATCH
+        return PROBE_WEAK
+
     def parse(self, source: IO) -> ParsedData:
-        return CoursierLockfileData.create(Format("toml").parse(source))
+        return CoursierLockfileData.load(source)
+
+
+def _scan_entries(text: str) -> tuple[Entry, ...] | None:
+    """Extract the coord, direct dependencies and file digest of each entry in the TOML `text`.
+
+    Returns `None` if the entries can not be reliably extracted without a full parse. This is the
+    case for multi-line strings, `[[entries]]` headers with spaces or comments, inline or dotted key
+    `coord` tables and escaped values, none of which are written by Pants or Coursier.
+    """
+    if '"""' in text or "'''" in text:
+        return None
+    # Splitting on anything but the entry headers leaves a chunk without a coord table, which
+    # fails the scan.
+    preamble, *chunks = text.split(ENTRY_HEADER)
+    try:
+        if _scan_tables(preamble):
+            return None
+        return tuple(scan_entry(chunk) for chunk in chunks) or None
+    except ValueError:
+        return None
+
+
+@digest_cache(maxsize=ENTRY_CACHE_SIZE)
+def scan_entry(chunk: str) -> Entry:
+    """Extract the entry in `chunk`, the text following its `[[entries]]` header.
+
+    Memoized by a digest of the text of the entry, so entries that are the same in both lockfiles of
+    a diff, or across the revisions of a history, are only scanned once. Raises `ValueError` for
+    syntax the scan does not handle.
+    """
+    tables = _scan_tables(chunk)
+    coord = tables.get("entries.coord", {})
+    if "artifact" not in coord or "version" not in coord:
+        raise ValueError("no coord artifact and version")
+    return Entry(
+        artifact=coord["artifact"],
+        version=coord["version"],
+        dependencies=_artifacts(_scan_direct_dependencies(chunk)),
+        digest=tables.get("entries.file_digest", {}).get("fingerprint"),
+    )
+
+
+def _scan_direct_dependencies(chunk: str) -> list[str]:
+    """Return the coordinates in the `directDependencies` array of the entry in `chunk`."""
+    # The keys of the entry itself precede its first sub table.
+    table = re.split(r"^\s*\[", chunk, maxsplit=1, flags=re.MULTILINE)[0]
+    match = DIRECT_DEPENDENCIES.search(table)
+    if match is None:
+        if "directDependencies" in table:
+            raise ValueError("unsupported directDependencies value")
+        return []
+    if BASIC_STRING.sub("", match.group(1)).strip(" \t\r\n,"):
+        raise ValueError(f"unsupported directDependencies value: {match.group(1)}")
+    return BASIC_STRING.findall(match.group(1))
+
+
+def _artifacts(coords: Iterable[str]) -> tuple[str, ...]:
+    """Return the artifacts of `coords`, which are of the form `group:artifact[:...]:version`."""
+    return tuple(parts[1] for parts in (coord.split(":") for coord in coords) if len(parts) > 2)
+
+
+def _scan_tables(chunk: str) -> dict[str, dict[str, str]]:
+    """Return the values of the keys of each table in `SCANNED_KEYS` found in `chunk`."""
+    tables: dict[str, dict[str, str]] = {}
+    # The keys to read from the table being read, if it is one of the scanned tables.
+    current: dict[str, str] | None = None
+    keys: tuple[str, ...] = ()
+    for line in chunk.splitlines():
+        line = line.lstrip()
+        if line.startswith("["):
+            match = TABLE_HEADER.fullmatch(line)
+            if match is None:
+                raise ValueError(f"unsupported table header: {line}")
+            _, table = (re.sub(r"\s*\.\s*", ".", name or "") for name in match.groups())
+            current = None
+            if table in SCANNED_KEYS:
+                if table in tables:
+                    raise ValueError(f"duplicate {table} table")
+                current = tables[table] = {}
+                keys = SCANNED_KEYS[table]
+        elif current is not None and line and not line.startswith("#"):
+            match = KEY_VALUE.fullmatch(line)
+            if match is None:
+                raise ValueError(f"unsupported key/value: {line}")
+            key, basic, literal, other = match.groups()
+            if key not in keys:
+                continue
+            if other is not None or key in current:
+                raise ValueError(f"unsupported {key} value: {other}")
+            current[key] = basic if basic is not None else literal
+    return tables
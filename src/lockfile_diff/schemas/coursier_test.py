@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+from io import BytesIO, StringIO
+
+import pytest
+
+from lockfile_diff.schemas.coursier import CoursierLockfileSchema, Entry, scan_entry
+
+LOCKFILE = """\
+# A comment.
+[[entries]]
+directDependencies = [
+  "org.example:other:2.0",
+]
+dependencies = [
+  "org.example:other:2.0",
+]
+file_name = "org.example_lib_1.0.jar"
+
+[entries.coord]
+group = "org.example"
+artifact = "lib"
+version = "1.0"  # Comment.
+packaging = "jar"
+[entries.file_digest]
+fingerprint = "abc123"
+serialized_bytes_length = 45024
+
+[[entries]]
+[ entries . coord ]
+artifact = 'other'
+version = '2.0'
+"""
+
+
+def test_parse_coursier_lockfile() -> None:
+    data = CoursierLockfileSchema().parse(StringIO(LOCKFILE))
+    assert data.raw == {}
+    assert data.entries == (  # type: ignore[attr-defined]
+        Entry("lib", "1.0", ("other",), "abc123"),
+        Entry("other", "2.0"),
+    )
+    assert data.get_info().dependencies == {"lib": ("other",)}
+    assert data.get_info().hashes == {"lib": ("abc123",)}
+    assert data.get_info() == CoursierLockfileSchema().parse(BytesIO(LOCKFILE.encode())).get_info()
+
+
+@pytest.mark.parametrize(
+    "lockfile",
+    [
+        pytest.param(
+            '[[entries]]\ncoord = { artifact = "lib", version = "1.0" }\n', id="inline-table"
+        ),
+        pytest.param('[[entries]]\ncoord.artifact = "lib"\ncoord.version = "1.0"\n', id="dotted"),
+        pytest.param(
+            '[[entries]]\n[entries.coord]\nartifact = "l\\u0069b"\nversion = "1.0"\n', id="escaped"
+        ),
+        pytest.param(
+            '[[entries]]\n[entries.coord]\nartifact = """lib"""\nversion = "1.0"\n',
+            id="multi-line",
+        ),
+        pytest.param(
+            '[[ entries ]]\n[entries.coord]\nartifact = "lib"\nversion = "1.0"\n', id="spaced"
+        ),
+        pytest.param('entries = [{coord = {artifact = "lib", version = "1.0"}}]\n', id="array"),
+        pytest.param(
+            "[[entries]]\ndirectDependencies = [\"g:a:1\", 'g:b:1']\n"
+            '[entries.coord]\nartifact = "lib"\nversion = "1.0"\n',
+            id="literal-dependency",
+        ),
+    ],
+)
+def test_parse_coursier_lockfile_full(lockfile: str) -> None:
+    data = CoursierLockfileSchema().parse(StringIO(lockfile))
+    assert "entries" in data.raw
+    assert data.entries[0][:2] == ("lib", "1.0")  # type: ignore[attr-defined]
+
+
+def test_parse_coursier_lockfile_reuses_entries() -> None:
+    def lockfile(*versions: str) -> StringIO:
+        return StringIO(
+            "".join(
+                f'[[entries]]\n[entries.coord]\nartifact = "lib{index}"\nversion = "{version}"\n'
+                for index, version in enumerate(versions)
+            )
+        )
+
+    CoursierLockfileSchema().parse(lockfile("1.0", "1.0", "1.0"))
+    before = scan_entry.cache_info()
+    data = CoursierLockfileSchema().parse(lockfile("1.0", "1.1", "1.0"))
+    after = scan_entry.cache_info()
+    assert (after.hits - before.hits, after.misses - before.misses) == (2, 1)
+    assert data.entries == (  # type: ignore[attr-defined]
+        Entry("lib0", "1.0"),
+        Entry("lib1", "1.1"),
+        Entry("lib2", "1.0"),
+    )
+
+
+def test_parse_not_a_coursier_lockfile() -> None:
+    with pytest.raises(ValueError, match="not a coursier lockfile"):
+        CoursierLockfileSchema().parse(StringIO('[coord]\nartifact = "lib"\n'))
@@ -2,9 +2,16 @@ from __future__ import annotations
 
 from abc import abstractmethod
 from dataclasses import dataclass
-from typing import IO, ClassVar
+from typing import IO, ClassVar, Mapping
 
-from lockfile_diff.base import Format, InputSchema, Schema
+from lockfile_diff.base import (
+    PROBE_CERTAIN,
+    PROBE_LIKELY,
+    PROBE_NO_MATCH,
+    Format,
+    InputSchema,
+    Schema,
+)
 from lockfile_diff.formats.blocks import CommentBlock, Sections
 from lockfile_diff.types import LockfileInfo, ParsedData
 
@@ -16,10 +23,24 @@ class PantsLockfileData(ParsedData):
     def get_info(self) -> LockfileInfo:
         return self.embedded.get_info()
 
+    def get_resolves(self) -> Mapping[str, LockfileInfo]:
+        return self.embedded.get_resolves()
+
 
 class PantsLockfileSchema(InputSchema):
     headerlines_prefix: ClassVar[str]
 
+    METADATA_MARKER: ClassVar[bytes] = b"--- BEGIN PANTS LOCKFILE METADATA"
+
+    @classmethod
+    def probe(cls, head: bytes) -> int:
+        head = head.lstrip()
+        if not head.startswith(cls.headerlines_prefix.encode()) or head.startswith(b"#!"):
+            return PROBE_NO_MATCH
+        if cls.METADATA_MARKER in head:
+            return PROBE_CERTAIN
+        return PROBE_LIKELY
+
     @abstractmethod
     def parse_embedded(self, source: IO) -> ParsedData:
         raise NotImplementedError()
@@ -29,7 +50,7 @@ class PantsLockfileSchema(InputSchema):
         metadata = Sections(delimiter="^--- ", keep=1).parse(header.source)
         return PantsLockfileData(
             raw=Format("json").parse(metadata.source).raw,
-            embedded=self.parse_embedded(source),
+            embedded=self.parse_embedded(header.remainder),
         )
 
 
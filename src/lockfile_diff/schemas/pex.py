@@ -1,15 +1,50 @@
 from __future__ import annotations
 
+import codecs
 import itertools
+import json
+import re
 from collections import namedtuple
 from dataclasses import dataclass
-from typing import IO, Sequence
+from typing import IO, Any, Iterable, Iterator, Mapping, Sequence
 
-from lockfile_diff.base import Format, InputSchema
-from lockfile_diff.types import LockfileInfo, ParsedData
+from packaging.utils import canonicalize_name
 
-LockedResolve = namedtuple("LockedResolve", ("locked_requirements"))
-LockedRequirement = namedtuple("LockedRequirement", ("project_name", "version"))
+from lockfile_diff.base import (
+    PROBE_CERTAIN,
+    PROBE_LIKELY,
+    PROBE_NO_MATCH,
+    PROBE_WEAK,
+    InputSchema,
+)
+from lockfile_diff.formats.jsonstream import CHUNK_SIZE, iterparse
+from lockfile_diff.types import ENTRY_CACHE_SIZE, LockfileInfo, ParsedData
+from lockfile_diff.util.io.rewind import capture
+from lockfile_diff.util.memo import digest_cache
+
+LockedResolve = namedtuple(
+    "LockedResolve", ("locked_requirements", "platform_tag"), defaults=(None,)
+)
+# The `artifacts` are the sorted `algorithm:hash` of each artifact of the requirement.
+LockedRequirement = namedtuple(
+    "LockedRequirement",
+    ("project_name", "version", "requires_dists", "artifacts"),
+    defaults=((), ()),
+)
+
+RESOLVE_PREFIX = "locked_resolves.item"
+REQUIREMENT_PREFIX = f"{RESOLVE_PREFIX}.locked_requirements.item"
+PLATFORM_TAG_PREFIX = f"{RESOLVE_PREFIX}.platform_tag"
+SCALAR_EVENTS = ("string", "number", "boolean", "null")
+# The project name at the start of a PEP 508 requirement string.
+REQUIREMENT_NAME = re.compile(r"\s*([A-Za-z0-9](?:[A-Za-z0-9._-]*[A-Za-z0-9])?)")
+# Delimiters of each locked requirement, as laid out by pex with `json.dump(..., indent=2)`.
+REQUIREMENT_START = "\n        {\n"
+REQUIREMENT_END = "\n        }"
+DELIMITER_SIZE = max(len(REQUIREMENT_START), len(REQUIREMENT_END))
+# Characters of the document outside of the locked requirements to read, before streaming it
+# instead.
+SKELETON_LIMIT = 1024 * 1024
 
 
 @dataclass(frozen=True)
@@ -33,28 +68,242 @@ class PexLockfileData(ParsedData):
             locked_resolves=tuple(
                 LockedResolve(
                     locked_requirements=tuple(
-                        LockedRequirement(
-                            project_name=requirement["project_name"],
-                            version=requirement["version"],
-                        )
+                        locked_requirement(requirement)
                         for requirement in resolve["locked_requirements"]
                     ),
+                    platform_tag=resolve.get("platform_tag"),
                 )
                 for resolve in parsed_data.raw["locked_resolves"]
             ),
         )
 
+    @classmethod
+    def load(cls, source: IO) -> PexLockfileData:
+        """Read the project name and version of each locked requirement from `source`, without
+        loading the whole document.
+
+        Only the top level scalar values are kept as `raw` data. The locked requirements are found
+        by their layout as the text is read in blocks, and decoded one at a time, memoized by a
+        digest of their text, see `load_requirement`. Lockfiles laid out differently, and sources
+        that can not be rewound to read them again, are streamed instead. Either way, the text of
+        each requirement is discarded once decoded, so memory use does not grow with the size of
+        the lockfile.
+        """
+        if source.seekable():
+            with capture(source) as state:
+                data = cls._load_chunks(source)
+                if data is not None:
+                    state.release()
+                    return data
+        return cls._load_stream(source)
+
+    @classmethod
+    def _load_chunks(cls, source: IO) -> PexLockfileData | None:
+        """Decode each locked requirement in `source` separately.
+
+        The rest of the document, with the requirements replaced by placeholders, is decoded to
+        verify that each of them was found in a list of locked requirements. Returns `None` if not,
+        or if the rest of the document grows past `SKELETON_LIMIT`.
+        """
+        requirements: list[LockedRequirement] = []
+        skeleton: list[str] = []
+        skeleton_size = 0
+        # The text read so far of the requirement being read, if any.
+        chunk: list[str] | None = None
+        text = ""
+        try:
+            for block in _read_blocks(source):
+                text += block
+                pos = 0
+                while True:
+                    if chunk is None:
+                        start = text.find(REQUIREMENT_START, pos) + 1
+                        if not start:
+                            break
+                        skeleton.extend((text[pos:start], "{}"))
+                        skeleton_size += start - pos
+                        chunk = []
+                        pos = start
+                    end = text.find(REQUIREMENT_END, pos)
+                    if end == -1:
+                        break
+                    end += len(REQUIREMENT_END)
+                    chunk.append(text[pos:end])
+                    requirements.append(load_requirement("".join(chunk)))
+                    chunk = None
+                    pos = end
+                # Keep what may be the start of a delimiter split between blocks.
+                keep = max(pos, len(text) - DELIMITER_SIZE)
+                if chunk is None:
+                    skeleton.append(text[pos:keep])
+                    skeleton_size += keep - pos
+                else:
+                    chunk.append(text[pos:keep])
+                text = text[keep:]
+                if skeleton_size > SKELETON_LIMIT:
+                    return None
+            if chunk is not None:
+                return None
+            skeleton.append(text)
+            document = json.loads("".join(skeleton))
+            resolves = document["locked_resolves"]
+            placeholders = [
+                requirement
+                for resolve in resolves
+                for requirement in resolve["locked_requirements"]
+            ]
+        except (ValueError, KeyError, TypeError):
+            return None
+        if "pex_version" not in document or placeholders != [{}] * len(requirements):
+            return None
+
+        remaining = iter(requirements)
+        return cls(
+            {key: value for key, value in document.items() if not isinstance(value, (dict, list))},
+            locked_resolves=tuple(
+                LockedResolve(
+                    locked_requirements=tuple(
+                        itertools.islice(remaining, len(resolve["locked_requirements"]))
+                    ),
+                    platform_tag=resolve.get("platform_tag"),
+                )
+                for resolve in resolves
+            ),
+        )
+
+    @classmethod
+    def _load_stream(cls, source: IO) -> PexLockfileData:
+        raw: dict[str, Any] = {}
+        locked_resolves: list[LockedResolve] = []
+        locked_requirements: list[LockedRequirement] = []
+        platform_tag = None
+        for prefix, event, value in iterparse(
+            source, values={REQUIREMENT_PREFIX, PLATFORM_TAG_PREFIX}
+        ):
+            if prefix == REQUIREMENT_PREFIX:
+                try:
+                    locked_requirements.append(locked_requirement(value))
+                except (KeyError, TypeError) as e:
+                    raise ValueError(f"invalid locked requirement: {e}") from None
+            elif prefix == PLATFORM_TAG_PREFIX:
+                platform_tag = value
+            elif prefix == RESOLVE_PREFIX and event == "end_map":
+                locked_resolves.append(
+                    LockedResolve(
+                        locked_requirements=tuple(locked_requirements),
+                        platform_tag=platform_tag,
+                    )
+                )
+                locked_requirements.clear()
+                platform_tag = None
+            elif event in SCALAR_EVENTS and "." not in prefix:
+                raw[prefix] = value
+
+        if "pex_version" not in raw:
+            raise ValueError("not a pex lockfile")
+
+        return cls(raw, locked_resolves=tuple(locked_resolves))
+
     def get_info(self) -> LockfileInfo:
-        return LockfileInfo.create(
-            (req.project_name, req.version)
-            for req in itertools.chain.from_iterable(
+        return _create_info(
+            itertools.chain.from_iterable(
                 resolve.locked_requirements for resolve in self.locked_resolves
             )
         )
 
+    def get_resolves(self) -> Mapping[str, LockfileInfo]:
+        """Return the info for each locked resolve, keyed by resolve name.
+
+        The resolve name is the platform tag of the resolve, or its index for resolves without a
+        platform tag.
+        """
+        resolves: dict[str, LockfileInfo] = {}
+        for index, resolve in enumerate(self.locked_resolves):
+            name = "-".join(resolve.platform_tag) if resolve.platform_tag else str(index)
+            if name in resolves:
+                name = f"{name}#{index}"
+            resolves[name] = _create_info(resolve.locked_requirements)
+        return resolves
+
+
+@digest_cache(maxsize=ENTRY_CACHE_SIZE)
+def load_requirement(chunk: str) -> LockedRequirement:
+    """Decode the locked requirement in the JSON `chunk`.
+
+    Memoized by a digest of the text of the requirement, so requirements that are the same in both
+    lockfiles of a diff, or across the revisions of a history, are only decoded once, without
+    keeping their text around.
+    """
+    return locked_requirement(json.loads(chunk))
+
+
+def _read_blocks(source: IO) -> Iterator[str]:
+    """Yield the text of the text or binary `source` in blocks of `CHUNK_SIZE`."""
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    while block := source.read(CHUNK_SIZE):
+        yield decoder.decode(block) if isinstance(block, bytes) else block
+    yield decoder.decode(b"", final=True)
+
+
+def locked_requirement(requirement: Mapping[str, Any]) -> LockedRequirement:
+    """Extract the project name, version, the names of the projects it requires and the artifact
+    hashes from the decoded locked `requirement`."""
+    requires_dists = []
+    for requires in requirement.get("requires_dists") or ():
+        match = REQUIREMENT_NAME.match(requires)
+        if match:
+            requires_dists.append(canonicalize_name(match.group(1)))
+    return LockedRequirement(
+        project_name=requirement["project_name"],
+        version=requirement["version"],
+        requires_dists=tuple(requires_dists),
+        artifacts=tuple(
+            sorted(
+                f"{artifact['algorithm']}:{artifact['hash']}"
+                for artifact in requirement.get("artifacts") or ()
+            )
+        ),
+    )
+
+
+def _create_info(requirements: Iterable[LockedRequirement]) -> LockfileInfo:
+    requirements = tuple(requirements)
+    dependencies: dict[str, tuple[str, ...]] = {}
+    if any(req.requires_dists for req in requirements):
+        # Requirements refer to projects by canonical name.
+        names = {canonicalize_name(req.project_name): req.project_name for req in requirements}
+        dependencies = {
+            req.project_name: tuple(names[name] for name in req.requires_dists if name in names)
+            for req in requirements
+            if req.requires_dists
+        }
+    hashes: dict[str, tuple[str, ...]] = {}
+    for req in requirements:
+        if req.artifacts:
+            # Requirements in several resolves have the artifacts of all of them.
+            known = hashes.get(req.project_name)
+            hashes[req.project_name] = (
+                tuple(sorted({*known, *req.artifacts})) if known else req.artifacts
+            )
+    return LockfileInfo.create(
+        ((req.project_name, req.version) for req in requirements),
+        dependencies=dependencies,
+        hashes=hashes,
+    )
+
 
 class PexLockfileSchema(InputSchema):
     schema = "pex"
 
+    @classmethod
+    def probe(cls, head: bytes) -> int:
+        if not head.lstrip().startswith(b"{"):
+            return PROBE_NO_MATCH
+        if b'"locked_resolves"' in head:
+            return PROBE_CERTAIN
+        if b'"pex_version"' in head and b'"build_properties"' not in head:
+            return PROBE_LIKELY
+        return PROBE_WEAK
+
     def parse(self, source: IO) -> ParsedData:
-        return PexLockfileData.create(Format("json").parse(source))
+        return PexLockfileData.load(source)
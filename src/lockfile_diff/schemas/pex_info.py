@@ -1,12 +1,21 @@
 from __future__ import annotations
 
-import os.path
 from dataclasses import dataclass
+from io import BytesIO
 from typing import IO, Sequence, cast
-from zipfile import ZipFile
 
-from lockfile_diff.base import Format, InputSchema
+from lockfile_diff.base import (
+    PROBE_CERTAIN,
+    PROBE_LIKELY,
+    PROBE_NO_MATCH,
+    PROBE_WEAK,
+    Format,
+    InputSchema,
+)
 from lockfile_diff.types import LockfileInfo, ParsedData
+from lockfile_diff.util.io.zipmember import map_source, read_member
+
+ZIP_MAGIC = b"PK\x03\x04"
 
 
 @dataclass(frozen=True)
@@ -31,6 +40,16 @@ class PexInfoData(ParsedData):
 class PexInfoSchema(InputSchema):
     schema = "pex-info"
 
+    @classmethod
+    def probe(cls, head: bytes) -> int:
+        if not head.lstrip().startswith(b"{"):
+            return PROBE_NO_MATCH
+        if b'"build_properties"' in head:
+            return PROBE_CERTAIN
+        if b'"distributions"' in head:
+            return PROBE_LIKELY
+        return PROBE_WEAK
+
     def parse(self, source: IO) -> ParsedData:
         return PexInfoData.create(Format("json").parse(source))
 
@@ -38,11 +57,14 @@ class PexInfoSchema(InputSchema):
 class PexAppSchema(InputSchema):
     schema = "pex-app"
 
-    def parse(self, source: IO) -> ParsedData:
-        filename = getattr(source, "name", str(source))
-        if not os.path.isfile(filename):
-            raise ValueError(f"input must be a file on disk, got {filename}")
+    @classmethod
+    def probe(cls, head: bytes) -> int:
+        # A PEX app is a zip archive, optionally prefixed with a shebang line.
+        if head.startswith(b"#!"):
+            head = head[head.find(b"\n") + 1 :]
+        return PROBE_CERTAIN if head.startswith(ZIP_MAGIC) else PROBE_NO_MATCH
 
-        with ZipFile(filename) as zf:
-            with zf.open("PEX-INFO") as pi:
-                return PexInfoSchema().parse(pi)
+    def parse(self, source: IO) -> ParsedData:
+        with map_source(source) as buffer:
+            pex_info = read_member(buffer, "PEX-INFO")
+        return PexInfoSchema().parse(BytesIO(pex_info))
@@ -1,5 +1,190 @@
 from __future__ import annotations
 
+import json
+from io import BytesIO, StringIO
+
+import pytest
+
+from lockfile_diff.schemas import pex
+from lockfile_diff.schemas.pex import (
+    LockedRequirement,
+    LockedResolve,
+    PexLockfileSchema,
+    load_requirement,
+)
+
 
 def test_parse_pex_lockfile() -> None:
-    pass
+    lockfile = dict(
+        allow_builds=True,
+        locked_resolves=[
+            dict(
+                locked_requirements=[
+                    dict(
+                        artifacts=[dict(algorithm="sha256", hash="abc123", url="https://...")],
+                        project_name="cowsay",
+                        requires_dists=[],
+                        version="5.0",
+                    ),
+                ],
+                platform_tag=None,
+            )
+        ],
+        pex_version="2.1.113",
+        requirements=["cowsay"],
+    )
+    data = PexLockfileSchema().parse(StringIO(json.dumps(lockfile, indent=2)))
+    assert data.raw == dict(allow_builds=True, pex_version="2.1.113")
+    assert data.locked_resolves == (  # type: ignore[attr-defined]
+        LockedResolve(
+            locked_requirements=(LockedRequirement("cowsay", "5.0", artifacts=("sha256:abc123",)),)
+        ),
+    )
+    assert data.get_info().hashes == {"cowsay": ("sha256:abc123",)}
+
+
+@pytest.mark.parametrize("indent", [None, 2])
+def test_parse_pex_lockfile_dependencies(indent: int | None) -> None:
+    def requirement(name: str, *requires_dists: str) -> dict:
+        return dict(project_name=name, requires_dists=list(requires_dists), version="1.0")
+
+    lockfile = dict(
+        locked_resolves=[
+            dict(
+                locked_requirements=[
+                    requirement(
+                        "app", "Requests[socks]>=2.0", "missing", 'pywin32; os_name == "nt"'
+                    ),
+                    requirement("requests", "urllib3<2,>=1.21.1"),
+                    requirement("urllib3"),
+                ]
+            )
+        ],
+        pex_version="2.1.113",
+    )
+    data = PexLockfileSchema().parse(StringIO(json.dumps(lockfile, indent=indent)))
+    assert data.locked_resolves[0].locked_requirements[0] == (  # type: ignore[attr-defined]
+        LockedRequirement("app", "1.0", ("requests", "missing", "pywin32"))
+    )
+    assert data.get_info().dependencies == {"app": ("requests",), "requests": ("urllib3",)}
+
+
+def test_parse_not_a_pex_lockfile() -> None:
+    with pytest.raises(ValueError, match="not a pex lockfile"):
+        PexLockfileSchema().parse(StringIO('{"locked_resolves": []}'))
+
+
+@pytest.mark.parametrize("indent", [None, 2, 4])
+def test_parse_pex_lockfile_layouts(indent: int | None) -> None:
+    def requirement(name: str) -> dict:
+        return dict(
+            artifacts=[dict(algorithm="sha256", hash=f"{name}123")],
+            project_name=name,
+            version="1.0",
+        )
+
+    lockfile = dict(
+        locked_resolves=[
+            dict(locked_requirements=[requirement("a"), requirement("b")], platform_tag=["cp39"]),
+            dict(locked_requirements=[], platform_tag=None),
+            dict(locked_requirements=[requirement("c")]),
+        ],
+        path_mappings={},
+        pex_version="2.1.113",
+    )
+    data = PexLockfileSchema().parse(StringIO(json.dumps(lockfile, indent=indent)))
+    assert data.raw == dict(pex_version="2.1.113")
+    assert data.locked_resolves == (  # type: ignore[attr-defined]
+        LockedResolve(
+            (
+                LockedRequirement("a", "1.0", artifacts=("sha256:a123",)),
+                LockedRequirement("b", "1.0", artifacts=("sha256:b123",)),
+            ),
+            ["cp39"],
+        ),
+        LockedResolve((), None),
+        LockedResolve((LockedRequirement("c", "1.0", artifacts=("sha256:c123",)),), None),
+    )
+
+
+def test_parse_pex_lockfile_reuses_requirements() -> None:
+    def lockfile(*versions: str) -> StringIO:
+        requirements = [
+            dict(project_name=f"dist{index}", version=version)
+            for index, version in enumerate(versions)
+        ]
+        return StringIO(
+            json.dumps(
+                dict(locked_resolves=[dict(locked_requirements=requirements)], pex_version="2"),
+                indent=2,
+            )
+        )
+
+    PexLockfileSchema().parse(lockfile("1.0", "1.0", "1.0"))
+    before = load_requirement.cache_info()
+    data = PexLockfileSchema().parse(lockfile("1.0", "1.1", "1.0"))
+    after = load_requirement.cache_info()
+    assert (after.hits - before.hits, after.misses - before.misses) == (2, 1)
+    assert data.get_info() == PexLockfileSchema().parse(lockfile("1.0", "1.1", "1.0")).get_info()
+
+
+class UnseekableBytesIO(BytesIO):
+    def seekable(self) -> bool:
+        return False
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 64 * 1024])
+@pytest.mark.parametrize("source_type", [StringIO, BytesIO, UnseekableBytesIO])
+def test_parse_pex_lockfile_sources(
+    source_type: type, chunk_size: int, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(pex, "CHUNK_SIZE", chunk_size)
+    artifact = dict(algorithm="sha256", hash="abc123", url="https://example.com/caf\u00e9.whl")
+    requirements = [
+        dict(artifacts=[artifact], project_name="cafe", version="1.0"),
+        dict(project_name="dist", requires_dists=["cafe"], version="2.0"),
+    ]
+    text = json.dumps(
+        dict(locked_resolves=[dict(locked_requirements=requirements)], pex_version="2"),
+        ensure_ascii=False,
+        indent=2,
+    )
+    source = source_type(text if source_type is StringIO else text.encode())
+    before = load_requirement.cache_info()
+    data = PexLockfileSchema().parse(source)
+    # Only seekable sources are read by the layout of the requirements.
+    after = load_requirement.cache_info()
+    decoded = after.hits + after.misses - before.hits - before.misses
+    assert decoded == (0 if source_type is UnseekableBytesIO else 2)
+    assert data.locked_resolves == (  # type: ignore[attr-defined]
+        LockedResolve(
+            (
+                LockedRequirement("cafe", "1.0", artifacts=("sha256:abc123",)),
+                LockedRequirement("dist", "2.0", ("cafe",)),
+            )
+        ),
+    )
+
+
+def test_pex_lockfile_resolves() -> None:
+    def resolve(platform_tag: list[str] | None, version: str) -> dict:
+        return dict(
+            locked_requirements=[dict(project_name="cowsay", version=version)],
+            platform_tag=platform_tag,
+        )
+
+    lockfile = dict(
+        locked_resolves=[
+            resolve(["cp39", "cp39", "macosx_12_0_arm64"], "5.0"),
+            resolve(["cp39", "cp39", "manylinux_2_17_x86_64"], "4.0"),
+            resolve(None, "3.0"),
+        ],
+        pex_version="2.1.113",
+    )
+    data = PexLockfileSchema().parse(StringIO(json.dumps(lockfile)))
+    resolves = data.get_resolves()
+    assert {name: str(info.dists["cowsay"]) for name, info in resolves.items()} == {
+        "cp39-cp39-macosx_12_0_arm64": "5.0",
+        "cp39-cp39-manylinux_2_17_x86_64": "4.0",
+        "2": "3.0",
+    }
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from io import BytesIO
+from typing import IO, Callable, Iterable, Iterator
+
+
+@dataclass
+class Timing:
+    """Wall time spent in a stage of the pipeline.
+
+    The `stage` is one of `git`, `parse`, `detect`, `schema:<name>`, `format:<name>`, `info`,
+    `resolves`, `diff` or `encode:<name>`. The `name` is the name of the source, if any. Stages
+    may be nested, in which case the inner stage is reported first.
+    """
+
+    stage: str
+    name: str | None = None
+    seconds: float = 0.0
+    # Size of the input, when known.
+    bytes: int | None = None
+    # Number of dists processed, when known.
+    entries: int | None = None
+    failed: bool = False
+
+
+TimingCallback = Callable[[Timing], None]
+
+# Replaced rather than mutated, so that stages completing in other threads may iterate over the
+# callbacks without holding the lock.
+_callbacks: tuple[TimingCallback, ...] = ()
+_callbacks_lock = threading.Lock()
+
+
+def add_callback(callback: TimingCallback) -> None:
+    """Call `callback` with the `Timing` of each stage as it completes."""
+    global _callbacks
+    with _callbacks_lock:
+        _callbacks = (*_callbacks, callback)
+
+
+def remove_callback(callback: TimingCallback) -> None:
+    global _callbacks
+    with _callbacks_lock:
+        callbacks = list(_callbacks)
+        callbacks.remove(callback)
+        _callbacks = tuple(callbacks)
+
+
+def report(timing: Timing) -> None:
+    """Call the registered callbacks with `timing`, for stages not timed with `timed`."""
+    for callback in _callbacks:
+        callback(timing)
+
+
+@contextmanager
+def collect() -> Iterator[list[Timing]]:
+    """Collect the timings of all stages completed within the context into a list."""
+    timings: list[Timing] = []
+    add_callback(timings.append)
+    try:
+        yield timings
+    finally:
+        remove_callback(timings.append)
+
+
+@contextmanager
+def timed(stage: str, source: IO | None = None, name: str | None = None) -> Iterator[Timing]:
+    """Time the stage run within the context.
+
+    The yielded `Timing` may be updated with the number of bytes and entries processed. Nothing is
+    measured unless there are any callbacks registered.
+    """
+    if not _callbacks:
+        yield Timing(stage)
+        return
+
+    timing = Timing(
+        stage,
+        name=name if name is not None else getattr(source, "name", None),
+        bytes=_source_size(source),
+    )
+    start = time.perf_counter()
+    try:
+        yield timing
+    except BaseException:
+        timing.failed = True
+        raise
+    finally:
+        timing.seconds = time.perf_counter() - start
+        report(timing)
+
+
+def as_table(timings: Iterable[Timing]) -> str:
+    """Format `timings` as a table, one stage per line."""
+    lines = [f"{'stage':24} {'seconds':>9} {'bytes':>12} {'entries':>8}  name"]
+    for timing in timings:
+        size = "" if timing.bytes is None else timing.bytes
+        entries = "" if timing.entries is None else timing.entries
+        stage = f"{timing.stage} (failed)" if timing.failed else timing.stage
+        lines.append(
+            f"{stage:24} {timing.seconds:9.4f} {size:>12} {entries:>8}  {timing.name or ''}"
+        )
+    return "\n".join(lines)
+
+
+def _source_size(source: IO | None) -> int | None:
+    if source is None:
+        return None
+    binary = getattr(source, "buffer", source)
+    try:
+        if isinstance(binary, BytesIO):
+            return binary.getbuffer().nbytes
+        return os.fstat(binary.fileno()).st_size
+    except (AttributeError, OSError, ValueError):
+        # Closed, or not a file.
+        return None
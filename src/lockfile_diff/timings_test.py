@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import json
+import time
+from typing import Any, Iterator
+
+import pytest
+
+from lockfile_diff.base import Format
+from lockfile_diff.parser import Parser
+from lockfile_diff.timings import Timing, add_callback, as_table, collect, remove_callback, timed
+from lockfile_diff.util.io.named import open_bytes
+
+
+def test_timed_without_callbacks() -> None:
+    with timed("stage", open_bytes(b"data", "source")) as timing:
+        timing.entries = 1
+    assert timing.name is None
+    assert timing.bytes is None
+
+
+def test_timed() -> None:
+    reported: list[Timing] = []
+    add_callback(reported.append)
+    try:
+        with timed("stage", open_bytes(b"data", "source")) as timing:
+            timing.entries = 2
+        with pytest.raises(ValueError):
+            with timed("failing", name="other"):
+                raise ValueError()
+    finally:
+        remove_callback(reported.append)
+
+    assert reported == [
+        Timing("stage", name="source", seconds=reported[0].seconds, bytes=4, entries=2),
+        Timing("failing", name="other", seconds=reported[1].seconds, failed=True),
+    ]
+    assert "stage" in as_table(reported).splitlines()[1]
+
+
+def test_collect_parser_diff() -> None:
+    with open("tests/lockfiles/pex/cowsay-default.lock", "rb") as fd:
+        data = fd.read()
+    with collect() as timings:
+        Parser.diff(None, open_bytes(data, "cowsay.lock"), "auto-detect")
+    stages = [timing.stage for timing in timings]
+    assert stages == ["info", "detect", "schema:pex", "schema:auto-detect", "parse", "info", "diff"]
+    assert timings[4].bytes == len(data)
+    assert timings[5].entries == 1
+    assert timings[6].entries == 1
+    assert all(timing.seconds >= 0 for timing in timings)
+
+
+def test_collect_encode_stream() -> None:
+    def items() -> Iterator[tuple[str, Any]]:
+        for key in "ab":
+            with timed("diff"):
+                time.sleep(0.05)
+            yield key, {}
+
+    with collect() as timings:
+        chunks = list(Format("json").encode_stream(items()))
+    assert json.loads("".join(chunks)) == dict(a={}, b={})
+    assert [timing.stage for timing in timings] == ["diff", "diff", "encode:json"]
+    assert timings[2].entries == 2
+    # Producing the items is not part of encoding them.
+    assert timings[2].seconds < 0.05
@@ -1,25 +1,248 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import IO, Any, Iterable, Mapping, Union
+import fnmatch
+import re
+import sys
+from bisect import bisect_left
+from dataclasses import dataclass, field, fields
+from functools import cached_property, lru_cache
+from itertools import chain
+from typing import IO, Any, Iterable, Iterator, Mapping, Sequence, Union
 
 from packaging.version import LegacyVersion, Version, parse
 
+from lockfile_diff.graph import DependencyGraph
+from lockfile_diff.timings import timed
+
 ParsedVersion = Union[Version, LegacyVersion]
 
+VERSION_CACHE_SIZE = 16 * 1024
+# Number of lockfile entries to memoize the extracted data of, keyed by a digest of each entry.
+ENTRY_CACHE_SIZE = 16 * 1024
+
+# Resolve name used for lockfiles that do not have multiple resolves.
+DEFAULT_RESOLVE = "default"
+
+# Metadata of optional dataclass fields that are left out of the encoded output when empty, see
+# `encoded_fields`.
+OMIT_EMPTY = {"omit_empty": True}
+
+# Levels of version bumps, by the most significant part of the version that changed. Legacy
+# versions can not be split into parts.
+BUMP_LEGACY = 0
+BUMP_LOCAL = 1
+BUMP_POST = 2
+BUMP_PRE = 3
+BUMP_MICRO = 4
+BUMP_MINOR = 5
+BUMP_MAJOR = 6
+# Name of each bump level, indexed by level.
+BUMPS = ("legacy", "local", "post", "pre", "micro", "minor", "major")
+
+
+@lru_cache(maxsize=VERSION_CACHE_SIZE)
+def parse_version(version: str) -> ParsedVersion:
+    """Parse `version`, returning the same version object for all equal version strings.
+
+    Version objects are immutable, so the parsed versions are shared by all lockfiles. Use
+    `parse_version.cache_info()` for cache hit and miss counts.
+    """
+    return parse(version)
+
+
+def classify_bump(prev: ParsedVersion, curr: ParsedVersion) -> int:
+    """Return the level of the bump between the differing versions `prev` and `curr`.
+
+    Release segments past the micro version count as micro bumps, and dev releases as pre-releases.
+    """
+    if not (isinstance(prev, Version) and isinstance(curr, Version)):
+        return BUMP_LEGACY
+    if prev.epoch != curr.epoch:
+        return BUMP_MAJOR
+    prev_release, curr_release = prev.release, curr.release
+    if prev_release != curr_release:
+        # Missing release segments are zeros, e.g. 1.2 is the same release as 1.2.0.
+        size = max(len(prev_release), len(curr_release))
+        prev_release += (0,) * (size - len(prev_release))
+        curr_release += (0,) * (size - len(curr_release))
+        for index, (prev_part, curr_part) in enumerate(zip(prev_release, curr_release)):
+            if prev_part != curr_part:
+                return BUMP_MAJOR - min(index, 2)
+    if prev.pre != curr.pre or prev.dev != curr.dev:
+        return BUMP_PRE
+    if prev.post != curr.post:
+        return BUMP_POST
+    return BUMP_LOCAL
+
+
+class Dists(Mapping[str, ParsedVersion]):
+    """Read only mapping of dist names to versions, held in parallel arrays sorted by name.
+
+    Names are interned and looked up by binary search. Versions are kept as strings and only parsed
+    when first looked up, so holding many lockfiles in memory costs little more than their names
+    and version strings.
+    """
+
+    __slots__ = ("names", "versions", "_parsed")
+
+    names: Sequence[str]
+    versions: Sequence[str]
+    _parsed: list[ParsedVersion | None]
+
+    def __init__(self, dists: Iterable[tuple[str, str]] = ()) -> None:
+        # Keep the last version of duplicate names, as a dict would.
+        items = sorted({sys.intern(name): version for name, version in dists}.items())
+        self.names = tuple(name for name, _ in items)
+        self.versions = tuple(version for _, version in items)
+        self._parsed = [None] * len(items)
+
+    @classmethod
+    def of(cls, dists: Mapping[str, ParsedVersion]) -> Dists:
+        """Return `dists` as a `Dists` mapping, keeping any already parsed versions."""
+        if isinstance(dists, Dists):
+            return dists
+        items = sorted(dists.items())
+        compact = cls((name, str(version)) for name, version in items)
+        compact._parsed = [version for _, version in items]
+        return compact
+
+    def index(self, name: str) -> int:
+        """Return the position of `name` in `names`, or -1 if there is no such dist."""
+        index = bisect_left(self.names, name)
+        if index < len(self.names) and self.names[index] == name:
+            return index
+        return -1
+
+    def version(self, index: int) -> ParsedVersion:
+        """Return the parsed version of the dist at `index` in `names`."""
+        parsed = self._parsed[index]
+        if parsed is None:
+            parsed = self._parsed[index] = parse_version(self.versions[index])
+        return parsed
+
+    def __getitem__(self, name: str) -> ParsedVersion:
+        index = self.index(name) if isinstance(name, str) else -1
+        if index < 0:
+            raise KeyError(name)
+        return self.version(index)
+
+    def __contains__(self, name: object) -> bool:
+        return isinstance(name, str) and self.index(name) >= 0
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.names)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __eq__(self, other: object) -> bool:
+        if (
+            isinstance(other, Dists)
+            and other.names == self.names
+            and other.versions == self.versions
+        ):
+            return True
+        return super().__eq__(other)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({dict(zip(self.names, self.versions))!r})"
+
 
 @dataclass(frozen=True)
 class LockfileInfo:
+    # Any mapping given is converted to `Dists`.
     dists: Mapping[str, ParsedVersion]
+    # Names of the dists that each dist depends on, for lockfiles that record them. Dists without
+    # any dependencies may be left out.
+    dependencies: Mapping[str, Sequence[str]] = field(default_factory=dict, metadata=OMIT_EMPTY)
+    # Sorted hashes of the artifacts of each dist, for lockfiles that record them.
+    hashes: Mapping[str, tuple[str, ...]] = field(default_factory=dict, metadata=OMIT_EMPTY)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "dists", Dists.of(self.dists))
 
     @classmethod
-    def create(cls, dists: Iterable[tuple[str, str]]) -> LockfileInfo:
-        return cls(dists={name: parse(version) for name, version in dists})
+    def create(
+        cls,
+        dists: Iterable[tuple[str, str]],
+        dependencies: Mapping[str, Sequence[str]] | None = None,
+        hashes: Mapping[str, tuple[str, ...]] | None = None,
+    ) -> LockfileInfo:
+        return cls(dists=Dists(dists), dependencies=dependencies or {}, hashes=hashes or {})
+
+    @cached_property
+    def graph(self) -> DependencyGraph:
+        return DependencyGraph.create(self.dists, self.dependencies)
 
     def diff(self, old: LockfileInfo) -> LockfileDiff:
         return LockfileDiff.create(old, self)
 
 
+@dataclass(frozen=True)
+class DiffFilter:
+    """Selects the dists and the categories of changes to include in a diff.
+
+    Dist names are matched against the `include` and `exclude` glob patterns, see `fnmatch`, before
+    their versions are parsed or compared. With no `include` patterns, all dists are included.
+    Upgrades and downgrades of a bump level below `min_bump` are left out. Top level requirements
+    are only looked up with `impact`. Without `drifted`, dists with changed artifacts are unchanged.
+    """
+
+    unchanged: bool = True
+    changed: bool = True
+    drifted: bool = True
+    added: bool = True
+    removed: bool = True
+    impact: bool = True
+    include: tuple[str, ...] = ()
+    exclude: tuple[str, ...] = ()
+    min_bump: int = BUMP_LEGACY
+
+    @cached_property
+    def _include(self) -> re.Pattern | None:
+        return _compile_globs(self.include)
+
+    @cached_property
+    def _exclude(self) -> re.Pattern | None:
+        return _compile_globs(self.exclude)
+
+    def select(self, dists: Dists) -> Sequence[int]:
+        """Return the positions of the names in `dists` that are included, in order."""
+        if not (self.include or self.exclude):
+            return range(len(dists.names))
+        if self.include and not any(_GLOB_CHARS.search(pattern) for pattern in self.include):
+            # Look up the named dists, rather than matching all names.
+            found = {dists.index(name) for name in self.include}
+            found.discard(-1)
+            index = sorted(found)
+        else:
+            include = self._include
+            index = [
+                i for i, name in enumerate(dists.names) if include is None or include.match(name)
+            ]
+        exclude = self._exclude
+        if exclude is None:
+            return index
+        names = dists.names
+        return [i for i in index if not exclude.match(names[i])]
+
+
+def _take(dists: Dists, index: Sequence[int]) -> tuple[Sequence[str], Sequence[str]]:
+    """Return the names and version strings of the dists at the positions in `index`."""
+    if isinstance(index, range) and len(index) == len(dists.names):
+        return dists.names, dists.versions
+    return [dists.names[i] for i in index], [dists.versions[i] for i in index]
+
+
+_GLOB_CHARS = re.compile(r"[*?\[]")
+
+
+def _compile_globs(patterns: Sequence[str]) -> re.Pattern | None:
+    if not patterns:
+        return None
+    return re.compile("|".join(f"(?:{fnmatch.translate(pattern)})" for pattern in patterns))
+
+
 @dataclass(frozen=True)
 class LockfileDiff:
     added: Mapping[str, ParsedVersion]
@@ -27,22 +250,160 @@ class LockfileDiff:
     unchanged: Mapping[str, ParsedVersion]
     upgraded: Mapping[str, tuple[ParsedVersion, ParsedVersion]]
     downgraded: Mapping[str, tuple[ParsedVersion, ParsedVersion]]
+    # Dists of the same version in both lockfiles, but with different artifact hashes, e.g. for
+    # having been published again.
+    drifted: Mapping[str, ParsedVersion] = field(default_factory=dict, metadata=OMIT_EMPTY)
+    # The top level requirements depending on each changed dist, for lockfiles that record the
+    # dependencies between dists. Looked up in the old lockfile for removed dists.
+    required_by: Mapping[str, tuple[str, ...]] = field(default_factory=dict, metadata=OMIT_EMPTY)
+    # The upgraded, downgraded and added dists depending on each upgraded, downgraded or added top
+    # level requirement, i.e. the changes that came with changing the requirement.
+    pulled_in: Mapping[str, tuple[str, ...]] = field(default_factory=dict, metadata=OMIT_EMPTY)
+    # The name of the bump level of each upgraded and downgraded dist, see `BUMPS`.
+    bumps: Mapping[str, str] = field(default_factory=dict, metadata=OMIT_EMPTY)
+    # Number of upgraded and downgraded dists per bump level, most significant level first.
+    summary: Mapping[str, int] = field(default_factory=dict, metadata=OMIT_EMPTY)
 
     @classmethod
-    def create(cls, old: LockfileInfo, new: LockfileInfo) -> LockfileDiff:
-        diff = {
-            name: (old.dists[name], new.dists[name])
-            for name in sorted({*old.dists.keys(), *new.dists.keys()})
-            if name in old.dists and name in new.dists
-        }
+    def create(
+        cls, old: LockfileInfo, new: LockfileInfo, diff_filter: DiffFilter | None = None
+    ) -> LockfileDiff:
+        """Diff `old` with `new` in a single merge pass over the sorted dist names of both.
+
+        All categories are sorted by dist name. Only the dists and changes selected by
+        `diff_filter` are compared and collected.
+        """
+        with timed("diff") as timing:
+            timing.entries = len(old.dists) + len(new.dists)
+            return cls._merge(old, new, diff_filter or DiffFilter())
+
+    @classmethod
+    def _merge(cls, old: LockfileInfo, new: LockfileInfo, diff_filter: DiffFilter) -> LockfileDiff:
+        added: dict[str, ParsedVersion] = {}
+        removed: dict[str, ParsedVersion] = {}
+        unchanged: dict[str, ParsedVersion] = {}
+        upgraded: dict[str, tuple[ParsedVersion, ParsedVersion]] = {}
+        downgraded: dict[str, tuple[ParsedVersion, ParsedVersion]] = {}
+        drifted: dict[str, ParsedVersion] = {}
+        bumps: dict[str, str] = {}
+        counts = [0] * len(BUMPS)
+        keep_added, keep_removed = diff_filter.added, diff_filter.removed
+        keep_unchanged, keep_changed = diff_filter.unchanged, diff_filter.changed
+        # Differing version strings are only parsed when their changes are kept.
+        compare = keep_unchanged or keep_changed
+        min_bump = diff_filter.min_bump
+        old_hashes, new_hashes = old.hashes, new.hashes
+        check_drift = diff_filter.drifted and bool(old_hashes and new_hashes)
+
+        old_dists, new_dists = Dists.of(old.dists), Dists.of(new.dists)
+        # Positions of the selected dists in the dists, and their names and version strings.
+        old_index, new_index = diff_filter.select(old_dists), diff_filter.select(new_dists)
+        old_names, old_versions = _take(old_dists, old_index)
+        new_names, new_versions = _take(new_dists, new_index)
+        old_count, new_count = len(old_names), len(new_names)
+        i = j = 0
+        while i < old_count or j < new_count:
+            if j == new_count or (i < old_count and old_names[i] < new_names[j]):
+                if keep_removed:
+                    removed[old_names[i]] = old_dists.version(old_index[i])
+                i += 1
+            elif i == old_count or new_names[j] < old_names[i]:
+                if keep_added:
+                    added[new_names[j]] = new_dists.version(new_index[j])
+                j += 1
+            else:
+                if old_versions[i] == new_versions[j]:
+                    # Equal version strings, no need to compare the parsed versions.
+                    name = new_names[j]
+                    if (
+                        check_drift
+                        and (prev_hashes := old_hashes.get(name))
+                        and (curr_hashes := new_hashes.get(name))
+                        and prev_hashes != curr_hashes
+                    ):
+                        drifted[name] = new_dists.version(new_index[j])
+                    elif keep_unchanged:
+                        unchanged[name] = new_dists.version(new_index[j])
+                elif compare:
+                    name = new_names[j]
+                    prev = old_dists.version(old_index[i])
+                    curr = new_dists.version(new_index[j])
+                    if prev == curr:
+                        if keep_unchanged:
+                            unchanged[name] = curr
+                    elif keep_changed:
+                        level = classify_bump(prev, curr)
+                        if level >= min_bump:
+                            if prev < curr:
+                                upgraded[name] = (prev, curr)
+                            else:
+                                downgraded[name] = (prev, curr)
+                            bumps[name] = BUMPS[level]
+                            counts[level] += 1
+                i += 1
+                j += 1
+
+        required_by: dict[str, tuple[str, ...]] = {}
+        pulled_in: dict[str, list[str]] = {}
+        if diff_filter.impact and old.dependencies:
+            required_by.update(old.graph.required_by(removed))
+        if diff_filter.impact and new.dependencies:
+            changed = new.graph.required_by(chain(upgraded, downgraded, added))
+            required_by.update(changed)
+            # Top level requirements are required by themselves only.
+            for name, roots in changed.items():
+                for root in roots:
+                    if root != name and root in changed:
+                        pulled_in.setdefault(root, []).append(name)
+
         return cls(
-            added={name: version for name, version in new.dists.items() if name not in old.dists},
-            removed={name: version for name, version in old.dists.items() if name not in new.dists},
-            unchanged={name: curr for name, (prev, curr) in diff.items() if prev == curr},
-            upgraded={name: (prev, curr) for name, (prev, curr) in diff.items() if prev < curr},
-            downgraded={name: (prev, curr) for name, (prev, curr) in diff.items() if prev > curr},
+            added=added,
+            removed=removed,
+            unchanged=unchanged,
+            upgraded=upgraded,
+            downgraded=downgraded,
+            drifted=drifted,
+            required_by=dict(sorted(required_by.items())),
+            pulled_in={root: tuple(sorted(names)) for root, names in sorted(pulled_in.items())},
+            bumps=bumps,
+            summary={
+                BUMPS[level]: counts[level]
+                for level in reversed(range(len(BUMPS)))
+                if counts[level]
+            },
         )
 
+    @classmethod
+    def create_resolves(
+        cls,
+        old: Mapping[str, LockfileInfo],
+        new: Mapping[str, LockfileInfo],
+        diff_filter: DiffFilter | None = None,
+    ) -> Mapping[str, LockfileDiff]:
+        """Diff each resolve in `old` with the same resolve in `new`, keyed by resolve name.
+
+        Resolves only present on one side are diffed against an empty resolve.
+        """
+        empty = LockfileInfo({})
+        return {
+            resolve: cls.create(old.get(resolve, empty), new.get(resolve, empty), diff_filter)
+            for resolve in {**new, **old}
+        }
+
+
+def encoded_fields(data: Any) -> dict[str, Any]:
+    """Return the fields of the dataclass instance `data` to encode, keyed by field name.
+
+    Optional fields with `OMIT_EMPTY` metadata are left out when empty, so that they only show up
+    for the lockfiles and diffs that have them.
+    """
+    encoded = {}
+    for data_field in fields(data):
+        value = getattr(data, data_field.name)
+        if value or not data_field.metadata.get("omit_empty"):
+            encoded[data_field.name] = value
+    return encoded
+
 
 @dataclass(frozen=True)
 class ParsedData:
@@ -54,3 +415,7 @@ class ParsedData:
 
     def get_info(self) -> LockfileInfo:
         raise NotImplementedError()
+
+    def get_resolves(self) -> Mapping[str, LockfileInfo]:
+        """Return the info for each resolve in the lockfile, keyed by resolve name."""
+        return {DEFAULT_RESOLVE: self.get_info()}
@@ -0,0 +1,213 @@
+from __future__ import annotations
+
+import pytest
+
+from lockfile_diff.types import (
+    BUMP_LEGACY,
+    BUMP_LOCAL,
+    BUMP_MAJOR,
+    BUMP_MICRO,
+    BUMP_MINOR,
+    BUMP_POST,
+    BUMP_PRE,
+    DiffFilter,
+    Dists,
+    LockfileDiff,
+    LockfileInfo,
+    classify_bump,
+    parse_version,
+)
+
+
+def test_parse_version_is_cached() -> None:
+    before = parse_version.cache_info()
+    assert parse_version("1.26.0") is parse_version("1.26.0")
+    after = parse_version.cache_info()
+    assert after.hits > before.hits
+
+
+def test_lockfile_info_shares_versions() -> None:
+    first = LockfileInfo.create([("urllib3", "1.26.0")])
+    second = LockfileInfo.create([("urllib3", "1.26.0")])
+    assert first.dists["urllib3"] is second.dists["urllib3"]
+
+
+def test_dists() -> None:
+    dists = Dists([("six", "1.15"), ("attrs", "22.1"), ("six", "1.16"), ("click", "8.1")])
+    assert dists.names == ("attrs", "click", "six")
+    assert dists.versions == ("22.1", "8.1", "1.16")
+    assert dists.index("click") == 1
+    assert dists.index("cowsay") == -1
+    assert "six" in dists and "cowsay" not in dists
+    assert dists["six"] is parse_version("1.16")
+    assert dists == {name: parse_version(v) for name, v in zip(dists.names, dists.versions)}
+    assert dists == Dists([("attrs", "22.1"), ("click", "8.1.0"), ("six", "1.16")])
+    assert dists == Dists.of(dict(dists))
+    assert Dists.of(dists) is dists
+    assert LockfileInfo({"six": parse_version("1.16")}).dists == Dists([("six", "1.16")])
+
+
+def test_dists_parse_versions_lazily() -> None:
+    parse_version("2.0")
+    before = parse_version.cache_info()
+    dists = Dists([("cowsay", "2.0")])
+    assert parse_version.cache_info() == before
+    assert dists.get("cowsay") == parse_version("2.0")
+    assert parse_version.cache_info().hits > before.hits
+
+
+def test_lockfile_diff() -> None:
+    old = LockfileInfo.create(
+        [("zope", "1.0"), ("six", "1.16.0"), ("attrs", "22.1"), ("click", "8.1"), ("b", "1.0")]
+    )
+    new = LockfileInfo.create(
+        [("yarl", "1.8"), ("six", "1.16"), ("attrs", "21.4"), ("click", "8.1.3"), ("a", "2")]
+    )
+    diff = LockfileDiff.create(old, new)
+    assert list(diff.added) == ["a", "yarl"]
+    assert list(diff.removed) == ["b", "zope"]
+    assert diff.unchanged == {"six": parse_version("1.16")}
+    assert diff.upgraded == {"click": (parse_version("8.1"), parse_version("8.1.3"))}
+    assert diff.downgraded == {"attrs": (parse_version("22.1"), parse_version("21.4"))}
+
+
+def test_lockfile_diff_resolves() -> None:
+    old = {
+        "linux": LockfileInfo.create([("six", "1.15")]),
+        "mac": LockfileInfo.create([("six", "1.15")]),
+    }
+    new = {
+        "linux": LockfileInfo.create([("six", "1.16")]),
+        "windows": LockfileInfo.create([("six", "1.16")]),
+    }
+    diffs = LockfileDiff.create_resolves(old, new)
+    assert sorted(diffs) == ["linux", "mac", "windows"]
+    assert list(diffs["linux"].upgraded) == ["six"]
+    assert list(diffs["mac"].removed) == ["six"]
+    assert list(diffs["windows"].added) == ["six"]
+
+
+def test_lockfile_diff_required_by() -> None:
+    old = LockfileInfo.create(
+        [("app", "1.0"), ("requests", "2.27"), ("chardet", "4.0")],
+        dependencies={"app": ["requests"], "requests": ["chardet"]},
+    )
+    new = LockfileInfo.create(
+        [("app", "1.0"), ("requests", "2.28"), ("charset-normalizer", "2.1")],
+        dependencies={"app": ["requests"], "requests": ["charset-normalizer"]},
+    )
+    diff = LockfileDiff.create(old, new)
+    assert diff.required_by == {
+        "chardet": ("app",),
+        "charset-normalizer": ("app",),
+        "requests": ("app",),
+    }
+    assert LockfileDiff.create(LockfileInfo(old.dists), new).required_by == {
+        "charset-normalizer": ("app",),
+        "requests": ("app",),
+    }
+
+
+def test_lockfile_diff_pulled_in() -> None:
+    old = LockfileInfo.create(
+        [("app", "1.0"), ("cli", "1.0"), ("requests", "2.27"), ("click", "8.0")],
+        dependencies={"app": ["requests", "click"], "cli": ["click"]},
+    )
+    new = LockfileInfo.create(
+        [("app", "2.0"), ("cli", "1.0"), ("requests", "2.28"), ("click", "8.1"), ("idna", "3.4")],
+        dependencies={"app": ["requests", "click"], "cli": ["click"], "requests": ["idna"]},
+    )
+    diff = LockfileDiff.create(old, new)
+    assert diff.pulled_in == {"app": ("click", "idna", "requests")}
+    assert diff.required_by["click"] == ("app", "cli")
+    assert LockfileDiff.create(old, new, DiffFilter(impact=False)).pulled_in == {}
+
+
+@pytest.mark.parametrize(
+    "prev, curr, bump",
+    [
+        ("1.0", "2.0", BUMP_MAJOR),
+        ("1.0", "1!1.0", BUMP_MAJOR),
+        ("1.2", "1.3.0", BUMP_MINOR),
+        ("1.2.3", "1.2.4", BUMP_MICRO),
+        ("1.2", "1.2.0.1", BUMP_MICRO),
+        ("1.2rc1", "1.2", BUMP_PRE),
+        ("1.2.dev1", "1.2.dev2", BUMP_PRE),
+        ("1.2", "1.2.post1", BUMP_POST),
+        ("1.2", "1.2+local", BUMP_LOCAL),
+        ("1.2", "foo", BUMP_LEGACY),
+    ],
+)
+def test_classify_bump(prev: str, curr: str, bump: int) -> None:
+    assert classify_bump(parse_version(prev), parse_version(curr)) == bump
+    assert classify_bump(parse_version(curr), parse_version(prev)) == bump
+
+
+def test_lockfile_diff_bumps() -> None:
+    diff = LockfileDiff.create(
+        LockfileInfo.create([("a", "1.0"), ("b", "1.0"), ("c", "2.1"), ("d", "1.0.1")]),
+        LockfileInfo.create([("a", "1.1"), ("b", "2.0"), ("c", "2.0"), ("d", "1.0.1")]),
+    )
+    assert diff.bumps == {"a": "minor", "b": "major", "c": "minor"}
+    assert list(diff.summary.items()) == [("major", 1), ("minor", 2)]
+
+
+def test_lockfile_diff_filter() -> None:
+    old = LockfileInfo.create(
+        [("django", "3.2"), ("django-cors", "1.0"), ("six", "1.15"), ("zope", "1.0")]
+    )
+    new = LockfileInfo.create(
+        [("django", "4.0"), ("django-cors", "1.0.1"), ("six", "1.16"), ("attrs", "22.1")]
+    )
+    diff = LockfileDiff.create(old, new, DiffFilter(unchanged=False, added=False))
+    assert diff.added == {}
+    assert list(diff.removed) == ["zope"]
+    assert list(diff.upgraded) == ["django", "django-cors", "six"]
+
+    diff = LockfileDiff.create(old, new, DiffFilter(include=("django*",), exclude=("*-cors",)))
+    assert list(diff.upgraded) == ["django"]
+    assert diff.added == diff.removed == diff.unchanged == {}
+
+    diff = LockfileDiff.create(old, new, DiffFilter(include=("six", "attrs", "missing")))
+    assert list(diff.added) == ["attrs"]
+    assert list(diff.upgraded) == ["six"]
+
+    diff = LockfileDiff.create(old, new, DiffFilter(min_bump=BUMP_MINOR))
+    assert list(diff.upgraded) == ["django", "six"]
+    assert diff.summary == {"major": 1, "minor": 1}
+
+
+def test_lockfile_diff_filter_skips_parsing() -> None:
+    old = LockfileInfo.create([("a", "1.0"), ("b", "1.0"), ("c", "1.0")])
+    new = LockfileInfo.create([("a", "2.0"), ("b", "2.0"), ("c", "1.0"), ("d", "1.0")])
+    LockfileDiff.create(old, new, DiffFilter(unchanged=False, added=False, exclude=("a",)))
+    assert isinstance(old.dists, Dists) and isinstance(new.dists, Dists)
+    assert [version is not None for version in old.dists._parsed] == [False, True, False]
+    assert [version is not None for version in new.dists._parsed] == [False, True, False, False]
+
+
+def test_lockfile_diff_drifted() -> None:
+    dists = [("a", "1.0"), ("b", "1.0"), ("c", "1.0")]
+    old = LockfileInfo.create(dists, hashes={"a": ("sha256:1",), "b": ("sha256:1",)})
+    new = LockfileInfo.create(dists, hashes={"a": ("sha256:1",), "b": ("sha256:2",)})
+    diff = LockfileDiff.create(old, new)
+    assert list(diff.drifted) == ["b"]
+    assert list(diff.unchanged) == ["a", "c"]
+
+    diff = LockfileDiff.create(old, new, DiffFilter(drifted=False))
+    assert diff.drifted == {}
+    assert list(diff.unchanged) == ["a", "b", "c"]
+
+    assert list(LockfileDiff.create(old, new, DiffFilter(unchanged=False)).drifted) == ["b"]
+    assert LockfileDiff.create(LockfileInfo.create(dists), new).drifted == {}
+
+
+def test_lockfile_diff_drifted_only_skips_parsing() -> None:
+    old = LockfileInfo.create([("a", "1.0"), ("b", "1.0")], hashes={"b": ("sha256:1",)})
+    new = LockfileInfo.create([("a", "2.0"), ("b", "1.0")], hashes={"b": ("sha256:2",)})
+    diff = LockfileDiff.create(old, new, DiffFilter(unchanged=False, changed=False))
+    assert list(diff.drifted) == ["b"]
+    assert diff.upgraded == diff.downgraded == {}
+    assert isinstance(old.dists, Dists) and isinstance(new.dists, Dists)
+    assert [version is not None for version in old.dists._parsed] == [False, False]
+    assert [version is not None for version in new.dists._parsed] == [False, True]
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+from io import SEEK_SET, TextIOBase, UnsupportedOperation
+from typing import IO
+
+
+class ChainedReader(TextIOBase):
+    """Read `head` followed by the rest of `tail`.
+
+    Used to hand over a stream after having read ahead in it, without having to seek back.
+
+    When `tail` is seekable, so is the reader, but only to positions within `head`, e.g. to rewind
+    to the start after having read on into the tail.
+    """
+
+    def __init__(self, head: str, tail: IO[str]) -> None:
+        super().__init__()
+        self.__head = head
+        self.__pos = 0
+        self.__tail = tail
+        self.__tail_start = tail.tell() if tail.seekable() else None
+
+    @property
+    def name(self) -> str:
+        return getattr(self.__tail, "name", repr(self.__tail))
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return self.__tail_start is not None
+
+    def tell(self) -> int:
+        if self.__tail_start is None:
+            raise UnsupportedOperation("underlying stream is not seekable")
+        if self.__pos < len(self.__head) or self.__tail.tell() == self.__tail_start:
+            return self.__pos
+        raise UnsupportedOperation("can not tell positions past the head")
+
+    def seek(self, offset: int, whence: int = SEEK_SET) -> int:
+        if self.__tail_start is None:
+            raise UnsupportedOperation("underlying stream is not seekable")
+        if whence != SEEK_SET or not 0 <= offset <= len(self.__head):
+            raise UnsupportedOperation("can only seek to positions within the head")
+        self.__pos = offset
+        self.__tail.seek(self.__tail_start)
+        return offset
+
+    def read(self, size: int | None = -1) -> str:
+        if size is None:
+            size = -1
+        start = self.__pos
+        if start == len(self.__head):
+            return self.__tail.read(size)
+        if size < 0:
+            self.__pos = len(self.__head)
+            return self.__head[start:] + self.__tail.read()
+        # Return what remains of the head first, rather than joining it with the tail.
+        self.__pos = min(start + size, len(self.__head))
+        return self.__head[start : self.__pos]
+
+    def readline(self, size: int | None = -1) -> str:  # type: ignore[override]
+        if size is None:
+            size = -1
+        start = self.__pos
+        head = self.__head
+        if start == len(head):
+            return self.__tail.readline(size)
+        end = head.find("\n", start) + 1 or len(head)
+        if 0 <= size < end - start:
+            end = start + size
+        self.__pos = end
+        line = head[start:end]
+        if end == len(head) and not line.endswith("\n") and (size < 0 or len(line) < size):
+            # The line continues in the tail.
+            line += self.__tail.readline(size if size < 0 else size - len(line))
+        return line
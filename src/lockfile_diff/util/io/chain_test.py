@@ -0,0 +1,55 @@
+from io import StringIO, UnsupportedOperation
+
+import pytest
+
+from lockfile_diff.util.io.chain import ChainedReader
+
+
+def test_chained_read() -> None:
+    reader = ChainedReader("head ", StringIO("and tail"))
+    assert reader.read(3) == "hea"
+    assert reader.read(10) == "d "
+    assert reader.read(3) == "and"
+    assert reader.read() == " tail"
+    assert reader.read() == ""
+
+
+def test_chained_read_all() -> None:
+    assert ChainedReader("head ", StringIO("and tail")).read() == "head and tail"
+
+
+def test_chained_readline() -> None:
+    reader = ChainedReader("first\nsec", StringIO("ond\nthird\n"))
+    assert list(reader) == ["first\n", "second\n", "third\n"]
+
+
+def test_chained_readline_size() -> None:
+    reader = ChainedReader("first\nsec", StringIO("ond\n"))
+    assert reader.readline(3) == "fir"
+    assert reader.readline(10) == "st\n"
+    assert reader.readline(5) == "secon"
+
+
+def test_chained_rewind() -> None:
+    tail = StringIO("skipped\nand tail")
+    tail.readline()
+    reader = ChainedReader("head ", tail)
+    assert reader.seekable()
+    assert reader.tell() == 0
+    assert reader.read() == "head and tail"
+    with pytest.raises(UnsupportedOperation):
+        reader.tell()
+    assert reader.seek(2) == 2
+    assert reader.read() == "ad and tail"
+
+
+class UnseekableStringIO(StringIO):
+    def seekable(self) -> bool:
+        return False
+
+
+def test_chained_unseekable() -> None:
+    reader = ChainedReader("head ", UnseekableStringIO("and tail"))
+    assert not reader.seekable()
+    with pytest.raises(UnsupportedOperation):
+        reader.seek(0)
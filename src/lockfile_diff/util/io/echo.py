@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+from io import TextIOBase
+
+import click
+
+BUFFER_SIZE = 64 * 1024
+
+
+class EchoWriter(TextIOBase):
+    """Text stream writing to stdout, or stderr, using `click.echo`.
+
+    `click.echo` strips ANSI styles when not writing to a terminal. Writes are buffered up to
+    `buffer_size` characters, as encoders may write many small chunks.
+
+    `line_pending` tells whether the output so far ends with an unterminated line.
+    """
+
+    def __init__(self, err: bool = False, buffer_size: int = BUFFER_SIZE) -> None:
+        super().__init__()
+        self.err = err
+        self.buffer_size = buffer_size
+        self.__chunks: list[str] = []
+        self.__size = 0
+        self.line_pending = False
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, s: str) -> int:
+        if s:
+            self.__chunks.append(s)
+            self.__size += len(s)
+            self.line_pending = not s.endswith("\n")
+        if self.__size >= self.buffer_size:
+            self.flush()
+        return len(s)
+
+    def flush(self) -> None:
+        if self.__chunks:
+            click.echo("".join(self.__chunks), nl=False, err=self.err)
+            self.__chunks.clear()
+            self.__size = 0
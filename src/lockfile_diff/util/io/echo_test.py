@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+import click
+from click.testing import CliRunner
+
+from lockfile_diff.util.io.echo import EchoWriter
+
+
+def test_echo_writer() -> None:
+    line_pending = []
+
+    @click.command
+    def cmd() -> None:
+        with EchoWriter(buffer_size=4) as dest:
+            dest.write(click.style("ab", bold=True))
+            line_pending.append(dest.line_pending)
+            dest.write("c\n")
+            line_pending.append(dest.line_pending)
+        click.echo("d")
+
+    result = CliRunner().invoke(cmd)
+    assert result.output == "abc\nd\n"
+    assert line_pending == [True, False]
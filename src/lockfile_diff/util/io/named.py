@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from io import BytesIO, TextIOWrapper
+from typing import IO
+
+
+class NamedBytesIO(BytesIO):
+    def __init__(self, *args, name: str, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.__name = name
+
+    @property
+    def name(self) -> str:
+        return self.__name
+
+
+def open_bytes(data: bytes, name: str) -> IO:
+    """Open `data` as a named text stream.
+
+    The raw `data` remains available as the binary `buffer` of the returned stream, for schemas
+    that read binary input.
+    """
+    return TextIOWrapper(NamedBytesIO(data, name=name), encoding="utf-8")
+
+
+@dataclass(frozen=True)
+class Blob:
+    """File contents held in memory, that may be passed between processes."""
+
+    name: str
+    data: bytes
+
+    def open(self) -> IO:
+        return open_bytes(self.data, self.name)
@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+from typing import IO
+
+from lockfile_diff.util.io.rewind import capture
+
+HEAD_SIZE = 4096
+
+
+def read_head(source: IO, size: int = HEAD_SIZE) -> bytes:
+    """Read up to `size` bytes from the current position of `source`, without consuming them.
+
+    Text streams that can not be decoded (e.g. a zip archive opened in text mode) are read from
+    their underlying binary buffer instead.
+    """
+    with capture(source) as c:
+        try:
+            head = source.read(size)
+        except UnicodeDecodeError:
+            buffer = getattr(source, "buffer", None)
+            if buffer is None:
+                return b""
+            c.rewind()
+            head = buffer.read(size)
+    if isinstance(head, str):
+        return head.encode(errors="replace")
+    return bytes(head)
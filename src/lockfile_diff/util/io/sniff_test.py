@@ -0,0 +1,21 @@
+from io import BytesIO, StringIO, TextIOWrapper
+
+from lockfile_diff.util.io.sniff import read_head
+
+
+def test_read_head_text() -> None:
+    source = StringIO("some text")
+    assert read_head(source, 4) == b"some"
+    assert source.tell() == 0
+
+
+def test_read_head_binary() -> None:
+    source = BytesIO(b"PK\x03\x04\xff\xfe")
+    assert read_head(source) == b"PK\x03\x04\xff\xfe"
+    assert source.tell() == 0
+
+
+def test_read_head_undecodable_text() -> None:
+    source = TextIOWrapper(BytesIO(b"PK\x03\x04\xff\xfe"), encoding="utf-8")
+    assert read_head(source) == b"PK\x03\x04\xff\xfe"
+    assert source.tell() == 0
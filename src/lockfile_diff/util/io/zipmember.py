@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import mmap
+import struct
+import zlib
+from contextlib import contextmanager
+from io import BytesIO, UnsupportedOperation
+from typing import IO, Iterator, Union, cast
+from zipfile import ZipFile
+
+# See https://pkware.cachefly.net/webdocs/casestudies/APPNOTE.TXT
+EOCD = struct.Struct("<4s4H2LH")
+EOCD_SIGNATURE = b"PK\x05\x06"
+EOCD_MAX_COMMENT = 0xFFFF
+CENTRAL_HEADER = struct.Struct("<4s6H3L5H2L")
+CENTRAL_HEADER_SIGNATURE = b"PK\x01\x02"
+LOCAL_HEADER = struct.Struct("<4s5H3L2H")
+LOCAL_HEADER_SIGNATURE = b"PK\x03\x04"
+ZIP64_LIMIT = 0xFFFFFFFF
+
+STORED = 0
+DEFLATED = 8
+
+Buffer = Union[bytes, mmap.mmap]
+
+
+@contextmanager
+def map_source(source: IO) -> Iterator[Buffer]:
+    """Provide the binary contents of `source` as a buffer.
+
+    Files on disk are memory mapped, so only the pages actually read are loaded. In memory streams
+    are used as is, and any other streams are read in full.
+    """
+    binary = getattr(source, "buffer", source)
+    if isinstance(binary, BytesIO):
+        # Does not copy the data, unless the stream has been written to.
+        yield binary.getvalue()
+        return
+
+    try:
+        mapped = mmap.mmap(binary.fileno(), 0, access=mmap.ACCESS_READ)
+    except (AttributeError, OSError, UnsupportedOperation, ValueError):
+        # Not a regular file, or an empty one.
+        yield binary.read()
+        return
+
+    with mapped:
+        yield mapped
+
+
+def read_member(buffer: Buffer, name: str) -> bytes:
+    """Read the member `name` from the zip archive in `buffer`.
+
+    The member is located from the end of central directory record by searching the central
+    directory for its name, rather than by reading every entry in it. Archives with data prepended
+    to them, such as a shebang line, are supported.
+
+    Raises `KeyError` if there is no such member.
+    """
+    search_start = max(0, len(buffer) - EOCD.size - EOCD_MAX_COMMENT)
+    eocd_pos = len(buffer)
+    while True:
+        eocd_pos = buffer.rfind(EOCD_SIGNATURE, search_start, eocd_pos)
+        if eocd_pos < 0:
+            raise ValueError("not a zip archive")
+        if eocd_pos + EOCD.size > len(buffer):
+            continue
+        *_, entries, cd_size, cd_offset, comment_length = EOCD.unpack_from(buffer, eocd_pos)
+        # The signature may also appear in the archive comment.
+        if eocd_pos + EOCD.size + comment_length == len(buffer):
+            break
+    if ZIP64_LIMIT in (cd_size, cd_offset) or entries == 0xFFFF:
+        return _read_member_zip64(buffer, name)
+
+    # Offset of the archive in the buffer, when data has been prepended to it.
+    concat = eocd_pos - cd_size - cd_offset
+    cd_start = concat + cd_offset
+    encoded_name = name.encode()
+    pos = cd_start
+    while (pos := buffer.find(encoded_name, pos, eocd_pos)) >= 0:
+        header_pos = pos - CENTRAL_HEADER.size
+        pos += len(encoded_name)
+        if header_pos < cd_start:
+            continue
+        header = CENTRAL_HEADER.unpack_from(buffer, header_pos)
+        if header[0] != CENTRAL_HEADER_SIGNATURE or header[10] != len(encoded_name):
+            # The name is part of some other field or a longer name.
+            continue
+        _, _, _, flags, method, _, _, crc, compressed_size, _, _, _, _, _, _, _, offset = header
+        if ZIP64_LIMIT in (compressed_size, offset):
+            return _read_member_zip64(buffer, name)
+        return _read_data(buffer, concat + offset, method, compressed_size, crc)
+
+    raise KeyError(f"there is no item named {name!r} in the archive")
+
+
+def _read_data(buffer: Buffer, offset: int, method: int, size: int, crc: int) -> bytes:
+    signature, *_, name_length, extra_length = LOCAL_HEADER.unpack_from(buffer, offset)
+    if signature != LOCAL_HEADER_SIGNATURE:
+        raise ValueError("bad zip archive, invalid local file header")
+    start = offset + LOCAL_HEADER.size + name_length + extra_length
+    data = buffer[start : start + size]
+    if method == DEFLATED:
+        data = zlib.decompress(data, -zlib.MAX_WBITS)
+    elif method != STORED:
+        raise ValueError(f"unsupported zip compression method: {method}")
+    if zlib.crc32(data) != crc:
+        raise ValueError("bad zip archive, CRC check failed")
+    return data
+
+
+def _read_member_zip64(buffer: Buffer, name: str) -> bytes:
+    # A memory map is file like, so the data is not copied for it.
+    archive = cast("IO[bytes]", buffer) if isinstance(buffer, mmap.mmap) else BytesIO(buffer)
+    with ZipFile(archive) as zf:
+        return zf.read(name)
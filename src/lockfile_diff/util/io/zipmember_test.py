@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+from io import BufferedReader, BytesIO, RawIOBase, TextIOWrapper
+from pathlib import Path
+from typing import cast
+from zipfile import ZIP_DEFLATED, ZIP_STORED, ZipFile
+
+import pytest
+
+from lockfile_diff.util.io.named import open_bytes
+from lockfile_diff.util.io.zipmember import map_source, read_member
+
+
+def make_zip(prefix: bytes = b"", compression: int = ZIP_DEFLATED, comment: bytes = b"") -> bytes:
+    buf = BytesIO()
+    buf.write(prefix)
+    with ZipFile(buf, "w", compression=compression) as zf:
+        zf.writestr("PEX-INFO.d/PEX-INFO", "decoy")
+        zf.writestr("PEX-INFO", '{"distributions": {}}')
+        zf.writestr("__main__.py", "PEX-INFO")
+        zf.comment = comment
+    return buf.getvalue()
+
+
+@pytest.mark.parametrize(
+    "prefix, compression, comment",
+    [
+        (b"", ZIP_DEFLATED, b""),
+        (b"", ZIP_STORED, b""),
+        (b"#!/usr/bin/env python3\n", ZIP_DEFLATED, b""),
+        (b"#!/usr/bin/env python3\n", ZIP_STORED, b"PK\x05\x06 comment"),
+    ],
+)
+def test_read_member(prefix: bytes, compression: int, comment: bytes) -> None:
+    data = make_zip(prefix, compression, comment)
+    assert read_member(data, "PEX-INFO") == b'{"distributions": {}}'
+    assert read_member(data, "__main__.py") == b"PEX-INFO"
+
+
+def test_read_member_missing() -> None:
+    with pytest.raises(KeyError):
+        read_member(make_zip(), "PEX-INF")
+    with pytest.raises(ValueError, match="not a zip archive"):
+        read_member(b"PEX-INFO", "PEX-INFO")
+
+
+def test_map_source_file(tmp_path: Path) -> None:
+    path = tmp_path / "app.pex"
+    path.write_bytes(make_zip(b"#!/usr/bin/env python3\n"))
+    with open(path) as source:
+        with map_source(source) as buffer:
+            assert read_member(buffer, "PEX-INFO") == b'{"distributions": {}}'
+
+
+def test_map_source_in_memory() -> None:
+    data = make_zip()
+    with map_source(open_bytes(data, "app.pex")) as buffer:
+        assert buffer is data
+
+
+def test_map_source_stream() -> None:
+    data = make_zip()
+    source = TextIOWrapper(BufferedReader(cast(RawIOBase, BytesIO(data))))
+    with map_source(source) as buffer:
+        assert buffer == data
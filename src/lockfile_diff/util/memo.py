@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import hashlib
+import threading
+from collections import OrderedDict, namedtuple
+from functools import update_wrapper
+from typing import Callable, Generic, TypeVar
+
+T = TypeVar("T")
+
+CacheInfo = namedtuple("CacheInfo", ("hits", "misses", "maxsize", "currsize"))
+
+# Bytes of the digests keying the memoized values, collisions are not a practical concern at 128
+# bits.
+DIGEST_SIZE = 16
+
+
+class DigestCache(Generic[T]):
+    """Least recently used memo of a function of a single string, keyed by a digest of the string.
+
+    Unlike `functools.lru_cache`, the strings themselves are not kept, so memoizing large chunks of
+    text costs no more memory than the values computed from them. Mirrors the `cache_info()` and
+    `cache_clear()` methods of `functools.lru_cache`. Safe to use from multiple threads.
+    """
+
+    def __init__(self, func: Callable[[str], T], maxsize: int) -> None:
+        self.func = func
+        self.maxsize = maxsize
+        self._values: OrderedDict[bytes, T] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = self._misses = 0
+        update_wrapper(self, func)
+
+    def __call__(self, text: str) -> T:
+        key = hashlib.blake2b(text.encode(), digest_size=DIGEST_SIZE).digest()
+        with self._lock:
+            if key in self._values:
+                self._hits += 1
+                self._values.move_to_end(key)
+                return self._values[key]
+            self._misses += 1
+        value = self.func(text)
+        with self._lock:
+            self._values[key] = value
+            while len(self._values) > self.maxsize:
+                self._values.popitem(last=False)
+        return value
+
+    def cache_info(self) -> CacheInfo:
+        with self._lock:
+            return CacheInfo(self._hits, self._misses, self.maxsize, len(self._values))
+
+    def cache_clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+            self._hits = self._misses = 0
+
+
+def digest_cache(maxsize: int) -> Callable[[Callable[[str], T]], DigestCache[T]]:
+    """Decorator memoizing a function of a single string in a `DigestCache` of `maxsize` values."""
+
+    def decorator(func: Callable[[str], T]) -> DigestCache[T]:
+        return DigestCache(func, maxsize)
+
+    return decorator
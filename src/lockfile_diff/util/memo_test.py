@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+from lockfile_diff.util.memo import CacheInfo, digest_cache
+
+
+def test_digest_cache() -> None:
+    calls = []
+
+    @digest_cache(maxsize=2)
+    def upper(text: str) -> str:
+        """Upper case `text`."""
+        calls.append(text)
+        return text.upper()
+
+    assert upper.__doc__ == "Upper case `text`."
+    assert [upper("a"), upper("b"), upper("a"), upper("c"), upper("b")] == ["A", "B", "A", "C", "B"]
+    # "b" was the least recently used value when "c" was added.
+    assert calls == ["a", "b", "c", "b"]
+    assert upper.cache_info() == CacheInfo(hits=1, misses=4, maxsize=2, currsize=2)
+
+    upper.cache_clear()
+    assert upper.cache_info() == CacheInfo(hits=0, misses=0, maxsize=2, currsize=0)
@@ -5,6 +5,8 @@ import pytest
 
 from lockfile_diff import formats, schemas  # noqa
 from lockfile_diff.base import Format, Schema
+from lockfile_diff.schemas.autodetect import AutoDetectSchema
+from lockfile_diff.util.io.sniff import read_head
 
 
 @pytest.mark.parametrize(
@@ -38,3 +40,20 @@ def test_lockfile_info(input_file: str, expected_file: str) -> None:
     with open(expected_file) as fd:
         expected = fd.read()
     assert actual.getvalue() == expected
+
+
+@pytest.mark.parametrize(
+    "input_file, expected_schema",
+    [
+        ("tests/lockfiles/pex/cowsay-default.lock", "pex"),
+        ("tests/lockfiles/pants-pex/cowsay.lock", "pants-pex"),
+        ("tests/lockfiles/coursier/hamcrest.lock", "pants-coursier"),
+        ("tests/lockfiles/pex-app/cowsay.pex", "pex-app"),
+    ],
+)
+def test_auto_detect_probe(input_file: str, expected_schema: str) -> None:
+    with open(input_file, "rb") as fd:
+        head = read_head(fd)
+    schema_cls, _ = next(AutoDetectSchema.candidates(head))
+    assert schema_cls.schema == expected_schema
+    assert Schema("auto-detect").parse_file(input_file).get_info().dists